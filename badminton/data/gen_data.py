@@ -1,34 +1,171 @@
+import argparse
 import datetime
 from pathlib import Path
-import random
+
+import numpy as np
+import pandas as pd
+
+PLAYERS = ('Daniel Hodgins',
+           'Emma Snyder',
+           'James Zhong',
+           'Jared DeLeo',
+           'John Cobb',
+           'John David Clifton',
+           'John Sterling',
+           'Kenny Powell',
+           'Owen Henderschedt',
+           'Sayantani Battacharya',
+           'Sean Grate',
+           'Seth Harward',
+           'Tim Eller',
+           'Tristan Salinas')
+
+COLUMNS = ['player1', 'player2', 'player3', 'player4', 'score1', 'score2', 'date']
+
+# the longest game is 30-29, after which a game can not go on
+MAX_RALLIES = 59
+
+
+def roster(num_players: int = len(PLAYERS)) -> tuple:
+    """
+    Returns the names of the mock players, padding the usual roster with numbered players if more are asked for.
+    """
+    if num_players < 4:
+        raise ValueError('A doubles game needs at least 4 players')
+    return PLAYERS[:num_players] + tuple(f'Player {idx:04d}' for idx in range(len(PLAYERS) + 1, num_players + 1))
+
+
+def draw_players(rng: np.random.Generator, num_games: int, num_players: int) -> np.ndarray:
+    """
+    Draws 4 distinct players for each game, redrawing the games that picked someone twice.
+    """
+    players = rng.integers(num_players, size=(num_games, 4))
+    while True:
+        ordered = np.sort(players, axis=1)
+        repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if len(repeated) == 0:
+            return players
+        players[repeated] = rng.integers(num_players, size=(len(repeated), 4))
+
+
+def play_games(rng: np.random.Generator, rally_prob: np.ndarray) -> np.ndarray:
+    """
+    Plays games to 21 rally by rally, given the chance of side 1 to win each rally of each game.
+    A game at 20-all goes on until a side leads by 2, or reaches 30. Returns the final (side 1, side 2) scores.
+    """
+    side1 = np.cumsum(rng.random((len(rally_prob), MAX_RALLIES)) < rally_prob[:, None], axis=1, dtype=np.int16)
+    side2 = np.arange(1, MAX_RALLIES + 1, dtype=np.int16) - side1
+    leader = np.maximum(side1, side2)
+    over = (leader >= 21) & (np.abs(side1 - side2) >= 2) | (leader == 30)
+    last_rally = over.argmax(axis=1)
+    games = np.arange(len(rally_prob))
+    return np.column_stack([side1[games, last_rally], side2[games, last_rally]])
+
+
+def game_chunk(rng: np.random.Generator, skills: np.ndarray, first_game: int, num_games: int, total_games: int,
+               start_date: datetime.date, num_days: int, singles_prob: float) -> dict:
+    """
+    Generates the games first_game, ..., first_game + num_games - 1 out of total_games, as player codes (-1 for the
+    empty doubles slots of a singles game), scores and dates.
+    """
+    players = draw_players(rng, num_games, len(skills))
+    singles = rng.random(num_games) < singles_prob
+    players[singles, 2:] = -1
+
+    # a side is as skilled as its players on average, and the skill gap sets the odds of each rally
+    player_skills = np.where(players >= 0, skills[players], 0)
+    side1 = np.where(singles, player_skills[:, 0], player_skills[:, [0, 1]].mean(axis=1))
+    side2 = np.where(singles, player_skills[:, 1], player_skills[:, [2, 3]].mean(axis=1))
+    scores = play_games(rng, 1 / (1 + np.exp(side2 - side1)))
+
+    # the games are spread evenly over the days in the order they were played, so the log is chronological
+    games = np.arange(first_game, first_game + num_games)
+    days = ((games + rng.random(num_games)) * num_days / total_games).astype(np.int64)
+    dates = np.datetime64(start_date, 'D') + days
+    return {'players': players, 'scores': scores, 'dates': dates}
+
+
+def write_csv(chunks, file_path: Path, names: np.ndarray):
+    """
+    Writes the chunks of games to a CSV file one after another.
+    """
+    with open(file_path, 'w', newline='') as f:
+        f.write(','.join(COLUMNS) + '\n')
+        for chunk in chunks:
+            frame = chunk_frame(chunk, names)
+            frame.to_csv(f, header=False, index=False)
+
+
+def write_parquet(chunks, file_path: Path, names: np.ndarray):
+    """
+    Writes the chunks of games to a Parquet file, one row group per chunk.
+    """
+    # pyarrow is only needed for Parquet output, so it is imported here
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.string()) for column in COLUMNS[:4]] +
+                       [('score1', pa.int16()), ('score2', pa.int16()), ('date', pa.date32())])
+    with pq.ParquetWriter(file_path, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk_frame(chunk, names), schema=schema, preserve_index=False))
+
+
+def chunk_frame(chunk: dict, names: np.ndarray) -> pd.DataFrame:
+    """
+    Arranges a chunk of games like the columns of a game log, leaving the empty doubles slots of singles games blank.
+    """
+    players = np.where(chunk['players'] >= 0, names[chunk['players']], None)
+    frame = pd.DataFrame(players, columns=COLUMNS[:4])
+    frame['score1'], frame['score2'] = chunk['scores'][:, 0], chunk['scores'][:, 1]
+    frame['date'] = chunk['dates']
+    return frame
+
+
+def generate(file_path: Path, num_games: int = 1000, num_players: int = len(PLAYERS), singles_prob: float = 0.75,
+             start_date: datetime.date = datetime.date(2024, 8, 1), end_date: datetime.date = datetime.date(2024, 12, 31),
+             skill_spread: float = 0.3, seed: int = None, chunk_size: int = 100000):
+    """
+    Writes a mock game log of random games between the players to a CSV file, or a Parquet file if its suffix is .parquet.
+
+    Every player has a latent skill drawn from a normal distribution with the given spread, in log-odds of winning a
+    rally against an average player, so that stronger players win more often and by wider margins. The games are
+    generated and written in chunks, so memory stays flat however many games are asked for, and the same seed
+    and chunk size always give the same log.
+    """
+    num_days = (end_date - start_date).days + 1
+    if num_days < 1:
+        raise ValueError('The end date must not come before the start date')
+    rng = np.random.default_rng(seed)
+    skills = rng.normal(0, skill_spread, size=num_players)
+    names = np.array(roster(num_players), dtype=object)
+    chunks = (game_chunk(rng, skills, first_game, min(chunk_size, num_games - first_game), num_games,
+                         start_date, num_days, singles_prob)
+              for first_game in range(0, num_games, chunk_size))
+
+    file_path = Path(file_path)
+    if file_path.suffix == '.parquet':
+        write_parquet(chunks, file_path, names)
+    else:
+        write_csv(chunks, file_path, names)
+
 
 def main():
-    PLAYERS = ('Daniel Hodgins',
-               'Emma Snyder',
-               'James Zhong',
-               'Jared DeLeo',
-               'John Cobb',
-               'John David Clifton',
-               'John Sterling',
-               'Kenny Powell',
-               'Owen Henderschedt',
-               'Sayantani Battacharya',
-               'Sean Grate',
-               'Seth Harward',
-               'Tim Eller',
-               'Tristan Salinas')
-    
-    singles_prob = 0.75
-    num_games = 1000
-    with open(Path(__file__).parent / 'mock.csv', 'w') as f:
-        f.write('player1,player2,player3,player4,score1,score2,date\n')
-        for idx in range(num_games):
-            players = random.sample(PLAYERS, 4)
-            if random.random() < singles_prob:
-                f.write(f'{players[0]},{players[1]},,,21,{random.randint(0, 20)},{datetime.date(2024, random.randint(8, 12), random.randint(1, 30))}\n')
-            else:
-                f.write(f'{players[0]},{players[1]},{players[2]},{players[3]},21,{random.randint(0, 20)},{datetime.date(2024, random.randint(8, 12), random.randint(1, 30))}\n')
+    parser = argparse.ArgumentParser(description='Generates a mock game log.')
+    parser.add_argument('--output', type=Path, default=Path(__file__).parent / 'mock.csv', help='CSV or Parquet file to write')
+    parser.add_argument('--games', type=int, default=1000, help='number of games')
+    parser.add_argument('--players', type=int, default=len(PLAYERS), help='number of players')
+    parser.add_argument('--singles-prob', type=float, default=0.75, help='share of singles games')
+    parser.add_argument('--start-date', type=datetime.date.fromisoformat, default=datetime.date(2024, 8, 1), help='date of the first games')
+    parser.add_argument('--end-date', type=datetime.date.fromisoformat, default=datetime.date(2024, 12, 31), help='date of the last games')
+    parser.add_argument('--skill-spread', type=float, default=0.3, help='spread of the players\' skills, 0 for evenly matched players')
+    parser.add_argument('--seed', type=int, help='seed of the random generator')
+    parser.add_argument('--chunk-size', type=int, default=100000, help='games generated and written at a time')
+    args = parser.parse_args()
+    generate(args.output, num_games=args.games, num_players=args.players, singles_prob=args.singles_prob,
+             start_date=args.start_date, end_date=args.end_date, skill_spread=args.skill_spread,
+             seed=args.seed, chunk_size=args.chunk_size)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,29 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+import argparse
+import collections
+import copy
+import cProfile
+import csv
 import datetime
+import functools
+import hashlib
+import io
+import itertools
+import json
+import html
+import os
 from pathlib import Path
+import re
+import shutil
 import sys
+import time
+import tracemalloc
 from typing import Tuple
+import unicodedata
+import warnings
 
 import numpy as np
 import pandas as pd
 
-from bokeh.plotting import figure, save
+from bokeh.plotting import figure
 from bokeh.models import ColumnDataSource, DataTable, HoverTool, LinearColorMapper, ColorBar, \
                          TableColumn, TabPanel, Tabs, Div, Column, Row, \
-                         DateFormatter, HTMLTemplateFormatter, CustomJS
+                         HTMLTemplateFormatter, NumberFormatter, CustomJS, CustomJSHover, CustomJSTransform, \
+                         DateRangeSlider, GlyphRenderer, Scatter, AutocompleteInput, Spinner, DatePicker, Button, \
+                         RadioButtonGroup
 from bokeh.transform import transform, linear_cmap
-from bokeh.palettes import Magma256, Inferno256, Plasma256, Category20, viridis, RdYlBu, BuRd
-from bokeh.io import output_file
+from bokeh.palettes import Magma256, Inferno256, Plasma256, Category20, Viridis256, RdYlBu, BuRd
+from bokeh.embed.elements import html_page_for_render_items
+from bokeh.embed.util import OutputDocumentFor, standalone_docs_json_and_render_items
+from bokeh.embed.bundle import bundle_for_objs_and_resources
+from bokeh.resources import Resources
+from bokeh.util.paths import bokehjs_path
+from bokeh.util.serialization import make_id
+from bokeh.core.serialization import Serializer, Deserializer
+from bokeh.model import Model
+from bokeh.settings import settings
+import bokeh
+
+
+PLAYER_COLUMNS = ['player1', 'player2', 'player3', 'player4']
 
 
 class Player:
-    def __init__(self, name: str):
-        self.name = name
+    """
+    A lightweight view of a player in a GameLog.
+    """
+    __slots__ = ('log', 'code')
+
+    def __init__(self, log: 'GameLog', code: int):
+        self.log = log
+        self.code = int(code)
+
+    @property
+    def name(self) -> str:
+        return self.log.players[self.code]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Player) and self.log.players is other.log.players and self.code == other.code
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __repr__(self) -> str:
+        return f'Player({self.name!r})'
 
 
 class Game:
-    def __init__(self, score: Tuple[int], date: datetime.datetime):
-        self.score = score
-        self.date = date
+    """
+    A lightweight view of a single row of a GameLog.
+    """
+    __slots__ = ('log', 'index')
+
+    def __init__(self, log: 'GameLog', index: int):
+        self.log = log
+        self.index = index
+
+    @property
+    def score(self) -> Tuple[int]:
+        return tuple(int(score) for score in self.log.scores[self.index])
+
+    @property
+    def date(self) -> datetime.date:
+        return self.log.dates[self.index].astype(datetime.date)
 
     @property
     def point_differential(self) -> int:
@@ -31,10 +97,15 @@ class Game:
     
 
 class SinglesGame(Game):
-    def __init__(self, first_player, second_player, score: Tuple[int], date: datetime.datetime):
-        super().__init__(score, date)
-        self.first_player = first_player
-        self.second_player = second_player
+    __slots__ = ()
+
+    @property
+    def first_player(self) -> Player:
+        return Player(self.log, self.log.player_codes[self.index, 0])
+
+    @property
+    def second_player(self) -> Player:
+        return Player(self.log, self.log.player_codes[self.index, 1])
 
     @property
     def winner(self) -> Player:
@@ -46,10 +117,15 @@ class SinglesGame(Game):
 
 
 class DoublesGame(Game):
-    def __init__(self, first_team: Tuple[Player], second_team: Tuple[Player], score: Tuple[int], date: datetime.datetime):
-        super().__init__(score, date)
-        self.first_team = first_team
-        self.second_team = second_team
+    __slots__ = ()
+
+    @property
+    def first_team(self) -> Tuple[Player]:
+        return tuple(Player(self.log, code) for code in self.log.player_codes[self.index, :2])
+
+    @property
+    def second_team(self) -> Tuple[Player]:
+        return tuple(Player(self.log, code) for code in self.log.player_codes[self.index, 2:])
 
     @property
     def winner(self) -> Tuple[Player]:
@@ -58,418 +134,1908 @@ class DoublesGame(Game):
     @property
     def loser(self) -> Tuple[Player]:
         return self.first_team if self.score[0] < self.score[1] else self.second_team
-   
-
-def read_games(file_path: str) -> pd.DataFrame:
-    with open(file_path, 'r') as f:
-        games_df = pd.read_csv(f)
-    return games_df
 
 
-def avg_games_chart(games_df):
+class GameLog:
     """
-    Plots the average games played per day for each player in a bar chart.
+    A compact, columnar log of games.
 
-    Note: Only days where at least one game was played are considered.
+    Players are stored as int16 codes into `players` (-1 marks an empty slot), scores as int8 and dates as
+    int32 day numbers since the epoch. All singles games are stored before all doubles games, so `singles`
+    and `doubles` are zero-copy slices of the same arrays; `rows` holds the original row number of each game.
     """
-    # Melt the DataFrame to have a single column for players
-    melted_df = games_df.melt(id_vars=['date'], value_vars=['player1', 'player2'], var_name='player_role', value_name='player')
-    unique_player_days = melted_df.drop_duplicates(subset=['player', 'date'])
+    def __init__(self, players: np.ndarray, player_codes: np.ndarray, scores: np.ndarray, days: np.ndarray,
+                 rows: np.ndarray, num_singles: int):
+        self.players = players
+        self.player_codes = player_codes
+        self.scores = scores
+        self.days = days
+        self.rows = rows
+        self.num_singles = num_singles
+
+    @classmethod
+    def from_frame(cls, games_df: pd.DataFrame) -> 'GameLog':
+        codes, players = player_codes(games_df)
+        scores = games_df[['score1', 'score2']].to_numpy(dtype=np.int8)
+        days = pd.to_datetime(games_df['date']).to_numpy(dtype='datetime64[D]').astype(np.int32)
+
+        # a stable partition keeps the singles and doubles games in their original order
+        is_singles = codes[:, 2] < 0
+        order = np.argsort(~is_singles, kind='stable')
+        return cls(np.asarray(players, dtype=object), codes[order], scores[order], days[order],
+                   order.astype(np.int32), int(is_singles.sum()))
+
+    def recode(self, players: np.ndarray) -> 'GameLog':
+        """
+        Returns the same games with the player codes taken from `players`, which must contain every player of the log.
+        """
+        lookup = pd.Index(players).get_indexer(self.players)
+        codes = np.where(self.player_codes >= 0, lookup[self.player_codes], -1).astype(np.int16)
+        return GameLog(players, codes, self.scores, self.days, self.rows, self.num_singles)
+
+    def extend(self, other: 'GameLog') -> 'GameLog':
+        """
+        Returns a new log with the games of `other` appended after the games of this log.
+        New players are given codes after the existing ones, so the codes of this log stay valid.
+        """
+        players = np.concatenate([self.players, other.players[~np.isin(other.players, self.players)]])
+        return GameLog.concatenate([self, other.recode(players)], players)
+
+    @classmethod
+    def concatenate(cls, logs: list, players: np.ndarray) -> 'GameLog':
+        """
+        Returns a log of the games of every log one after another, whose player codes must all index into `players`.
+        """
+        offsets = np.cumsum([0] + [len(log) for log in logs])
+        parts = [log.singles for log in logs] + [log.doubles for log in logs]
+        rows = ([log.rows[:log.num_singles] + offset for log, offset in zip(logs, offsets)] +
+                [log.rows[log.num_singles:] + offset for log, offset in zip(logs, offsets)])
+        return cls(players,
+                   np.concatenate([part.player_codes for part in parts]),
+                   np.concatenate([part.scores for part in parts]),
+                   np.concatenate([part.days for part in parts]),
+                   np.concatenate(rows),
+                   sum(log.num_singles for log in logs))
+
+    def first_appearances(self) -> np.ndarray:
+        """
+        Returns the players in the order `player_codes` codes them when the whole log is read at once:
+        by first appearance as player 1, 2, 3 and then 4, in the original order of the games.
+        """
+        in_order = np.empty_like(self.player_codes)
+        in_order[self.rows] = self.player_codes
+        flat = in_order.ravel('F')
+        flat = flat[flat >= 0]
+        # writing the positions backwards leaves the first position of every code
+        first_seen = np.full(len(self.players), len(flat))
+        first_seen[flat[::-1]] = np.arange(len(flat))[::-1]
+        return self.players[np.argsort(first_seen, kind='stable')[:np.count_nonzero(first_seen < len(flat))]]
+
+    def _slice(self, start: int, stop: int) -> 'GameLog':
+        return GameLog(self.players, self.player_codes[start:stop], self.scores[start:stop], self.days[start:stop],
+                       self.rows[start:stop], max(0, min(stop, self.num_singles) - start))
 
-    # Calculate the number of unique days each player played
-    player_days = unique_player_days.groupby('player')['date'].nunique().reset_index()
-    player_days.columns = ['player', 'unique_days']
-
-    # Group by player and date to get the total games played by each player on each day
-    daily_games = melted_df.groupby(['player', 'date']).size().reset_index(name='games_played')
+    @property
+    def singles(self) -> 'GameLog':
+        return self._slice(0, self.num_singles)
 
-    # Calculate the average games played per day for each player
-    avg_games_per_day = daily_games.groupby('player')['games_played'].mean().reset_index()
-    avg_games_per_day.columns = ['player', 'avg_games']
-    avg_games_per_day['avg_games'] = avg_games_per_day['avg_games'].round(2)
-    avg_games_per_day = avg_games_per_day.sort_values('avg_games', ascending=False)
+    @property
+    def doubles(self) -> 'GameLog':
+        return self._slice(self.num_singles, len(self))
 
-    # Create a bar chart
-    source = ColumnDataSource(avg_games_per_day)
-    p = figure(x_range=avg_games_per_day['player'], title='Average Games Played per Day for Each Player',
-               x_axis_label='Player', y_axis_label='Average Games Played', 
-               height=700, width=700, margin=(50, 50, 50, 50),
-               toolbar_location=None)
+    @property
+    def dates(self) -> np.ndarray:
+        return self.days.astype('datetime64[D]')
 
-    p.vbar(x='player', top='avg_games', width=0.9, source=source,
-           line_color='white', fill_color='navy')
+    def __len__(self) -> int:
+        return len(self.days)
 
-    # Customize the plot
-    p.xgrid.grid_line_color = None
-    p.y_range.start = 0
-    p.xaxis.major_label_orientation = 1.0
+    def __getitem__(self, index: int) -> Game:
+        return SinglesGame(self, index) if index < self.num_singles else DoublesGame(self, index)
 
-    return p
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
 
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Materializes the log as a DataFrame in the layout of the CSV, with parsed dates.
+        """
+        names = np.append(self.players, np.nan)
+        games_df = pd.DataFrame({column: names[self.player_codes[:, idx]] for idx, column in enumerate(PLAYER_COLUMNS)},
+                                index=self.rows)
+        games_df['score1'] = self.scores[:, 0].astype(np.int64)
+        games_df['score2'] = self.scores[:, 1].astype(np.int64)
+        games_df['date'] = self.dates.astype('datetime64[ns]')
+        return games_df
 
-def total_games_chart(players_df, source):
-    # Melt the DataFrame to have a single column for players
-    players_df['sorted_players'] = players_df.apply(lambda row: tuple(sorted([row['player1'], row['player2']])), axis=1)
-    unique_games_df = players_df.drop_duplicates(subset=['sorted_players'])
-    melted_df = unique_games_df.melt(id_vars=['total_games'], value_vars=['player1', 'player2'], var_name='player_role', value_name='player')
 
-    # Group by player and sum the total games played
-    leaderboard = melted_df.groupby('player').agg({
-        'total_games': 'sum'
-    }).reset_index()
-    leaderboard = leaderboard.sort_values('total_games', ascending=False)
+# the schema of a game log: players as categories, scores as small ints and dates as dates
+GAME_DTYPES = {'player1': 'category', 'player2': 'category', 'player3': 'category', 'player4': 'category',
+               'score1': np.int8, 'score2': np.int8}
 
-    # Create a bar chart
-    source = ColumnDataSource(leaderboard)
-    p = figure(x_range=leaderboard['player'], title='Total Games Played for Each Player',
-               x_axis_label='Player', y_axis_label='Total Games Played', 
-               height=700, width=700,  margin=(50, 50, 50, 50),
-               toolbar_location=None)
 
-    p.vbar(x='player', top='total_games', width=0.9, source=source,
-           line_color='white', fill_color='navy')
+def read_games(file_path) -> pd.DataFrame:
+    """
+    Reads a game log from a CSV file with the schema of GAME_DTYPES and parsed dates.
+    """
+    return pd.read_csv(file_path, dtype=GAME_DTYPES, parse_dates=['date'], date_format='ISO8601')
 
-    # Customize the plot
-    p.xgrid.grid_line_color = None
-    p.y_range.start = 0
-    p.xaxis.major_label_orientation = 1.0
 
-    return p
+# the rows of a CSV parsed at a time, which bounds the memory of reading a game log however long it gets
+CHUNK_SIZE = 500000
 
 
-def total_games_matrix(players_df, source):
+def read_chunks(f, header: bytes, digest, chunk_size: int = CHUNK_SIZE):
     """
-    Plots the total games played between each pair of players in a matrix plot.
-    More precisely, the entry in the ith row and jth column is the total number of games played between the ith and jth players.
+    Reads the rest of a CSV file opened in binary mode `chunk_size` rows at a time, yielding each chunk as a frame
+    parsed with the header row, and adding the bytes read to the running hash `digest`.
     """
-    color_mapper = LinearColorMapper(palette=Inferno256, low=players_df['total_games'].min(), high=players_df['total_games'].max())
-    players = players_df['player1'].unique()
-    matrix_plot = figure(title='Total Games Played', x_range=players, y_range=players, 
-                         x_axis_location='above', width=700, height=700, margin=(50, 50, 50, 50),
-                         tools='hover,save', tooltips='@player1 vs @player2: @total_games', toolbar_location=None)
-    matrix_plot.rect(x='player2', y='player1', width=1, height=1, source=source,
-                     line_color=None, fill_color=transform('total_games', color_mapper))
-    matrix_plot.xaxis.major_label_orientation = 1.0
-    # matrix_plot.yaxis.major_label_orientation = 1.0
-    color_bar = ColorBar(color_mapper=color_mapper, location=(0, 0))
-    matrix_plot.add_layout(color_bar, 'right')
+    while True:
+        data = b''.join(itertools.islice(f, chunk_size))
+        if not data:
+            return
+        digest.update(data)
+        yield read_games(io.BytesIO(header + data))
 
-    return matrix_plot
 
+def player_codes(games_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codes the players of a game log in order of first appearance as player 1, 2, 3 and then 4, returning the
+    codes of the four slots of every game (-1 for an empty slot) and the players by code.
 
-def total_games_solo_leaderboard(players_df, games_df):
+    When the player columns are categorical, as read by `read_games`, only their small-int category codes are factorized.
     """
-    Creates a leaderboard of players based on the total number of games played.
+    columns = [games_df[column] for column in PLAYER_COLUMNS]
+    if all(isinstance(column.dtype, pd.CategoricalDtype) for column in columns):
+        # map the categories of every column into one shared index, keeping -1 for the empty slots
+        names = pd.Index(np.concatenate([column.cat.categories.to_numpy(dtype=object) for column in columns])).unique()
+        values = np.column_stack([np.append(names.get_indexer(column.cat.categories), -1)[column.cat.codes.to_numpy()]
+                                  for column in columns])
+    else:
+        values, names = pd.factorize(games_df[PLAYER_COLUMNS].to_numpy(dtype=object).ravel('F'))
+        values = values.reshape(len(games_df), len(PLAYER_COLUMNS), order='F')
+
+    # renumber the players in order of first appearance
+    flat = values.ravel('F')
+    present = flat >= 0
+    codes = np.full(len(flat), -1, dtype=np.int16)
+    codes[present], first_seen = pd.factorize(flat[present])
+    return codes.reshape(values.shape, order='F'), np.asarray(names[first_seen], dtype=object)
+
+
+def singles_roster(singles: GameLog) -> np.ndarray:
     """
-    # Melt the DataFrame to have a single column for players
-    players_df['sorted_players'] = players_df.apply(lambda row: tuple(sorted([row['player1'], row['player2']])), axis=1)
-    unique_games_df = players_df.drop_duplicates(subset=['sorted_players'])
-    melted_df = unique_games_df.melt(id_vars=['total_games'], value_vars=['player1', 'player2'], var_name='player_role', value_name='player')
-    melted_df = melted_df[melted_df['total_games'] > 0]
+    Returns the codes of the players who played singles, in order of first appearance as player 1 and then as player 2.
+    """
+    codes = np.concatenate([singles.player_codes[:, 0], singles.player_codes[:, 1]])
+    _, first_seen = np.unique(codes, return_index=True)
+    return codes[np.sort(first_seen)]
 
-    # Group by player and sum the total games played
-    leaderboard = melted_df.groupby('player').agg({
-        'total_games': 'sum'
-    }).reset_index()
 
-    # Compute the average games per day for each player
-    # Melt the DataFrame to have a single column for players
-    melted_df = games_df.melt(id_vars=['date'], value_vars=['player1', 'player2'], var_name='player_role', value_name='player')
-    unique_player_days = melted_df.drop_duplicates(subset=['player', 'date'])
+class PairCounts:
+    """
+    Counters of ordered pairs of players, stored sparsely.
 
-    # Calculate the number of unique days each player played
-    player_days = unique_player_days.groupby('player')['date'].nunique().reset_index()
-    player_days.columns = ['player', 'unique_days']
+    Only the pairs that met are stored, as one row of player codes per pair in `pairs`, sorted by code, with
+    their counters in the matching row of `counts`. So the size grows with the number of pairs that actually
+    played rather than with the square of the roster.
+    """
+    def __init__(self, pairs: np.ndarray, counts: np.ndarray):
+        self.pairs = pairs
+        self.counts = counts
+
+    @classmethod
+    def from_entries(cls, first: np.ndarray, second: np.ndarray, weights: np.ndarray) -> 'PairCounts':
+        """
+        Sums the rows of weights, one column per counter, over the entries of each ordered pair (first, second).
+        """
+        keys = first.astype(np.int64) << 32 | second.astype(np.int64)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        counts = np.column_stack([np.bincount(inverse, weights=column, minlength=len(keys)) for column in weights.T])
+        pairs = np.column_stack([keys >> 32, keys & 0xFFFFFFFF])
+        return cls(pairs, counts.astype(np.int64).reshape(len(keys), weights.shape[1]))
+
+    def merge(self, other: 'PairCounts') -> 'PairCounts':
+        """
+        Adds up two sets of counters whose player codes agree, e.g. those of a log and of its appended games.
+        """
+        pairs = np.concatenate([self.pairs, other.pairs])
+        return PairCounts.from_entries(pairs[:, 0], pairs[:, 1], np.concatenate([self.counts, other.counts]))
+
+    def recode(self, lookup: np.ndarray) -> 'PairCounts':
+        """
+        Returns the same counters with every player code c replaced by lookup[c].
+        """
+        return PairCounts.from_entries(lookup[self.pairs[:, 0]], lookup[self.pairs[:, 1]], self.counts)
+
+    def frame(self, columns: list, players: np.ndarray, roster: np.ndarray) -> pd.DataFrame:
+        """
+        Arranges the counters of the pairs of players in the roster as a frame indexed by (player1, player2),
+        in roster order.
+        """
+        position = np.full(len(players), -1, dtype=np.int64)
+        position[roster] = np.arange(len(roster))
+        first, second = position[self.pairs[:, 0]], position[self.pairs[:, 1]]
+        kept = np.flatnonzero((first >= 0) & (second >= 0))
+        kept = kept[np.lexsort((second[kept], first[kept]))]
+        names = players[self.pairs[kept]]
+        return pd.DataFrame(self.counts[kept], columns=columns,
+                            index=pd.MultiIndex.from_arrays([names[:, 0], names[:, 1]], names=['player1', 'player2']))
+
+
+PAIR_STATS = ['wins', 'losses', 'points_for', 'points_against', 'point_diff']
+
+
+def pair_entries(singles: GameLog) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the head-to-head entries of the singles games as (first player, second player, weights), one weight
+    per stat in PAIR_STATS. Each game contributes one entry from each player's side to each of four blocks of
+    entries, so that the entries of game i are rows i, n + i, 2n + i and 3n + i of n games.
+    """
+    first = singles.player_codes[:, 0].astype(np.int64)
+    second = singles.player_codes[:, 1].astype(np.int64)
+    score1 = singles.scores[:, 0].astype(np.int64)
+    score2 = singles.scores[:, 1].astype(np.int64)
+
+    winner = np.where(score1 > score2, first, second)
+    loser = np.where(score1 < score2, first, second)
+    point_diff = np.abs(score1 - score2)
+    zeros = np.zeros_like(score1)
+    ones = np.ones_like(score1)
+
+    # one block of entries per (pair, stats) combination, in the columns of PAIR_STATS
+    entries = [(winner, loser, [ones, zeros, zeros, zeros, point_diff]),
+               (loser, winner, [zeros, ones, zeros, zeros, -point_diff]),
+               (first, second, [zeros, zeros, score1, score2, zeros]),
+               (second, first, [zeros, zeros, score2, score1, zeros])]
+    return (np.concatenate([rows for rows, _, _ in entries]),
+            np.concatenate([cols for _, cols, _ in entries]),
+            np.concatenate([np.column_stack(weights) for _, _, weights in entries]))
+
+
+def pair_counts(singles: GameLog) -> PairCounts:
+    """
+    Computes the head-to-head totals of every ordered pair of players who met in a single batched pass.
 
-    # Group by player and date to get the total games played by each player on each day
-    daily_games = melted_df.groupby(['player', 'date']).size().reset_index(name='games_played')
+    The entries of each pair, see `pair_entries`, are summed with a scatter-add. The counters of (i, j) hold
+    the stats of player i against player j.
+    """
+    return PairCounts.from_entries(*pair_entries(singles))
 
-    # Calculate the average games played per day for each player
-    avg_games_per_day = daily_games.groupby('player')['games_played'].mean().reset_index()
-    avg_games_per_day.columns = ['player', 'avg_games']
-    avg_games_per_day['avg_games'] = avg_games_per_day['avg_games'].round(2)
-    avg_games_per_day = avg_games_per_day.sort_values('avg_games', ascending=False)
-    leaderboard = leaderboard.merge(avg_games_per_day, on='player', how='left')
 
-    # Sort the leaderboard by total games played and assign ranks
-    leaderboard = leaderboard.sort_values(['avg_games', 'total_games'], ascending=False)
-    leaderboard['rank'] = range(1, len(leaderboard) + 1)
+def daily_pair_counts(singles: GameLog) -> Tuple[np.ndarray, PairCounts]:
+    """
+    Computes the head-to-head totals of every ordered pair of players on every day they met, returning the day number
+    of each row of counters and the counters, sorted by day.
+    """
+    first, second, weights = pair_entries(singles)
+    # count by (day, pair) rather than by pair, coding each pair by its position among the pairs who met
+    keys, pair = np.unique(first << 32 | second, return_inverse=True)
+    cells = PairCounts.from_entries(np.tile(singles.days, 4), pair, weights)
+    pairs = np.column_stack([keys >> 32, keys & 0xFFFFFFFF])
+    return cells.pairs[:, 0], PairCounts(pairs[cells.pairs[:, 1]], cells.counts)
 
-    # Create the ColumnDataSource and DataTable
-    source = ColumnDataSource(leaderboard)
-    columns = [TableColumn(field='rank', title='Rank'),
-               TableColumn(field='player', title='Player'),
-               TableColumn(field='avg_games', title='Average Games per Day'),
-               TableColumn(field='total_games', title='Total Games Played')]
-    
-    data_table = DataTable(source=source, columns=columns, 
-                           index_position=None, margin=(50, 50, 0, 50),
-                           width=700, height=300)
-    caveat = Div(text='<p><strong>Note:</strong> The average games per day only considers days when the player actually played, i.e., missed days do not penalize.</p>',
-                 margin=(25, 50, 50, 50))
-    return Column(data_table, caveat)
-    
 
-def total_games_pairs_leaderboard(players_df, games_df):
+def pair_stats(counts: PairCounts, players: np.ndarray, roster: np.ndarray) -> pd.DataFrame:
     """
-    Creates a leaderboard of players based on the total number of games played.
-    Ensures that "Player 1 vs Player 2" is considered the same as "Player 2 vs Player 1".
+    Arranges the head-to-head totals of the players in the roster as a frame indexed by (player1, player2).
+    Only the pairs who met have a row.
     """
-    # Create a unique pair identifier
-    players_df = players_df[players_df['total_games'] > 0].copy()
-    players_df.loc[:, 'pair'] = players_df.apply(lambda row: tuple(sorted([row['player1'], row['player2']])), axis=1)
+    return counts.frame(PAIR_STATS, players, roster)
 
-    # Group by the unique pair identifier and sum the total games played
-    leaderboard = players_df.groupby('pair').agg({
-        'player1': 'first',
-        'player2': 'first',
-        'total_games': 'max'
-    }).reset_index(drop=True)
 
-    # Compute the average games per day for each pair of players
-    avg_games_per_day = []
-    for _, row in leaderboard.iterrows():
-        player1, player2 = row['player1'], row['player2']
-        games_played = games_df[((games_df['player1'] == player1) & (games_df['player2'] == player2)) |
-                                ((games_df['player1'] == player2) & (games_df['player2'] == player1))]
-        days_played = games_played['date'].nunique()
-        avg_games = row['total_games'] / days_played if days_played > 0 else 0
-        avg_games_per_day.append(round(avg_games, 2))
+def pair_records(players_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the total games, win differential and average point differential of each pair to their head-to-head totals,
+    and moves the players from the index to columns. Records are formatted from the wins and losses in the browser.
+    """
+    players_df = players_df.copy()
+    players_df['total_games'] = players_df['wins'] + players_df['losses']
+    players_df['win_differential'] = players_df['wins'] - players_df['losses']
+    players_df.loc[players_df['total_games'] == 0, ['point_diff', 'win_differential']] = np.nan
+    players_df['avg_point_diff'] = (players_df['point_diff'] / players_df['total_games']).round(1)
+    return players_df.reset_index()
 
-    leaderboard['avg_games_per_day'] = avg_games_per_day
 
-    
-    leaderboard = leaderboard.sort_values(['avg_games_per_day', 'total_games'], ascending=False)
-    leaderboard['rank'] = range(1, len(leaderboard)+1)
-    source = ColumnDataSource(leaderboard)
-    columns = [TableColumn(field='rank', title='Rank'),
-               TableColumn(field='player1', title='Player 1'),
-               TableColumn(field='player2', title='Player 2'),
-               TableColumn(field='avg_games_per_day', title='Average Games per Day'),
-               TableColumn(field='total_games', title='Total Games Played')]
-    data_table = DataTable(source=source, columns=columns, 
-                           index_position=None,  margin=(50, 50, 0, 50),
-                           width=700, height=300)
-    caveat = Div(text='<p><strong>Note:</strong> The average games per day for a pair only considers days when <em>both</em> players played.</p>',
-                 margin=(25, 50, 50, 50))
-    return Column(data_table, caveat)
+class PairCube:
+    """
+    Cumulative head-to-head counters of every ordered pair of players by day, for the stats of any window of days.
+
+    `cumulative[d]` holds the counters of the pairs in `pairs` over the games before day `first_day + d`, so the counters
+    over a window of days are the difference of two slices, however long the window or the log. The cube is saved as a
+    plain .npy file, so that it is memory-mapped rather than read, and only the two slices of a window are paged in.
+    `digest` is the hash of the CSV the cube was computed from; see `load_cube`.
+    """
+    def __init__(self, pairs: np.ndarray, first_day: int, cumulative: np.ndarray, digest: str = None):
+        self.pairs = pairs
+        self.first_day = first_day
+        self.cumulative = cumulative
+        self.digest = digest
+
+    @classmethod
+    def from_log(cls, singles: GameLog, digest: str = None) -> 'PairCube':
+        first, second, weights = pair_entries(singles)
+        days = np.tile(singles.days, 4)
+        first_day = int(days.min()) if len(days) else 0
+        num_days = int(days.max()) - first_day + 1 if len(days) else 0
+
+        # scatter the entries straight into a days x pairs x stats cube, then sum it up along the days in place,
+        # so that the cube is the only array of its size
+        keys, inverse = np.unique(first << 32 | second, return_inverse=True)
+        cells = (days - first_day).astype(np.int64) * len(keys) + inverse
+        cumulative = np.zeros((num_days + 1, len(keys), len(PAIR_STATS)), dtype=np.int32)
+        np.add.at(cumulative[1:].reshape(-1, len(PAIR_STATS)), cells, weights.astype(np.int32))
+        np.cumsum(cumulative[1:], axis=0, out=cumulative[1:])
+        return cls(np.column_stack([keys >> 32, keys & 0xFFFFFFFF]), first_day, cumulative, digest)
+
+    def window(self, start=None, end=None) -> PairCounts:
+        """
+        Returns the head-to-head totals over the games from the start date through the end date of the pairs who met
+        in between. Either end may be left open.
+        """
+        num_days = len(self.cumulative) - 1
+        first = 0 if start is None else int(np.clip(np.datetime64(start, 'D').astype(np.int64) - self.first_day, 0, num_days))
+        last = num_days if end is None else int(np.clip(np.datetime64(end, 'D').astype(np.int64) - self.first_day + 1, 0, num_days))
+        counts = (self.cumulative[max(first, last)] - self.cumulative[first]).astype(np.int64)
+        met = counts[:, PAIR_STATS.index('wins')] + counts[:, PAIR_STATS.index('losses')] > 0
+        return PairCounts(self.pairs[met], counts[met])
+
+    def save(self, file_path: Path):
+        """
+        Writes the cumulative counters to a .npy file, and the pairs, first day and digest to a `<cube>.index.npz` next to it.
+        """
+        index_file = file_path.with_suffix('.index.npz')
+        # without its index, a cube is never read, so a half-written cube is never mistaken for a complete one
+        index_file.unlink(missing_ok=True)
+        tmp_file = file_path.with_name(file_path.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.save(f, self.cumulative)
+        os.replace(tmp_file, file_path)
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, pairs=self.pairs, first_day=self.first_day, digest=self.digest or '')
+        os.replace(tmp_file, index_file)
+
+    @classmethod
+    def load(cls, file_path: Path) -> 'PairCube':
+        """
+        Memory-maps a cube written by `save`.
+        """
+        with np.load(file_path.with_suffix('.index.npz')) as index:
+            pairs, first_day, digest = index['pairs'], int(index['first_day']), str(index['digest'])
+        cumulative = np.load(file_path, mmap_mode='r')
+        if cumulative.shape[1:] != (len(pairs), len(PAIR_STATS)):
+            raise ValueError(f'{file_path} does not match its index')
+        return cls(pairs, first_day, cumulative, digest or None)
+
+
+def load_cube(state: 'LeagueState', cube_file: Path) -> PairCube:
+    """
+    Returns the cube of the singles games of a league loaded by `load_league`, memory-mapped from a file,
+    which is rewritten whenever the games changed since it was written.
+    """
+    if state.digest is not None:
+        try:
+            cube = PairCube.load(cube_file)
+            if cube.digest == state.digest:
+                return cube
+        except (OSError, KeyError, ValueError):
+            pass
+    PairCube.from_log(state.log.singles, state.digest).save(cube_file)
+    return PairCube.load(cube_file)
+
 
+DAILY_STATS = ['games', 'wins', 'point_diff']
 
-def avg_games_line_graph(players_df, games_df):
+
+def daily_counts(singles: GameLog) -> Tuple[int, np.ndarray]:
     """
-    Plots the average games played per day over time for each player in a line graph.
+    Computes the singles games, wins and point differential of every player on every day in a single batched pass.
 
-    Note: Only days where at least one game was played are considered.
-    So, if a player did not play any games on a particular day, the value for that day
-    will be the same as the previous day.
+    Returns the day number of the first game and one players x days matrix per stat in DAILY_STATS,
+    covering every calendar day between the first and last game.
     """
-    players = players_df['player1'].unique()
-    num_players = len(players)
-    colors = Category20[num_players] if num_players <= 20 else viridis(num_players)
-    line_graph = figure(x_axis_label='Date', y_axis_label='Average Games Played per Day', title='Average Games Played per Day Over Time',
-                        x_axis_type='datetime', margin=(50, 50, 50, 50),
-                        width=1600, height=400, toolbar_location=None)
+    num_players = len(singles.players)
+    if len(singles) == 0:
+        return 0, np.zeros((len(DAILY_STATS), num_players, 0), dtype=np.int64)
+    first_day = int(singles.days.min())
+    num_days = int(singles.days.max()) - first_day + 1
 
-    # Add minor grid lines
-    line_graph.xaxis.minor_tick_line_color = 'black'
-    line_graph.yaxis.minor_tick_line_color = 'black'
-    line_graph.xgrid.minor_grid_line_color = 'gray'
-    line_graph.xgrid.minor_grid_line_alpha = 0.1
-    line_graph.ygrid.minor_grid_line_color = 'gray'
-    line_graph.ygrid.minor_grid_line_alpha = 0.1
+    # each game contributes one entry for each of its two players
+    players = singles.player_codes[:, :2].T.ravel().astype(np.int64)
+    days = np.tile(singles.days - first_day, 2)
+    score1 = singles.scores[:, 0].astype(np.int64)
+    score2 = singles.scores[:, 1].astype(np.int64)
+    wins = np.concatenate([score1 > score2, score2 > score1])
+    point_diff = np.concatenate([score1 - score2, score2 - score1])
 
-    # add the lines with styling and tooltips
-    # lines represent the average games played per day by each player over all the dates played
-    all_dates = pd.date_range(start=games_df['date'].min(), end=games_df['date'].max())
-    for idx, player in enumerate(players):
-        games_played = games_df[(games_df['player1'] == player) | (games_df['player2'] == player)].sort_values('date')
-        player_games = pd.DataFrame({'date': all_dates}).set_index('date')
-        games_played = games_played.groupby('date').size()
-        player_games['games_played'] = games_played.rolling(window=7, min_periods=1).mean()
-        player_games['games_played'] = player_games['games_played'].ffill()
-        player_source = ColumnDataSource(player_games.reset_index())
-        line = line_graph.line('date', 'games_played', source=player_source, legend_label=player, 
-                               name=player, line_width=3, color=colors[idx % len(colors)])
-        hover = HoverTool(renderers=[line], tooltips=[('Player', player), ('Date', '@date{%F}'), ('Average Games', '@games_played{0.00}')], formatters={'@date': 'datetime'})
-        line_graph.add_tools(hover)
-    line_graph.add_layout(line_graph.legend[0], 'right')
-    line_graph.legend.click_policy = 'hide'
+    def scatter(weights=None):
+        totals = np.bincount(players * num_days + days, weights=weights, minlength=num_players * num_days)
+        return totals.astype(np.int64).reshape(num_players, num_days)
 
-    return line_graph
+    return first_day, np.stack([scatter(), scatter(wins), scatter(point_diff)])
 
 
-def total_games_line_graph(players_df, games_df):
+class DailyStats:
     """
-    Plots the total games played over time for each player in a line graph.
+    The singles games, wins and point differential of every player on every date, as players x dates matrices.
+
+    The dates cover every calendar day between the first and last game, so that cumulative series are
+    cumulative sums along the rows.
     """
-    players = players_df['player1'].unique()
-    num_players = len(players)
-    colors = Category20[num_players] if num_players <= 20 else viridis(num_players)
-    line_graph = figure(x_axis_label='Date', y_axis_label='Total Games Played', title='Total Games Played Over Time',
-                        x_axis_type='datetime', margin=(50, 50, 50, 50),
-                        width=1600, height=400, toolbar_location=None)
+    def __init__(self, players: np.ndarray, dates: pd.DatetimeIndex, games: np.ndarray, wins: np.ndarray, point_diff: np.ndarray):
+        self.players = players
+        self.dates = dates
+        self.games = games
+        self.wins = wins
+        self.point_diff = point_diff
+
+    @classmethod
+    def from_counts(cls, players: np.ndarray, first_day: int, counts: np.ndarray, roster: np.ndarray) -> 'DailyStats':
+        dates = pd.date_range(start=np.datetime64(first_day, 'D'), periods=counts.shape[2])
+        games, wins, point_diff = counts[:, roster]
+        return cls(players[roster], dates, games, wins, point_diff)
+
+    def subset(self, rows: np.ndarray) -> 'DailyStats':
+        """
+        Returns the daily stats of the players at the given rows only.
+        """
+        return DailyStats(self.players[rows], self.dates, self.games[rows], self.wins[rows], self.point_diff[rows])
+
+
+def player_totals(daily: DailyStats) -> pd.DataFrame:
+    """
+    Returns the singles games of every player, the days they played on and their average games per day played,
+    in the order of their names, as sums over the rows of the daily stats.
+    """
+    total_games = daily.games.sum(axis=1)
+    days = (daily.games > 0).sum(axis=1)
+    totals = pd.DataFrame({'player': daily.players, 'total_games': total_games, 'days': days,
+                           'avg_games': ratio(total_games, days).round(2)})
+    return totals.sort_values('player').reset_index(drop=True)
 
-    # Add minor grid lines
-    line_graph.xaxis.minor_tick_line_color = 'black'
-    line_graph.yaxis.minor_tick_line_color = 'black'
-    line_graph.xgrid.minor_grid_line_color = 'gray'
-    line_graph.xgrid.minor_grid_line_alpha = 0.1
-    line_graph.ygrid.minor_grid_line_color = 'gray'
-    line_graph.ygrid.minor_grid_line_alpha = 0.1
 
-    # add the lines with styling and tooltips
-    # lines represent the cumulative games played by each player over all the dates played
-    all_dates = pd.date_range(start=games_df['date'].min(), end=games_df['date'].max())
-    for idx, player in enumerate(players):
-        games_played = games_df[(games_df['player1'] == player) | (games_df['player2'] == player)].sort_values('date')
-        player_games = pd.DataFrame({'date': all_dates}).set_index('date')
-        games_played_count = games_played['date'].value_counts().sort_index()
-        player_games['games_played'] = games_played_count
-        player_games['games_played'] = player_games['games_played'].fillna(0)
-        player_games['cumulative_sum'] = player_games['games_played'].cumsum()
-        player_source = ColumnDataSource(player_games.reset_index())
-        line = line_graph.line('date', 'cumulative_sum', source=player_source, legend_label=player, 
-                               name=player, line_width=3, color=colors[idx % len(colors)])
-        # hover = HoverTool(renderers=[line], tooltips=[('', player)])
-        hover = HoverTool(renderers=[line], tooltips=[('Player', player), ('Date', '@date{%F}'), ('Total Games', '@cumulative_sum')], formatters={'@date': 'datetime'})
-        line_graph.add_tools(hover)
-    line_graph.add_layout(line_graph.legend[0], 'right')
-    line_graph.legend.click_policy = 'hide'
+# the rolling windows offered by the line graphs, in calendar days
+ROLLING_WINDOWS = (7, 30, 90)
 
-    return line_graph
 
+class RollingStats:
+    """
+    The games per day, win rate and point differential per game of every player over rolling windows of calendar days,
+    as windows x players x dates arrays aligned with the dates of a DailyStats.
 
-def total_games_dashboard(players_df, games_df, source):
-    avg_solo_chart = avg_games_chart(games_df)
-    total_solo_chart = total_games_chart(players_df, source)
-    total_solo_leaderboard = total_games_solo_leaderboard(players_df, games_df)
-    matrix_plot = total_games_matrix(players_df, source)
-    pairs_leaderboard = total_games_pairs_leaderboard(players_df, games_df)
-    avg_line_graph = avg_games_line_graph(players_df, games_df)
-    total_line_graph = total_games_line_graph(players_df, games_df)
-    return Column(Row(Column(avg_solo_chart, total_solo_chart, total_solo_leaderboard), Column(matrix_plot, pairs_leaderboard)), 
-                  avg_line_graph,
-                  total_line_graph)
+    The days without games count towards the games per day, and the win rate and point differential are NaN while
+    a player has no games in the window. Until a window fits in the days since the first game of a player, it covers
+    those days only, and before that the games per day are NaN too.
+    """
+    def __init__(self, windows: np.ndarray, games_per_day: np.ndarray, win_rate: np.ndarray, point_diff: np.ndarray):
+        self.windows = windows
+        self.games_per_day = games_per_day
+        self.win_rate = win_rate
+        self.point_diff = point_diff
+
+    @classmethod
+    def from_daily(cls, daily: DailyStats, windows: Tuple[int] = ROLLING_WINDOWS) -> 'RollingStats':
+        windows = np.asarray(windows, dtype=np.int64)
+        num_days = daily.games.shape[1]
+
+        # the sum of a stat over any window is the difference of two columns of its cumulative sums, so every window
+        # of every player and stat is one subtraction of two gathers, however long the windows are
+        cumulative = np.zeros((len(DAILY_STATS), len(daily.players), num_days + 1), dtype=np.int64)
+        np.cumsum(np.stack([daily.games, daily.wins, daily.point_diff]), axis=2, out=cumulative[:, :, 1:])
+        end = np.arange(1, num_days + 1)
+        start = np.maximum(end - windows[:, None], 0)
+        games, wins, point_diff = (cumulative[:, :, None, end] - cumulative[:, :, start]).swapaxes(1, 2)
+
+        # the days of each window start from the first game of each player, who played no games before it anyway
+        first_game = np.where(daily.games.any(axis=1), np.argmax(daily.games > 0, axis=1), num_days)
+        days = np.minimum(windows[:, None, None], end - first_game[:, None])
+        played = games > 0
+        return cls(windows, np.divide(games, days, out=np.full(games.shape, np.nan), where=days > 0),
+                   np.divide(wins, games, out=np.full(games.shape, np.nan), where=played),
+                   np.divide(point_diff, games, out=np.full(games.shape, np.nan), where=played))
+
+    def labels(self) -> list:
+        return [f'Last {window} days' for window in self.windows]
+
+    def subset(self, rows: np.ndarray) -> 'RollingStats':
+        """
+        Returns the rolling stats of the players at the given rows only.
+        """
+        return RollingStats(self.windows, self.games_per_day[:, rows], self.win_rate[:, rows], self.point_diff[:, rows])
+
+
+def pad_counts(counts: np.ndarray, num_players: int, first_day: int, new_first_day: int, num_days: int) -> np.ndarray:
+    """
+    Zero-pads daily counters indexed by (stat, player, day) to more players and to a wider range of days.
+    """
+    offset = first_day - new_first_day
+    return np.pad(counts, [(0, 0), (0, num_players - counts.shape[1]), (offset, num_days - offset - counts.shape[2])])
 
 
-def solo_wins_chart(players_df, source):
+DOUBLES_STATS = ['partner_wins', 'partner_losses', 'opponent_wins', 'opponent_losses']
+
+
+def doubles_roster(doubles: GameLog) -> np.ndarray:
     """
-    Plots the total number of wins for each player in a bar chart.
+    Returns the codes of the players who played doubles, in order of first appearance as player 1, 2, 3 and then 4.
     """
-    # Filter the DataFrame to include only rows where the player is player1
-    solo_games_df = players_df[['player1', 'wins']].copy()
-    leaderboard = solo_games_df.groupby('player1').agg({
-        'wins': 'sum'
-    }).reset_index()
-    leaderboard.rename(columns={'player1': 'player'}, inplace=True)
-    
-    # color bars based on positivity of win differential
-    color_palette = RdYlBu[11]
-    leaderboard['color'] = [color_palette[0] if x >= 0 else color_palette[-1] for x in leaderboard['wins']]
+    codes = doubles.player_codes.ravel('F')
+    _, first_seen = np.unique(codes, return_index=True)
+    return codes[np.sort(first_seen)]
 
-    # Sort the leaderboard by total games played and assign ranks
-    leaderboard = leaderboard.sort_values('wins', ascending=False)
-    leaderboard['rank'] = range(1, len(leaderboard) + 1)
 
-    # Create the ColumnDataSource and DataTable
-    source = ColumnDataSource(leaderboard)
-    p = figure(x_range=leaderboard['player'], title='Total Wins for Each Player',
-               x_axis_label='Player', y_axis_label='Total Wins', 
-               height=700, width=700,  margin=(50, 50, 50, 50),
-               toolbar_location=None)
+def aggregate_matchups(matchups: np.ndarray, wins: np.ndarray, losses: np.ndarray) -> Tuple[np.ndarray]:
+    """
+    Sums the wins and losses of repeated matchups, returning the distinct matchups with their totals.
+    """
+    # the four player codes of a matchup fit in 15 bits each, so each matchup packs into one integer key that sorts
+    # like its row, and is uniqued far faster than the rows
+    shifts = np.array([45, 30, 15, 0])
+    keys, inverse = np.unique(np.bitwise_or.reduce(matchups.astype(np.int64) << shifts, axis=1), return_inverse=True)
+    matchups = keys[:, None] >> shifts & 0x7FFF
+    return (matchups,
+            np.bincount(inverse, weights=wins, minlength=len(matchups)).astype(np.int64),
+            np.bincount(inverse, weights=losses, minlength=len(matchups)).astype(np.int64))
 
-    p.vbar(x='player', top='wins', width=0.9, source=source,
-           line_color='white', color='navy')
 
-    # Customize the plot
-    p.xgrid.grid_line_color = None
-    p.y_range.start = 0
-    p.xaxis.major_label_orientation = 1.0
+def orient_matchups(matchups: np.ndarray, wins: np.ndarray, losses: np.ndarray) -> Tuple[np.ndarray]:
+    """
+    Orients matchups of player codes (team 1, team 2) along with the wins and losses of team 1, so that each team's codes
+    are sorted and the team with the smaller codes comes first, and sums them over repeated matchups.
+    """
+    team1, team2 = np.sort(matchups[:, :2], axis=1), np.sort(matchups[:, 2:], axis=1)
+    swap = (team1[:, 0] > team2[:, 0]) | ((team1[:, 0] == team2[:, 0]) & (team1[:, 1] > team2[:, 1]))
+    matchups = np.where(swap[:, None], np.hstack([team2, team1]), np.hstack([team1, team2]))
+    return aggregate_matchups(matchups, np.where(swap, losses, wins), np.where(swap, wins, losses))
 
-    return p
 
+class DoublesStats:
+    """
+    The doubles records of the players, indexed by player code.
 
-def solo_wins_percentage_chart(players_df, source):
+    `counts` holds the counters in DOUBLES_STATS of the ordered pairs of players who met: the partner stats of (i, j)
+    count the games i and j played together, and the opponent stats the games i played against j.
+    Since the number of possible teams grows with the square of the roster, and that of team matchups with its
+    fourth power, the matchups are stored sparsely too: one row of player codes (team 1, team 2) per matchup that was
+    played, with each team's codes sorted and team 1 before team 2, along with the wins and losses of team 1.
     """
-    Plots the win percentage for each player in a bar chart.
+    def __init__(self, counts: PairCounts, matchups: np.ndarray, matchup_wins: np.ndarray, matchup_losses: np.ndarray):
+        self.counts = counts
+        self.matchups = matchups
+        self.matchup_wins = matchup_wins
+        self.matchup_losses = matchup_losses
+
+    @classmethod
+    def from_log(cls, doubles: GameLog) -> 'DoublesStats':
+        codes = doubles.player_codes.astype(np.int64)
+        team1_won = (doubles.scores[:, 0] > doubles.scores[:, 1]).astype(np.int64)
+        team2_won = (doubles.scores[:, 1] > doubles.scores[:, 0]).astype(np.int64)
+        zeros = np.zeros(4*len(doubles), dtype=np.int64)
+
+        # every player is paired with their partner, and with each of their two opponents
+        partner_rows, partner_cols = codes[:, [0, 1, 2, 3]].T.ravel(), codes[:, [1, 0, 3, 2]].T.ravel()
+        partner_won = np.concatenate([team1_won, team1_won, team2_won, team2_won])
+        partner_lost = np.concatenate([team2_won, team2_won, team1_won, team1_won])
+        opponent_rows, opponent_cols = codes[:, [0, 0, 1, 1, 2, 2, 3, 3]].T.ravel(), codes[:, [2, 3, 2, 3, 0, 1, 0, 1]].T.ravel()
+        opponent_won = np.concatenate([team1_won]*4 + [team2_won]*4)
+        opponent_lost = np.concatenate([team2_won]*4 + [team1_won]*4)
+        partner_weights = np.column_stack([partner_won, partner_lost, zeros, zeros])
+        opponent_weights = np.column_stack([np.concatenate([zeros, zeros]), np.concatenate([zeros, zeros]), opponent_won, opponent_lost])
+        counts = PairCounts.from_entries(np.concatenate([partner_rows, opponent_rows]), np.concatenate([partner_cols, opponent_cols]),
+                                         np.concatenate([partner_weights, opponent_weights]))
+
+        return cls(counts, *orient_matchups(codes, team1_won, team2_won))
+
+    def recode(self, lookup: np.ndarray) -> 'DoublesStats':
+        """
+        Returns the same records with every player code c replaced by lookup[c].
+        """
+        return DoublesStats(self.counts.recode(lookup), *orient_matchups(lookup[self.matchups], self.matchup_wins, self.matchup_losses))
+
+    def merge(self, other: 'DoublesStats') -> 'DoublesStats':
+        """
+        Adds up the records of two sets of games whose player codes agree, e.g. those of a log and of its appended games.
+        """
+        return DoublesStats(self.counts.merge(other.counts),
+                            *aggregate_matchups(np.concatenate([self.matchups, other.matchups]),
+                                                np.concatenate([self.matchup_wins, other.matchup_wins]),
+                                                np.concatenate([self.matchup_losses, other.matchup_losses])))
+
+
+def doubles_player_stats(doubles: DoublesStats, players: np.ndarray, roster: np.ndarray) -> pd.DataFrame:
     """
-    # Filter the DataFrame to include only rows where the player is player1
-    solo_games_df = players_df[['player1', 'wins', 'losses']].copy()
-    leaderboard = solo_games_df.groupby('player1').agg({
-        'wins': 'sum',
-        'losses': 'sum'
-    }).reset_index()
-    leaderboard.rename(columns={'player1': 'player'}, inplace=True)
-    leaderboard['win_percentage'] = 100*(leaderboard['wins'] / (leaderboard['wins'] + leaderboard['losses'])).round(2)
-    
-    # color bars based on positivity of win differential
-    color_palette = RdYlBu[11]
-    leaderboard['color'] = [color_palette[0] if x >= 0 else color_palette[-1] for x in leaderboard['win_percentage']]
+    Returns the doubles record of each player in the roster.
+    """
+    # every game of a player has exactly one partner
+    num_players = len(players)
+    player_codes = doubles.counts.pairs[:, 0]
+    wins = np.bincount(player_codes, weights=doubles.counts.counts[:, 0], minlength=num_players).astype(np.int64)[roster]
+    losses = np.bincount(player_codes, weights=doubles.counts.counts[:, 1], minlength=num_players).astype(np.int64)[roster]
+    doubles_df = pd.DataFrame({'player': players[roster], 'wins': wins, 'losses': losses})
+    doubles_df['total_games'] = doubles_df['wins'] + doubles_df['losses']
+    doubles_df['win_percentage'] = 100*(doubles_df['wins'] / doubles_df['total_games']).round(2)
+    return doubles_df
 
-    # Sort the leaderboard by total games played and assign ranks
-    leaderboard = leaderboard.sort_values('win_percentage', ascending=False)
-    leaderboard['rank'] = range(1, len(leaderboard) + 1)
 
-    # Create the ColumnDataSource and DataTable
-    source = ColumnDataSource(leaderboard)
-    p = figure(x_range=leaderboard['player'], title='Win Percentage for Each Player',
-               x_axis_label='Player', y_axis_label='Win Percentage', 
-               height=700, width=700,  margin=(50, 50, 50, 50),
-               toolbar_location=None)
+def doubles_pair_stats(doubles: DoublesStats, players: np.ndarray, roster: np.ndarray) -> pd.DataFrame:
+    """
+    Returns the record of every ordered pair of players in the roster who met as partners or as opponents.
+    """
+    pairs_df = doubles.counts.frame(DOUBLES_STATS, players, roster).reset_index()
+    for role in ['partner', 'opponent']:
+        wins, losses = pairs_df[f'{role}_wins'], pairs_df[f'{role}_losses']
+        pairs_df[f'{role}_games'] = wins + losses
+        pairs_df[f'{role}_win_percentage'] = 100*(wins / (wins + losses)).round(2)
+    return pairs_df
 
-    p.vbar(x='player', top='win_percentage', width=0.9, source=source,
-           line_color='white', color='navy')
 
-    # Customize the plot
-    p.xgrid.grid_line_color = None
-    p.y_range.start = 0
-    p.xaxis.major_label_orientation = 1.0
+def matchup_table(doubles: DoublesStats, players: np.ndarray) -> pd.DataFrame:
+    """
+    Returns the record of every team matchup that was played, from the side of team 1.
+    """
+    names = players[doubles.matchups]
+    matchups_df = pd.DataFrame({'team1': names[:, 0] + ' & ' + names[:, 1],
+                                'team2': names[:, 2] + ' & ' + names[:, 3],
+                                'wins': doubles.matchup_wins,
+                                'losses': doubles.matchup_losses})
+    matchups_df['total_games'] = matchups_df['wins'] + matchups_df['losses']
+    return matchups_df
 
-    return p
 
+CHECKPOINT_VERSION = 4
 
-def solo_wins_leaderboard(players_df, source):
+
+class LeagueState:
     """
-    Creates a leaderboard of players based on the total number of games played.
+    The aggregate state of a game log: the log itself plus its pair, daily and doubles counters, all indexed by player code.
+
+    The counters are sums over games, so the state of an appended log is the state of the old log plus
+    the counters of the new games; see `extend`. A counter that was not given, e.g. by a checkpoint, is only
+    aggregated from the log when it is first used, so that reading a league costs nothing but the log until
+    its stats are asked for.
     """
-    # Filter the DataFrame to include only rows where the player is player1
-    solo_games_df = players_df.copy()
-    leaderboard = solo_games_df.groupby('player1').agg({
-        'wins': 'sum',
-        'losses': 'sum',
-        'win_differential': 'max'
-    }).reset_index()
-    leaderboard.rename(columns={'player1': 'player'}, inplace=True)
-    leaderboard['win_percentage'] = 100*(leaderboard['wins'] / (leaderboard['wins'] + leaderboard['losses'])).round(2)
+    def __init__(self, log: GameLog, pair_counts: PairCounts = None, first_day: int = None, daily_counts: np.ndarray = None,
+                 doubles: DoublesStats = None):
+        self.log = log
+        self._pair_counts = pair_counts
+        self._daily = None if daily_counts is None else (first_day, daily_counts)
+        self._doubles = doubles
+        # the hash of the CSV the state covers, when loaded by `load_league` with a checkpoint
+        self.digest = None
+
+    @classmethod
+    def from_log(cls, log: GameLog) -> 'LeagueState':
+        return cls(log)
 
-    # Sort the leaderboard by total games played and assign ranks
-    leaderboard = leaderboard.sort_values(['win_percentage', 'wins'], ascending=False)
+    @property
+    def pair_counts(self) -> PairCounts:
+        if self._pair_counts is None:
+            self._pair_counts = pair_counts(self.log.singles)
+        return self._pair_counts
+
+    @property
+    def first_day(self) -> int:
+        if self._daily is None:
+            self._daily = daily_counts(self.log.singles)
+        return self._daily[0]
+
+    @property
+    def daily_counts(self) -> np.ndarray:
+        if self._daily is None:
+            self._daily = daily_counts(self.log.singles)
+        return self._daily[1]
+
+    @property
+    def doubles(self) -> DoublesStats:
+        if self._doubles is None:
+            self._doubles = DoublesStats.from_log(self.log.doubles)
+        return self._doubles
+
+    def with_log(self, log: GameLog) -> 'LeagueState':
+        """
+        Returns the state with the same counters over `log`, a log of the same games, e.g. put together from chunks.
+        The counters not aggregated yet are left to be aggregated from `log`.
+        """
+        first_day, daily = self._daily or (None, None)
+        return LeagueState(log, self._pair_counts, first_day, daily, self._doubles)
+
+    def extend(self, new_games: GameLog) -> 'LeagueState':
+        """
+        Folds the new games into the state, only aggregating the new games.
+        """
+        log = self.log.extend(new_games)
+        return self.merge(LeagueState.from_log(new_games.recode(log.players)), log)
+
+    def recode(self, players: np.ndarray) -> 'LeagueState':
+        """
+        Returns the same state with the player codes taken from `players`, which must contain every player of the log.
+        """
+        lookup = pd.Index(players).get_indexer(self.log.players)
+        first_day, daily = None, None
+        if self._daily is not None:
+            first_day = self.first_day
+            daily = np.zeros((len(DAILY_STATS), len(players), self.daily_counts.shape[2]), dtype=np.int64)
+            daily[:, lookup[:self.daily_counts.shape[1]]] = self.daily_counts
+        return LeagueState(self.log.recode(players), None if self._pair_counts is None else self._pair_counts.recode(lookup),
+                           first_day, daily, None if self._doubles is None else self._doubles.recode(lookup))
+
+    def merge(self, other: 'LeagueState', log: GameLog) -> 'LeagueState':
+        """
+        Adds up the counters of two states whose player codes agree, e.g. those of a log and of its appended games,
+        into the state of `log`, the games of both.
+
+        Only the counters this state already has are added up, aggregating those of `other`, which are cheap for
+        a few appended games; the rest are left to be aggregated from `log` when they are first used.
+        """
+        num_players = len(log.players)
+
+        first_day, daily = None, None
+        if self._daily is not None:
+            # widen the daily counters to the days covered by either state
+            states = [state for state in (self, other) if state.daily_counts.shape[2] > 0]
+            first_day = min((state.first_day for state in states), default=0)
+            num_days = max((state.first_day + state.daily_counts.shape[2] for state in states), default=0) - first_day
+            daily = np.zeros((len(DAILY_STATS), num_players, num_days), dtype=np.int64)
+            for state in states:
+                daily += pad_counts(state.daily_counts, num_players, state.first_day, first_day, num_days)
+        return LeagueState(log, None if self._pair_counts is None else self._pair_counts.merge(other.pair_counts),
+                           first_day, daily, None if self._doubles is None else self._doubles.merge(other.doubles))
+
+    def save(self, file_path: Path, offset: int, digest: str, mtime_ns: int = 0):
+        """
+        Writes the state to a checkpoint, along with the number of bytes of the CSV it covers, their hash and
+        the modification time of the CSV when they were read. Only the counters aggregated so far are written.
+        """
+        counters = {}
+        if self._pair_counts is not None:
+            counters.update(pairs=self._pair_counts.pairs, pair_counts=self._pair_counts.counts)
+        if self._daily is not None:
+            counters.update(first_day=self.first_day, daily_counts=self.daily_counts)
+        if self._doubles is not None:
+            counters.update(doubles_pairs=self._doubles.counts.pairs, doubles_counts=self._doubles.counts.counts,
+                            matchups=self._doubles.matchups, matchup_wins=self._doubles.matchup_wins,
+                            matchup_losses=self._doubles.matchup_losses)
+        tmp_file = file_path.with_name(file_path.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, version=CHECKPOINT_VERSION, offset=offset, digest=digest, mtime_ns=mtime_ns,
+                     players=self.log.players.astype(str), player_codes=self.log.player_codes, scores=self.log.scores,
+                     days=self.log.days, rows=self.log.rows, num_singles=self.log.num_singles, **counters)
+        os.replace(tmp_file, file_path)
+
+    @classmethod
+    def load(cls, file_path: Path) -> Tuple['LeagueState', int, str, int]:
+        """
+        Reads a checkpoint written by `save`, returning the state, the number of bytes covered, their hash and
+        the modification time of the CSV.
+        """
+        with np.load(file_path) as checkpoint:
+            if checkpoint['version'] != CHECKPOINT_VERSION:
+                raise ValueError(f'{file_path} has an unsupported checkpoint version')
+            log = GameLog(checkpoint['players'].astype(object), checkpoint['player_codes'], checkpoint['scores'],
+                          checkpoint['days'], checkpoint['rows'], int(checkpoint['num_singles']))
+            # the counters that were not written are aggregated from the log when they are first used
+            state = cls(log)
+            if 'pairs' in checkpoint.files:
+                state._pair_counts = PairCounts(checkpoint['pairs'], checkpoint['pair_counts'])
+            if 'daily_counts' in checkpoint.files:
+                state._daily = (int(checkpoint['first_day']), checkpoint['daily_counts'])
+            if 'matchups' in checkpoint.files:
+                state._doubles = DoublesStats(PairCounts(checkpoint['doubles_pairs'], checkpoint['doubles_counts']),
+                                              checkpoint['matchups'], checkpoint['matchup_wins'], checkpoint['matchup_losses'])
+            return state, int(checkpoint['offset']), str(checkpoint['digest']), int(checkpoint['mtime_ns'])
+
+
+def fold_games(chunks, state: LeagueState = None) -> LeagueState:
+    """
+    Folds chunks of games, as frames, into the aggregate state of the games before them, or of no games.
+
+    Only the counters are merged chunk by chunk, so the memory of a chunk is freed once it is folded, and the compact
+    logs of the chunks are concatenated once at the end rather than copied at every chunk. The players are then coded
+    as if the log had been read at once, so that the state does not depend on how the log was split.
+    """
+    logs = [] if state is None else [state.log]
+    players = np.empty(0, dtype=object) if state is None else state.log.players
+    for games_df in chunks:
+        log = GameLog.from_frame(games_df)
+        players = np.concatenate([players, log.players[~np.isin(log.players, players)]])
+        log = log.recode(players)
+        # until then, the state holds the log of the latest chunk, whose players are all the players so far
+        state = LeagueState.from_log(log) if state is None else state.merge(LeagueState.from_log(log), log)
+        logs.append(log)
+    if len(logs) > 1:
+        log = GameLog.concatenate(logs, players)
+        state = state.with_log(log)
+        first_appearances = log.first_appearances()
+        if not np.array_equal(first_appearances, players):
+            state = state.recode(first_appearances)
+    return state
+
+
+def hash_bytes(f, digest, num_bytes: int) -> bytes:
+    """
+    Adds the next `num_bytes` bytes of a file to the running hash `digest`, reading them in blocks,
+    and returns the last of them.
+    """
+    last = b''
+    while num_bytes > 0:
+        block = f.read(min(num_bytes, 1 << 20))
+        if not block:
+            break
+        digest.update(block)
+        num_bytes -= len(block)
+        last = block[-1:]
+    return last
+
+
+def load_league(data_file: Path, checkpoint_file: Path = None, chunk_size: int = CHUNK_SIZE) -> LeagueState:
+    """
+    Loads the aggregate state of the games in a CSV file, reading and aggregating `chunk_size` rows at a time;
+    see `fold_games`.
+
+    If a checkpoint is given, only the rows appended to the file since the checkpoint was written are parsed
+    and aggregated, and the checkpoint is updated. If the checkpoint is missing or unreadable, or any of the
+    earlier rows were edited, the state is rebuilt from scratch. If the file has the size and modification time
+    recorded in the checkpoint, it is not read at all.
+    """
+    if checkpoint_file is None:
+        with open(data_file, 'rb') as f:
+            header = f.readline()
+            return fold_games(read_chunks(f, header, hashlib.sha256(), chunk_size),
+                              LeagueState.from_log(GameLog.from_frame(read_games(io.BytesIO(header)))))
+
+    stat = os.stat(data_file)
+    state = None
+    if checkpoint_file.exists():
+        try:
+            state, offset, digest, mtime_ns = LeagueState.load(checkpoint_file)
+        except (OSError, KeyError, ValueError):
+            state = None
+    # a file modified within the timestamp resolution of the checkpoint being written could have changed unseen
+    if (state is not None and stat.st_size == offset and stat.st_mtime_ns == mtime_ns
+            and mtime_ns < os.stat(checkpoint_file).st_mtime_ns):
+        state.digest = digest
+        return state
+
+    with open(data_file, 'rb') as f:
+        header = f.readline()
+        running = hashlib.sha256(header)
+        # the checkpointed bytes must be unchanged and end with a complete row
+        if state is not None:
+            last = hash_bytes(f, running, offset - len(header)) if offset > len(header) else header[-1:]
+            following = f.read(1)
+            f.seek(-len(following), os.SEEK_CUR)
+            if (offset < len(header) or f.tell() != offset or running.hexdigest() != digest
+                    or last not in (b'\n', b'\r') and following not in (b'\n', b'\r', b'')):
+                state = None
+        if state is None:
+            f.seek(len(header))
+            running = hashlib.sha256(header)
+            state = LeagueState.from_log(GameLog.from_frame(read_games(io.BytesIO(header))))
+        state = fold_games(read_chunks(f, header, running, chunk_size), state)
+        size = f.tell()
+    state.digest = running.hexdigest()
+    state.save(checkpoint_file, size, state.digest, stat.st_mtime_ns)
+    return state
+
+
+class BuildReport:
+    """
+    Records every stage of a build: its wall and CPU time, the peak memory it allocates, and the Bokeh models it creates
+    along with the bytes they serialize to.
+
+    Stages nest, e.g. a dashboard contains the stages of its charts, and the models and bytes of a stage only count
+    what its inner stages did not, like the layout of the dashboard. While a report is being recorded, memory allocations
+    are traced and the models of every stage are serialized, which slows the build down, so the times are only
+    comparable between recorded builds. If `profile` is set, every outermost stage is also run under cProfile.
+    """
+    def __init__(self, profile: bool = False):
+        self.profile = profile
+        self.stages = []
+        self.profiles = {}
+        self._open = []
+        self._seen = set()
+
+    def __enter__(self) -> 'BuildReport':
+        global _report
+        _report = self
+        tracemalloc.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _report
+        self.total_seconds = time.perf_counter() - self._start
+        tracemalloc.stop()
+        _report = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Records the block as a stage. The Bokeh model or snapshots set as the 'output' of the yielded dict are counted
+        and serialized, or the 'bytes' it produced can be set directly.
+        """
+        record = {'name': name, 'parent': self._open[-1]['record']['name'] if self._open else None}
+        self.stages.append(record)
+        output = {}
+        # tracemalloc only keeps one peak, so each stage hands its peak on to the stage around it
+        if self._open:
+            self._open[-1]['peak'] = max(self._open[-1]['peak'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        memory = tracemalloc.get_traced_memory()[0]
+        opened = {'record': record, 'peak': memory, 'overhead': 0.0, 'cpu_overhead': 0.0}
+        self._open.append(opened)
+        profiler = cProfile.Profile() if self.profile and len(self._open) == 1 else None
+        start, cpu_start = time.perf_counter(), time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield output
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profiles[name] = profiler
+            wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+            peak = max(opened['peak'], tracemalloc.get_traced_memory()[1])
+            self._open.pop()
+            if self._open:
+                self._open[-1]['peak'] = max(self._open[-1]['peak'], peak)
+
+            # measuring the output is not part of the stage, nor of the stages around it
+            measure_start, measure_cpu_start = time.perf_counter(), time.process_time()
+            models, size = self.measure(output.get('output'))
+            tracemalloc.reset_peak()
+            for outer in self._open:
+                outer['overhead'] += time.perf_counter() - measure_start
+                outer['cpu_overhead'] += time.process_time() - measure_cpu_start
+            record.update(wall_seconds=round(wall - opened['overhead'], 6), cpu_seconds=round(cpu - opened['cpu_overhead'], 6),
+                          peak_bytes=peak - memory, models=models, serialized_bytes=output.get('bytes', size))
+
+    def measure(self, output) -> Tuple[int, int]:
+        """
+        Returns the number of models in the output that no earlier stage counted, and the bytes they serialize to.
+        """
+        if isinstance(output, Model):
+            models = output.references() - self._seen
+            content = Serializer(references=self._seen, deferred=False).serialize(output).content
+            self._seen |= models
+            return len(models), len(json.dumps(content))
+        if isinstance(output, dict):
+            snapshots = [snapshot for snapshot in output.values() if isinstance(snapshot, ModelSnapshot)]
+            return (sum(count_objects(snapshot.content) for snapshot in snapshots),
+                    sum(len(json.dumps(snapshot.content)) for snapshot in snapshots))
+        return 0, 0
+
+    def hottest_stage(self) -> str:
+        """
+        Returns the name of the outermost stage that took the longest.
+        """
+        return max((record for record in self.stages if record['parent'] is None), key=lambda record: record['wall_seconds'])['name']
+
+    def write(self, file_path: Path):
+        """
+        Writes the report as JSON and, if the stages were profiled, the cProfile stats of the hottest stage
+        next to it as `<report>.prof`.
+        """
+        report = {'total_seconds': round(self.total_seconds, 6), 'stages': self.stages, 'profile': None}
+        if self.profiles:
+            hottest = self.hottest_stage()
+            profile_file = file_path.with_suffix('.prof')
+            self.profiles[hottest].dump_stats(profile_file)
+            report['profile'] = {'stage': hottest, 'file': str(profile_file)}
+        with open(file_path, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+    def summary(self) -> str:
+        """
+        Returns a table of the stages for the console, with inner stages indented under the stages around them.
+        """
+        depths = {}
+        lines = [f'{"stage":<48}{"wall s":>9}{"cpu s":>9}{"peak MB":>9}{"models":>8}{"KB":>9}']
+        for record in self.stages:
+            depths[record['name']] = depth = depths.get(record['parent'], -1) + 1
+            lines.append(f'{"  " * depth + record["name"]:<48}{record["wall_seconds"]:>9.3f}{record["cpu_seconds"]:>9.3f}'
+                         f'{record["peak_bytes"] / 2**20:>9.1f}{record["models"]:>8}{record["serialized_bytes"] / 2**10:>9.1f}')
+        lines.append(f'{"total":<48}{self.total_seconds:>9.3f}')
+        if self.profiles:
+            lines.append(f'slowest stage: {self.hottest_stage()}')
+        return '\n'.join(lines)
+
+
+# the report of the build being recorded, if any
+_report = None
+
+
+def build_stage(name: str):
+    """
+    Returns a context manager recording a stage of the build in the report being recorded, if any; see `BuildReport.stage`.
+    """
+    return _report.stage(name) if _report is not None else nullcontext({})
+
+
+def report_stage(builder):
+    """
+    Records every call of a chart, table or dashboard builder as a stage of the build, if a report is being recorded.
+    """
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        with build_stage(builder.__name__) as stage:
+            stage['output'] = builder(*args, **kwargs)
+        return stage['output']
+    return wrapper
+
+
+# the live views of the dashboard being built for a live page, if any; see `live_layout`
+_live_views = None
+
+
+def live_view(model, name: str, recipe, *args):
+    """
+    Records, while a live page is built, that a property of a model is computed from the stats as `recipe(*args)`,
+    or is the first argument if `recipe` is None, so that the live dashboard recomputes it when games are added;
+    see `live_changes`. The arguments are stats of the league or hashable values. `model` can also be a list of models,
+    for which the recipe returns a list of values. A data frame is the data of a data source. Returns the model.
+    """
+    if _live_views is not None:
+        _live_views.append((model, name, recipe, args))
+    return model
+
+
+def count_objects(content) -> int:
+    """
+    Counts the models in serialized content.
+    """
+    if isinstance(content, dict):
+        return (content.get('type') == 'object') + sum(count_objects(value) for value in content.values())
+    if isinstance(content, list):
+        return sum(count_objects(value) for value in content)
+    return 0
+
+
+def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Divides elementwise, returning 0 wherever the denominator is 0.
+    """
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator != 0)
+
+
+def change_points(dates: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the points of a series where its value changes, along with its last point, which is all a step line needs.
+    Given several series over the same dates, as rows of `values`, returns the points where any of them changes.
+    """
+    rows = np.atleast_2d(values)
+    keep = np.ones(rows.shape[1], dtype=bool)
+    keep[1:-1] = (~((rows[:, 1:-1] == rows[:, :-2]) | (np.isnan(rows[:, 1:-1]) & np.isnan(rows[:, :-2])))).any(axis=0)
+    return dates[keep], values[..., keep]
+
+
+def lttb(dates: np.ndarray, values: np.ndarray, num_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsamples a series to `num_points` points with the largest triangle three buckets algorithm.
+
+    The first and last points are kept, and the points in between are split into buckets of consecutive points,
+    keeping from each the point that forms the largest triangle with the point kept before it and the average
+    of the next bucket, so that peaks and dips survive. Given several series over the same dates, as rows of `values`,
+    the points are chosen by the first.
+    """
+    num_values = len(dates)
+    if num_points >= num_values or num_points < 3:
+        return dates, values
+    x = dates.astype('datetime64[ns]').astype(np.float64)
+    y = np.atleast_2d(values)[0].astype(np.float64)
+    bounds = np.arange(num_points - 1) * (num_values - 2) // (num_points - 2) + 1
+    kept = [0]
+    for bucket in range(num_points - 2):
+        start, stop = bounds[bucket], bounds[bucket + 1]
+        next_stop = bounds[bucket + 2] if bucket + 2 < len(bounds) else num_values
+        next_x, next_y = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        last = kept[-1]
+        area = np.abs((x[last] - next_x) * (y[start:stop] - y[last]) - (x[last] - x[start:stop]) * (next_y - y[last]))
+        kept.append(start + int(area.argmax()))
+    kept.append(num_values - 1)
+    return dates[kept], values[..., kept]
+
+
+# the dates in the data sources are days since the epoch, which format as YYYY-MM-DD in the browser with DAY_FORMAT_JS
+DAY_MS = 86400000
+DAY_FORMAT_JS = f'new Date(value * {DAY_MS}).toISOString().slice(0, 10)'
+
+# shows the series chosen by the buttons of a line graph, as a copy that patches to the shown column can not reach
+SERIES_JS = """
+const column = `${field}_${buttons.active}`
+for (const source of sources) {
+  source.data[field] = source.data[column].slice()
+  source.change.emit()
+}
+"""
+
+
+def line_data(daily: DailyStats, series, mask: np.ndarray, field: str, max_points: int = None) -> list:
+    """
+    Returns the data of the line of every player of a line graph of a players x dates matrix, or of a dict of such
+    matrices by label. If `mask` is given, only the dates where it is true are plotted for each player.
+
+    The series stay flat on most days, so only the points where they change are kept, and each value is drawn
+    until the next. If `max_points` is given, longer series are downsampled to that many points with `lttb`.
+    """
+    options = series
+    if isinstance(options, dict):
+        series = np.stack(list(options.values()), axis=1)
+    else:
+        series = series[:, None, :]
+    dates = daily.dates.to_numpy()
+    lines_data = []
+    for idx in range(len(daily.players)):
+        keep = ~np.isnan(series[idx]).all(axis=0) if mask is None else mask[idx] & ~np.isnan(series[idx]).all(axis=0)
+        player_dates, values = change_points(dates[keep], series[idx][:, keep])
+        if max_points is not None:
+            player_dates, values = lttb(player_dates, values, max_points)
+        data = {'day': player_dates.astype('datetime64[D]').astype(np.int32), field: values[0]}
+        if isinstance(options, dict):
+            data.update({f'{field}_{option}': values[option] for option in range(len(options))})
+        lines_data.append(data)
+    return lines_data
+
+
+def player_lines(daily: DailyStats, rolling: RollingStats, lines, field: str, max_points: int = None) -> list:
+    """
+    Returns the data of the line of every player of a line graph of `player_line_graph`.
+    """
+    return line_data(daily, *lines(daily, rolling), field, max_points)
+
+
+def player_line_graph(daily: DailyStats, rolling: RollingStats, lines, field: str, title: str, y_axis_label: str,
+                      tooltip: Tuple[str], max_points: int = None):
+    """
+    Plots each row of the players x dates matrix returned by `lines(daily, rolling)`, along with a mask of the dates
+    to plot for each player or None, as a step line in a line graph; see `line_data`.
+
+    `lines` can also return a dict of such matrices by label, like the rolling windows of a stat, in which case buttons
+    above the graph switch the lines between them in the browser, starting with the first.
+    """
+    num_players = len(daily.players)
+    # the smallest palette has 3 colors, and viridis has 256, which larger leagues share, spread evenly over it
+    colors = Category20[max(num_players, 3)] if num_players <= 20 else [Viridis256[i*255 // (num_players - 1)] for i in range(num_players)]
+    line_graph = figure(x_axis_label='Date', y_axis_label=y_axis_label, title=title,
+                        x_axis_type='datetime', margin=(50, 50, 50, 50),
+                        width=1600, height=400, toolbar_location=None)
+
+    # Add minor grid lines
+    line_graph.xaxis.minor_tick_line_color = 'black'
+    line_graph.yaxis.minor_tick_line_color = 'black'
+    line_graph.xgrid.minor_grid_line_color = 'gray'
+    line_graph.xgrid.minor_grid_line_alpha = 0.1
+    line_graph.ygrid.minor_grid_line_color = 'gray'
+    line_graph.ygrid.minor_grid_line_alpha = 0.1
+
+    # the dates are sent as days since the epoch, and turned into the timestamps of the axis and the tooltips in the browser
+    x = transform('day', CustomJSTransform(func=f'return x * {DAY_MS}', v_func=f'return Float64Array.from(xs, (x) => x * {DAY_MS})'))
+    date_format = CustomJSHover(code=f'return {DAY_FORMAT_JS}')
+
+    # add the lines with styling and tooltips
+    options, mask = lines(daily, rolling)
+    sources = []
+    for idx, (player, data) in enumerate(zip(daily.players, line_data(daily, options, mask, field, max_points))):
+        player_source = ColumnDataSource(data)
+        sources.append(player_source)
+        color = colors[idx % len(colors)]
+        line = line_graph.step(x, field, source=player_source, mode='after', legend_label=player,
+                               name=player, line_width=3, color=color)
+        # step lines can not be hovered, so their points are, as markers that are not drawn but hide along with the line,
+        # and share its view of the source, which holds the same rows
+        points = GlyphRenderer(data_source=player_source, view=line.view, glyph=Scatter(x=x, y=field, size=10, fill_alpha=0, line_alpha=0),
+                               nonselection_glyph=None, muted_glyph=None)
+        line_graph.renderers.append(points)
+        line_graph.legend[0].items[-1].renderers.append(points)
+        hover = HoverTool(renderers=[points], tooltips=[('Player', player), ('Date', '@day{custom}'), tooltip], formatters={'@day': date_format})
+        line_graph.add_tools(hover)
+    line_graph.add_layout(line_graph.legend[0], 'right')
+    line_graph.legend.click_policy = 'hide'
+    live_view(sources, 'data', player_lines, daily, rolling, lines, field, max_points)
+
+    if not isinstance(options, dict):
+        return line_graph
+    buttons = RadioButtonGroup(labels=list(options), active=0, margin=(25, 50, 0, 50))
+    callback = CustomJS(args={'buttons': buttons, 'sources': sources, 'field': field}, code=SERIES_JS)
+    buttons.js_on_change('active', callback)
+    # in live mode, show the chosen series again after an update brings new data
+    for player_source in sources:
+        for event in ('data', 'patching', 'streaming'):
+            player_source.js_on_change(event, callback)
+    return Column(buttons, line_graph)
+
+
+def pair_table(players_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns one row per unordered pair of players, with an integer pair id.
+
+    Each pair keeps the row of players_df where player1 does not come after player2 in the roster, i.e. the stats
+    of player1 against player2. The pair ids follow the order of the pairs' sorted names, and the rows are sorted by them.
+    Pairs of a player with themselves are kept, since a tied game counts as a game of its second player against themselves.
+    """
+    players = pd.Index(players_df['player1'].unique())
+    first = players.get_indexer(players_df['player1'])
+    second = players.get_indexer(players_df['player2'])
+    pairs_df = players_df[first <= second].reset_index(drop=True)
+
+    names = np.sort(pairs_df[['player1', 'player2']].to_numpy(dtype=str), axis=1)
+    order = np.lexsort((names[:, 1], names[:, 0]))
+    pairs_df = pairs_df.iloc[order].reset_index(drop=True)
+    pairs_df.insert(0, 'pair_id', np.arange(len(pairs_df)))
+    return pairs_df
+
+
+def orient_pairs(pairs_df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """
+    Returns the pairs seen from the side of the player with the nonnegative value of a column, e.g. the winner for 'win_differential'.
+    """
+    swap = (pairs_df[column] < 0).to_numpy()
+    oriented = pairs_df.copy()
+    for first, second in [('player1', 'player2'), ('wins', 'losses'), ('points_for', 'points_against')]:
+        oriented.loc[swap, [first, second]] = pairs_df.loc[swap, [second, first]].to_numpy()
+    for signed in ['point_diff', 'win_differential', 'avg_point_diff']:
+        oriented.loc[swap, signed] = -pairs_df.loc[swap, signed]
+    return oriented
+
+
+class PairIndex:
+    """
+    An index from each pair id of a pair table to the singles games the pair played and the dates they played on.
+
+    The games are grouped by pair: the positions in the singles log of the games of pair k are
+    `games[offsets[k]:offsets[k + 1]]`, in the order they were played.
+    """
+    def __init__(self, pair_ids: np.ndarray, offsets: np.ndarray, games: np.ndarray, days_played: np.ndarray):
+        self.pair_ids = pair_ids
+        self.offsets = offsets
+        self.games = games
+        self.days_played = days_played
+
+    @classmethod
+    def from_log(cls, singles: GameLog, pairs_df: pd.DataFrame) -> 'PairIndex':
+        # key each unordered pair of player codes as lo*n + hi, and look up the pair id of every game by its key
+        num_players = len(singles.players)
+        players = pd.Index(singles.players)
+        pair_codes = np.sort(np.column_stack([players.get_indexer(pairs_df['player1']),
+                                              players.get_indexer(pairs_df['player2'])]), axis=1).astype(np.int64)
+        pair_keys = pair_codes[:, 0] * num_players + pair_codes[:, 1]
+        key_order = np.argsort(pair_keys)
+        game_codes = np.sort(singles.player_codes[:, :2], axis=1).astype(np.int64)
+        game_keys = game_codes[:, 0] * num_players + game_codes[:, 1]
+        pair_ids = pairs_df['pair_id'].to_numpy()[key_order][np.searchsorted(pair_keys[key_order], game_keys)]
+
+        num_pairs = len(pairs_df)
+        games = np.argsort(pair_ids, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(pair_ids, minlength=num_pairs))])
+        # a pair played on a date once for every distinct (pair id, day) combination
+        pair_days = np.unique(pair_ids.astype(np.int64) << 32 | singles.days.astype(np.int64))
+        days_played = np.bincount(pair_days >> 32, minlength=num_pairs)
+        return cls(pair_ids, offsets, games, days_played)
+
+    def games_of(self, pair_id: int) -> np.ndarray:
+        """
+        Returns the positions in the singles log of the games played by a pair.
+        """
+        return self.games[self.offsets[pair_id]:self.offsets[pair_id + 1]]
+
+    @property
+    def games_played(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+# recomputes the singles stats of the dashboard for the dates picked on the slider; see `date_range_slider`
+WINDOW_JS = """
+const DAY = 86400000
+const [start, end] = cb_obj.value.map((ms) => Math.floor(ms / DAY) - first_day)
+const {day, row, wins, losses, points_for, points_against} = payload.data
+
+// the models to update are tagged by `window_view`, so that dashboards built elsewhere are found too;
+// BokehJS reads a tag, like any dict with string keys, as a plain object
+const views = []
+for (const model of cb_obj.document.all_models) {
+  const spec = model.tags.find((tag) => tag != null && typeof tag == 'object' && 'window' in tag)
+  if (spec != null)
+    views.push([model, spec])
+}
+const pairs = views.find(([, spec]) => spec.window == 'pairs')[0]
+const player1 = pairs.data.player1, player2 = pairs.data.player2
+const num_rows = player1.length
+
+// the players in order of first appearance as player 1, like the roster of the pair table
+const players = []
+const position = new Map()
+for (const player of player1) {
+  if (!position.has(player)) {
+    position.set(player, players.length)
+    players.push({player, wins: 0, losses: 0, total_games: 0, point_diff: 0, win_differential: NaN, days: 0})
+  }
+}
+
+// sum the days of the window for every pair; the days are in order, so a new day of a pair or player is a change of day
+const w = new Float64Array(num_rows), l = new Float64Array(num_rows)
+const pf = new Float64Array(num_rows), pa = new Float64Array(num_rows)
+const pair_days = new Float64Array(num_rows), last_pair_day = new Int32Array(num_rows).fill(-1)
+const last_player_day = new Int32Array(players.length).fill(-1)
+for (let i = 0; i < day.length; i++) {
+  if (day[i] < start || day[i] > end)
+    continue
+  const r = row[i]
+  w[r] += wins[i]
+  l[r] += losses[i]
+  pf[r] += points_for[i]
+  pa[r] += points_against[i]
+  if (last_pair_day[r] != day[i]) {
+    last_pair_day[r] = day[i]
+    pair_days[r] += 1
+  }
+  const p = position.get(player1[r])
+  if (last_player_day[p] != day[i]) {
+    last_player_day[p] = day[i]
+    players[p].days += 1
+  }
+}
+
+const round = (value, digits) => {
+  // halves go to the even neighbour, like the rounding of the stats in pandas
+  const scaled = value * 10**digits
+  return (Math.abs(scaled % 1) == 0.5 ? 2 * Math.round(scaled / 2) : Math.round(scaled)) / 10**digits
+}
+const percentage = (wins, losses) => 100 * round(wins / (wins + losses), 2)
+const by = (keys) => (a, b) => {
+  for (const key of keys) {
+    const x = Number.isNaN(a[key]) ? -Infinity : a[key], y = Number.isNaN(b[key]) ? -Infinity : b[key]
+    if (x != y)
+      return y - x
+  }
+  return 0
+}
+
+// the head-to-head records of every pair, as in `pair_records`
+const records = []
+for (let r = 0; r < num_rows; r++) {
+  const total_games = w[r] + l[r]
+  records.push({player1: player1[r], player2: player2[r], wins: w[r], losses: l[r], points_for: pf[r], points_against: pa[r],
+                total_games, days: pair_days[r],
+                point_diff: total_games > 0 ? pf[r] - pa[r] : NaN,
+                win_differential: total_games > 0 ? w[r] - l[r] : NaN,
+                avg_point_diff: total_games > 0 ? round((pf[r] - pa[r]) / total_games, 1) : NaN})
+}
+
+// the totals of every player who played in the window
+for (const record of records) {
+  if (record.total_games == 0)
+    continue
+  const player = players[position.get(record.player1)]
+  player.wins += record.wins
+  player.losses += record.losses
+  player.total_games += record.total_games
+  player.point_diff += record.point_diff
+  player.win_differential = Number.isNaN(player.win_differential) ? record.win_differential
+                                                                   : Math.max(player.win_differential, record.win_differential)
+}
+const played = players.filter((player) => player.total_games > 0)
+for (const player of played) {
+  player.win_percentage = percentage(player.wins, player.losses)
+  player.avg_point_diff = round(player.point_diff / player.total_games, 1)
+  player.avg_games = round(player.total_games / player.days, 2)
+}
+
+// each unordered pair once, from the side of the player who comes first, like `pair_table`
+const unordered = records.filter((record) => record.total_games > 0 && position.get(record.player1) <= position.get(record.player2))
+
+function table(model, spec, rows) {
+  const sort = spec.sort
+  if (sort != null)
+    rows = rows.slice().sort(by(sort))
+  const colors = spec.colors
+  const data = {}
+  for (const key of Object.keys(model.data)) {
+    if (key == 'rank')
+      data[key] = rows.map((_, i) => i + 1)
+    else if (key == 'index')
+      data[key] = rows.map((_, i) => i)
+    else if (key == 'color' && colors != null)
+      data[key] = rows.map((row) => row[spec.color_field] >= 0 ? colors[0] : colors[1])
+    else
+      data[key] = rows.map((row) => row[key])
+  }
+  model.data = data
+  const x_range = spec.x_range
+  if (x_range != null)
+    x_range.factors = rows.map((row) => row.player)
+}
+
+for (const [model, spec] of views) {
+  const kind = spec.window
+  if (kind == 'pairs')
+    table(model, spec, records)
+  else if (kind == 'players')
+    table(model, spec, played)
+  else if (kind == 'unordered_pairs') {
+    const orient = spec.orient
+    const rows = unordered.map((record) => {
+      let pair = {...record}
+      if (orient != null && pair[orient] < 0)
+        pair = {...pair, player1: pair.player2, player2: pair.player1, wins: pair.losses, losses: pair.wins,
+                points_for: pair.points_against, points_against: pair.points_for, point_diff: -pair.point_diff,
+                win_differential: -pair.win_differential, avg_point_diff: -pair.avg_point_diff}
+      pair.win_percentage = percentage(pair.wins, pair.losses)
+      pair.avg_games_per_day = round(pair.total_games / pair.days, 2)
+      return pair
+    })
+    table(model, spec, rows)
+  }
+}
+
+// rescale the color maps of the matrices to the values of the window
+for (const [model, spec] of views) {
+  if (spec.window != 'range')
+    continue
+  // a loop rather than spreading the values into Math.min, which runs out of stack on large leagues
+  let low = Infinity, high = -Infinity
+  for (const value of pairs.data[spec.field]) {
+    if (Number.isFinite(value)) {
+      low = Math.min(low, value)
+      high = Math.max(high, value)
+    }
+  }
+  if (low > high)
+    continue
+  model.low = spec.low ?? low
+  model.high = high
+}
+"""
+
+
+def window_view(model: Model, kind: str, **options) -> Model:
+    """
+    Tags a model for the date range slider to update: a data source of 'pairs' with the rows of the pair records,
+    of 'players' or of 'unordered_pairs' with one row per player or pair who played in the window, or the 'range'
+    of a color mapper over a field of the pair records. The options go along with the tag; see `WINDOW_JS`.
+    """
+    model.tags = [{'window': kind, **options}]
+    return model
+
+
+# narrows the dashboard again after a live update brought the data of every date, unless every date is picked;
+# the callbacks of an update run once all of it is applied, so the slider already has its new end
+REWINDOW_JS = """
+if (slider.value[0] != slider.start || slider.value[1] != slider.end)
+  slider.properties.value_throttled.change.emit()
+"""
+
+
+def window_dates(singles: GameLog) -> Tuple[np.datetime64, np.datetime64]:
+    """
+    Returns the first and last dates of the date range slider of the singles games.
+    """
+    first_date = np.datetime64(int(singles.days.min()) if len(singles) else 0, 'D')
+    last_date = np.datetime64(int(singles.days.max()) if len(singles) else 0, 'D')
+    # a slider can't start and end on the same date, so games of a single day get the day after too, which has no games
+    return first_date, max(last_date, first_date + np.timedelta64(1, 'D'))
+
+
+def window_end(singles: GameLog) -> np.datetime64:
+    return window_dates(singles)[1]
+
+
+def window_payload(singles: GameLog, players_df: pd.DataFrame) -> dict:
+    """
+    Returns the head-to-head counters of every pair of singles players on every day they met, as the rows of the pair
+    records in `players_df` and the days since the first date of the slider, for `WINDOW_JS`.
+    """
+    days, counts = daily_pair_counts(singles)
+    names = singles.players[counts.pairs]
+    rows = pd.MultiIndex.from_frame(players_df[['player1', 'player2']]).get_indexer(pd.MultiIndex.from_arrays([names[:, 0], names[:, 1]]))
+    first_day = int(days.min()) if len(days) else 0
+    stats = dict(zip(PAIR_STATS, counts.counts.T))
+    return {'day': (days - first_day).astype(np.uint16), 'row': rows.astype(np.int32),
+            'wins': stats['wins'].astype(np.uint16), 'losses': stats['losses'].astype(np.uint16),
+            'points_for': stats['points_for'].astype(np.int32), 'points_against': stats['points_against'].astype(np.int32)}
+
+
+def date_range_slider(singles: GameLog, players_df: pd.DataFrame) -> DateRangeSlider:
+    """
+    Returns a slider of the dates of the singles stats, which recomputes the stats of the pair records in `players_df`
+    in the browser, along with every view tagged by `window_view`, whenever the dates are changed.
+
+    The page carries the head-to-head counters of every pair on every day they met, as typed arrays, so that one page
+    serves every window of dates without a server.
+    """
+    payload = live_view(ColumnDataSource(window_payload(singles, players_df)), 'data', window_payload, singles, players_df)
+    first_date, end_date = window_dates(singles)
+    slider = DateRangeSlider(title='Singles games played', start=first_date, end=end_date, value=(first_date, end_date),
+                             step=1, format='%Y-%m-%d', width=700, margin=(25, 50, 0, 50))
+    live_view(slider, 'end', window_end, singles)
+    first_day = int(first_date.astype(np.int64))
+    slider.js_on_change('value_throttled', CustomJS(args={'payload': payload, 'first_day': first_day}, code=WINDOW_JS))
+    rewindow = CustomJS(args={'slider': slider}, code=REWINDOW_JS)
+    for event in ('data', 'patching', 'streaming'):
+        payload.js_on_change(event, rewindow)
+    return slider
+
+
+def chart_players(chart_data, *args) -> list:
+    """
+    Returns the players of a bar chart in the order of its bars, from the data returned by `chart_data(*args)`.
+    """
+    return chart_data(*args)['player'].tolist()
+
+
+def avg_games_chart_data(daily: DailyStats) -> pd.DataFrame:
+    # the average games played per day of each player, over the days they played on
+    return player_totals(daily)[['player', 'avg_games']].sort_values('avg_games', ascending=False)
+
+
+@report_stage
+def avg_games_chart(daily: DailyStats):
+    """
+    Plots the average games played per day for each player in a bar chart.
+
+    Note: Only days where at least one game was played are considered.
+    """
+    avg_games_per_day = avg_games_chart_data(daily)
+
+    # Create a bar chart
+    source = live_view(ColumnDataSource(avg_games_per_day), 'data', avg_games_chart_data, daily)
+    p = figure(x_range=avg_games_per_day['player'], title='Average Games Played per Day for Each Player',
+               x_axis_label='Player', y_axis_label='Average Games Played', 
+               height=700, width=700, margin=(50, 50, 50, 50),
+               toolbar_location=None)
+
+    p.vbar(x='player', top='avg_games', width=0.9, source=source,
+           line_color='white', fill_color='navy')
+
+    # Customize the plot
+    window_view(source, 'players', sort=['avg_games'], x_range=p.x_range)
+    live_view(p.x_range, 'factors', chart_players, avg_games_chart_data, daily)
+    p.xgrid.grid_line_color = None
+    p.y_range.start = 0
+    p.xaxis.major_label_orientation = 1.0
+
+    return p
+
+
+def total_games_chart_data(daily: DailyStats) -> pd.DataFrame:
+    # the total games played by each player
+    return player_totals(daily)[['player', 'total_games']].sort_values('total_games', ascending=False)
+
+
+@report_stage
+def total_games_chart(daily: DailyStats):
+    leaderboard = total_games_chart_data(daily)
+
+    # Create a bar chart
+    source = live_view(ColumnDataSource(leaderboard), 'data', total_games_chart_data, daily)
+    p = figure(x_range=leaderboard['player'], title='Total Games Played for Each Player',
+               x_axis_label='Player', y_axis_label='Total Games Played', 
+               height=700, width=700,  margin=(50, 50, 50, 50),
+               toolbar_location=None)
+
+    p.vbar(x='player', top='total_games', width=0.9, source=source,
+           line_color='white', fill_color='navy')
+
+    # Customize the plot
+    window_view(source, 'players', sort=['total_games'], x_range=p.x_range)
+    live_view(p.x_range, 'factors', chart_players, total_games_chart_data, daily)
+    p.xgrid.grid_line_color = None
+    p.y_range.start = 0
+    p.xaxis.major_label_orientation = 1.0
+
+    return p
+
+
+def column_bound(frame: pd.DataFrame, column: str, bound: str):
+    """
+    Returns the 'min' or the 'max' of a column, skipping missing values, as the bounds of the color map of a matrix.
+    """
+    return getattr(frame[column], bound)()
+
+
+@report_stage
+def total_games_matrix(players_df, source):
+    """
+    Plots the total games played between each pair of players in a matrix plot.
+    More precisely, the entry in the ith row and jth column is the total number of games played between the ith and jth players.
+    """
+    color_mapper = LinearColorMapper(palette=Inferno256, low=0, high=players_df['total_games'].max())
+    window_view(color_mapper, 'range', field='total_games', low=0)
+    live_view(color_mapper, 'high', column_bound, players_df, 'total_games', 'max')
+    players = players_df['player1'].unique()
+    matrix_plot = figure(title='Total Games Played', x_range=players, y_range=players, 
+                         x_axis_location='above', width=700, height=700, margin=(50, 50, 50, 50),
+                         tools='hover,save', tooltips='@player1 vs @player2: @total_games', toolbar_location=None)
+    matrix_plot.rect(x='player2', y='player1', width=1, height=1, source=source,
+                     line_color=None, fill_color=transform('total_games', color_mapper))
+    # only the pairs who met are drawn, so the other cells show the background in the color of zero games
+    matrix_plot.background_fill_color = Inferno256[0]
+    matrix_plot.grid.grid_line_color = None
+    matrix_plot.xaxis.major_label_orientation = 1.0
+    # matrix_plot.yaxis.major_label_orientation = 1.0
+    color_bar = ColorBar(color_mapper=color_mapper, location=(0, 0))
+    matrix_plot.add_layout(color_bar, 'right')
+
+    return matrix_plot
+
+
+def rank_total_games(totals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ranks the singles players by average games per day played, then by total games; see `player_totals`.
+    """
+    leaderboard = totals[['player', 'total_games', 'avg_games']]
+
+    # Sort the leaderboard by total games played and assign ranks
+    leaderboard = leaderboard.sort_values(['avg_games', 'total_games'], ascending=False)
+    leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    return leaderboard
+
+
+def rank_daily_games(daily: DailyStats) -> pd.DataFrame:
+    return rank_total_games(player_totals(daily))
+
+
+@report_stage
+def total_games_solo_leaderboard(daily: DailyStats):
+    """
+    Creates a leaderboard of players based on the total number of games played.
+    """
+    leaderboard = rank_daily_games(daily)
+
+    # Create the ColumnDataSource and DataTable
+    source = window_view(ColumnDataSource(leaderboard), 'players', sort=['avg_games', 'total_games'])
+    live_view(source, 'data', rank_daily_games, daily)
+    columns = [TableColumn(field='rank', title='Rank'),
+               TableColumn(field='player', title='Player'),
+               TableColumn(field='avg_games', title='Average Games per Day', formatter=NumberFormatter(format='0.[00]')),
+               TableColumn(field='total_games', title='Total Games Played')]
+    
+    data_table = DataTable(source=source, columns=columns, 
+                           index_position=None, margin=(50, 50, 0, 50),
+                           width=700, height=300)
+    caveat = Div(text='<p><strong>Note:</strong> The average games per day only considers days when the player actually played, i.e., missed days do not penalize.</p>',
+                 margin=(25, 50, 50, 50))
+    return Column(data_table, caveat)
+    
+
+def rank_pair_games(pairs_df: pd.DataFrame, pair_index: 'PairIndex') -> pd.DataFrame:
+    """
+    Ranks the pairs of players who met by average games per day both played, then by total games.
+    """
+    leaderboard = pairs_df.loc[pairs_df['total_games'] > 0, ['pair_id', 'player1', 'player2', 'total_games']].reset_index(drop=True)
+
+    # Compute the average games per day for each pair of players
+    days_played = pair_index.days_played[leaderboard.pop('pair_id')]
+    avg_games_per_day = ratio(leaderboard['total_games'].to_numpy(), days_played).round(2)
+    leaderboard['avg_games_per_day'] = avg_games_per_day
+    leaderboard = leaderboard.sort_values(['avg_games_per_day', 'total_games'], ascending=False)
+    leaderboard['rank'] = range(1, len(leaderboard)+1)
+    return leaderboard
+
+
+@report_stage
+def total_games_pairs_leaderboard(pairs_df, pair_index):
+    """
+    Creates a leaderboard of players based on the total number of games played.
+    Ensures that "Player 1 vs Player 2" is considered the same as "Player 2 vs Player 1".
+    """
+    leaderboard = rank_pair_games(pairs_df, pair_index)
+    source = window_view(ColumnDataSource(leaderboard), 'unordered_pairs', sort=['avg_games_per_day', 'total_games'])
+    live_view(source, 'data', rank_pair_games, pairs_df, pair_index)
+    columns = [TableColumn(field='rank', title='Rank'),
+               TableColumn(field='player1', title='Player 1'),
+               TableColumn(field='player2', title='Player 2'),
+               TableColumn(field='avg_games_per_day', title='Average Games per Day', formatter=NumberFormatter(format='0.[00]')),
+               TableColumn(field='total_games', title='Total Games Played')]
+    data_table = DataTable(source=source, columns=columns, 
+                           index_position=None,  margin=(50, 50, 0, 50),
+                           width=700, height=300)
+    caveat = Div(text='<p><strong>Note:</strong> The average games per day for a pair only considers days when <em>both</em> players played.</p>',
+                 margin=(25, 50, 50, 50))
+    return Column(data_table, caveat)
+
+
+def avg_games_lines(daily: DailyStats, rolling: RollingStats):
+    # lines represent the average games played per day by each player over the last days of each window
+    return dict(zip(rolling.labels(), rolling.games_per_day.round(2))), np.cumsum(daily.games, axis=1) > 0
+
+
+@report_stage
+def avg_games_line_graph(daily: DailyStats, rolling: RollingStats, max_points: int = None):
+    """
+    Plots the average games played per day over time for each player in a line graph, over each rolling window
+    of calendar days, counting the days without games, from the first game of the player.
+
+    Over a long history, the rolling averages can be downsampled to `max_points` points per player; see `lttb`.
+    """
+    return player_line_graph(daily, rolling, avg_games_lines, 'games_played',
+                             'Average Games Played per Day Over Time', 'Average Games Played per Day',
+                             ('Average Games', '@games_played{0.00}'), max_points=max_points)
+
+
+def total_games_lines(daily: DailyStats, rolling: RollingStats = None):
+    # lines represent the cumulative games played by each player over all the dates played
+    return np.cumsum(daily.games, axis=1), None
+
+
+@report_stage
+def total_games_line_graph(daily: DailyStats, max_points: int = None):
+    """
+    Plots the total games played over time for each player in a line graph, downsampled to `max_points` points
+    per player if given; see `lttb`.
+    """
+    return player_line_graph(daily, None, total_games_lines, 'cumulative_sum',
+                             'Total Games Played Over Time', 'Total Games Played',
+                             ('Total Games', '@cumulative_sum'), max_points=max_points)
+
+
+@report_stage
+def total_games_dashboard(players_df, pairs_df, pair_index, daily, rolling, source, max_points=None):
+    avg_solo_chart = avg_games_chart(daily)
+    total_solo_chart = total_games_chart(daily)
+    total_solo_leaderboard = total_games_solo_leaderboard(daily)
+    matrix_plot = total_games_matrix(players_df, source)
+    pairs_leaderboard = total_games_pairs_leaderboard(pairs_df, pair_index)
+    avg_line_graph = avg_games_line_graph(daily, rolling, max_points)
+    total_line_graph = total_games_line_graph(daily, max_points)
+    return Column(Row(Column(avg_solo_chart, total_solo_chart, total_solo_leaderboard), Column(matrix_plot, pairs_leaderboard)), 
+                  avg_line_graph,
+                  total_line_graph)
+
+
+def solo_wins_chart_data(players_df: pd.DataFrame) -> pd.DataFrame:
+    # Filter the DataFrame to include only rows where the player is player1
+    solo_games_df = players_df[['player1', 'wins']].copy()
+    leaderboard = solo_games_df.groupby('player1').agg({
+        'wins': 'sum'
+    }).reset_index()
+    leaderboard.rename(columns={'player1': 'player'}, inplace=True)
+    
+    # color bars based on positivity of win differential
+    color_palette = RdYlBu[11]
+    leaderboard['color'] = [color_palette[0] if x >= 0 else color_palette[-1] for x in leaderboard['wins']]
+
+    # Sort the leaderboard by total games played and assign ranks
+    leaderboard = leaderboard.sort_values('wins', ascending=False)
+    leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    return leaderboard
+
+
+@report_stage
+def solo_wins_chart(players_df, source):
+    """
+    Plots the total number of wins for each player in a bar chart.
+    """
+    leaderboard = solo_wins_chart_data(players_df)
+    color_palette = RdYlBu[11]
+
+    # Create the ColumnDataSource and DataTable
+    source = live_view(ColumnDataSource(leaderboard), 'data', solo_wins_chart_data, players_df)
+    p = figure(x_range=leaderboard['player'], title='Total Wins for Each Player',
+               x_axis_label='Player', y_axis_label='Total Wins', 
+               height=700, width=700,  margin=(50, 50, 50, 50),
+               toolbar_location=None)
+
+    p.vbar(x='player', top='wins', width=0.9, source=source,
+           line_color='white', color='navy')
+
+    # Customize the plot
+    window_view(source, 'players', sort=['wins'], x_range=p.x_range, color_field='wins', colors=[color_palette[0], color_palette[-1]])
+    live_view(p.x_range, 'factors', chart_players, solo_wins_chart_data, players_df)
+    p.xgrid.grid_line_color = None
+    p.y_range.start = 0
+    p.xaxis.major_label_orientation = 1.0
+
+    return p
+
+
+def solo_wins_percentage_chart_data(players_df: pd.DataFrame) -> pd.DataFrame:
+    # Filter the DataFrame to include only rows where the player is player1
+    solo_games_df = players_df[['player1', 'wins', 'losses']].copy()
+    leaderboard = solo_games_df.groupby('player1').agg({
+        'wins': 'sum',
+        'losses': 'sum'
+    }).reset_index()
+    leaderboard.rename(columns={'player1': 'player'}, inplace=True)
+    leaderboard['win_percentage'] = 100*(leaderboard['wins'] / (leaderboard['wins'] + leaderboard['losses'])).round(2)
+    
+    # color bars based on positivity of win differential
+    color_palette = RdYlBu[11]
+    leaderboard['color'] = [color_palette[0] if x >= 0 else color_palette[-1] for x in leaderboard['win_percentage']]
+
+    # Sort the leaderboard by total games played and assign ranks
+    leaderboard = leaderboard.sort_values('win_percentage', ascending=False)
+    leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    return leaderboard
+
+
+@report_stage
+def solo_wins_percentage_chart(players_df, source):
+    """
+    Plots the win percentage for each player in a bar chart.
+    """
+    leaderboard = solo_wins_percentage_chart_data(players_df)
+    color_palette = RdYlBu[11]
+
+    # Create the ColumnDataSource and DataTable
+    source = live_view(ColumnDataSource(leaderboard), 'data', solo_wins_percentage_chart_data, players_df)
+    p = figure(x_range=leaderboard['player'], title='Win Percentage for Each Player',
+               x_axis_label='Player', y_axis_label='Win Percentage', 
+               height=700, width=700,  margin=(50, 50, 50, 50),
+               toolbar_location=None)
+
+    p.vbar(x='player', top='win_percentage', width=0.9, source=source,
+           line_color='white', color='navy')
+
+    # Customize the plot
+    window_view(source, 'players', sort=['win_percentage'], x_range=p.x_range, color_field='win_percentage', colors=[color_palette[0], color_palette[-1]])
+    live_view(p.x_range, 'factors', chart_players, solo_wins_percentage_chart_data, players_df)
+    p.xgrid.grid_line_color = None
+    p.y_range.start = 0
+    p.xaxis.major_label_orientation = 1.0
+
+    return p
+
+
+def rank_wins(players_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ranks the singles players by win percentage, then by wins.
+    """
+    # Filter the DataFrame to include only rows where the player is player1
+    solo_games_df = players_df.copy()
+    leaderboard = solo_games_df.groupby('player1').agg({
+        'wins': 'sum',
+        'losses': 'sum',
+        'win_differential': 'max'
+    }).reset_index()
+    leaderboard.rename(columns={'player1': 'player'}, inplace=True)
+    leaderboard['win_percentage'] = 100*(leaderboard['wins'] / (leaderboard['wins'] + leaderboard['losses'])).round(2)
+
+    # Sort the leaderboard by total games played and assign ranks
+    leaderboard = leaderboard.sort_values(['win_percentage', 'wins'], ascending=False)
     leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    return leaderboard
+
+
+@report_stage
+def solo_wins_leaderboard(players_df, source):
+    """
+    Creates a leaderboard of players based on the total number of games played.
+    """
+    leaderboard = rank_wins(players_df)
 
     # Create the ColumnDataSource and DataTable
-    source = ColumnDataSource(leaderboard)
+    source = window_view(ColumnDataSource(leaderboard), 'players', sort=['win_percentage', 'wins'])
+    live_view(source, 'data', rank_wins, players_df)
     columns = [TableColumn(field='rank', title='Rank'),
                TableColumn(field='player', title='Player'),
                TableColumn(field='wins', title='Wins'),
                TableColumn(field='losses', title='Losses'),
-               TableColumn(field='win_percentage', title='Win %')]
+               TableColumn(field='win_percentage', title='Win %', formatter=NumberFormatter(format='0.[00]'))]
     
     return DataTable(source=source, columns=columns,
                      index_position=None, margin=(50, 50, 50, 50),
                      width=700, height=300)
 
 
+@report_stage
 def head_to_head_matrix(players_df, source):
     players = players_df['player1'].unique()
 
     color_mapper = LinearColorMapper(palette=Plasma256, 
                                      low=players_df['win_differential'].min(), high=players_df['win_differential'].max(),
                                      nan_color='black')
+    window_view(color_mapper, 'range', field='win_differential')
+    live_view(color_mapper, 'low', column_bound, players_df, 'win_differential', 'min')
+    live_view(color_mapper, 'high', column_bound, players_df, 'win_differential', 'max')
     p = figure(title='Win Differentials', x_range=players, y_range=players, 
                 x_axis_location='above', width=700, height=700, margin=(50, 50, 50, 50),
                 tools='hover,save', tooltips='@player1 vs @player2: @win_differential', toolbar_location=None)
     p.rect(x='player2', y='player1', width=1, height=1, source=source,
            line_color=None, fill_color=transform('win_differential', color_mapper))
+    # only the pairs who met are drawn, so the other cells show the background in the color of missing values
+    p.background_fill_color = 'black'
+    p.grid.grid_line_color = None
     p.xaxis.major_label_orientation = 1.0
 
     color_bar = ColorBar(color_mapper=color_mapper, location=(0, 0))
@@ -477,140 +2043,90 @@ def head_to_head_matrix(players_df, source):
     return p
 
 
-def head_to_head_leaderboard(players_df, source):
+def rank_head_to_head(pairs_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Creates a leaderboard of players based on the total number of games played.
-    Ensures that "Player 1 vs Player 2" is considered the same as "Player 2 vs Player 1".
+    Ranks the pairs of singles players who met by win differential, seen from the side of the player with more wins.
     """
-    # Create a unique pair identifier
-    players_df = players_df[(players_df['win_differential'] >= 0) & (players_df['total_games'] > 0)].copy()
-    players_df.loc[:, 'pair'] = players_df.apply(lambda row: tuple(sorted([row['player1'], row['player2']])), axis=1)
-
-    # Group by the unique pair identifier and sum the total games played
-    leaderboard = players_df.groupby('pair').agg({
-        'player1': 'first',
-        'player2': 'first',
-        'wins': 'max',
-        'losses': 'min',
-        'win_differential': 'max'
-    }).reset_index(drop=True)
+    # Show each pair from the side of the player with more wins
+    leaderboard = orient_pairs(pairs_df[pairs_df['total_games'] > 0], 'win_differential')
+    leaderboard = leaderboard[['player1', 'player2', 'wins', 'losses', 'win_differential']].reset_index(drop=True)
     leaderboard = leaderboard[(leaderboard['wins'] > 0) | leaderboard['losses'] > 0]
-    leaderboard['record'] = leaderboard.apply(lambda row: f"{row['wins']} - {row['losses']}", axis=1)
     leaderboard['win_percentage'] = 100*(leaderboard['wins'] / (leaderboard['wins'] + leaderboard['losses'])).round(2)
 
     leaderboard = leaderboard.sort_values('win_differential', ascending=False)
     leaderboard['rank'] = range(1, len(leaderboard)+1)
-    source = ColumnDataSource(leaderboard)
+    return leaderboard
+
+
+@report_stage
+def head_to_head_leaderboard(pairs_df):
+    """
+    Creates a leaderboard of players based on the total number of games played.
+    Ensures that "Player 1 vs Player 2" is considered the same as "Player 2 vs Player 1".
+    """
+    leaderboard = rank_head_to_head(pairs_df)
+    source = window_view(ColumnDataSource(leaderboard), 'unordered_pairs', sort=['win_differential'], orient='win_differential')
+    live_view(source, 'data', rank_head_to_head, pairs_df)
     columns = [TableColumn(field='rank', title='Rank'),
                TableColumn(field='player1', title='Player 1'),
                TableColumn(field='player2', title='Player 2'),
-               TableColumn(field='record', title='Record'),
-               TableColumn(field='win_percentage', title='Win %'),
+               TableColumn(field='wins', title='Record', formatter=HTMLTemplateFormatter(template='<%= wins %> - <%= losses %>')),
+               TableColumn(field='win_percentage', title='Win %', formatter=NumberFormatter(format='0.[00]')),
                TableColumn(field='win_differential', title='Win Differential')]
     return DataTable(source=source, columns=columns, 
                      index_position=None,  margin=(50, 50, 50, 50),
                      width=700, height=300)
 
 
-def solo_wins_line_graph(players_df, games_df):
-    """
-    Plots the total wins over time for each player in a line graph.
-    """
-    players = players_df['player1'].unique()
-    num_players = len(players)
-    colors = Category20[num_players] if num_players <= 20 else viridis(num_players)
-    line_graph = figure(x_axis_label='Date', y_axis_label='Total Wins', title='Total Wins Over Time',
-                        x_axis_type='datetime', margin=(50, 50, 50, 50),
-                        width=1600, height=400, toolbar_location=None)
-
-    # Add minor grid lines
-    line_graph.xaxis.minor_tick_line_color = 'black'
-    line_graph.yaxis.minor_tick_line_color = 'black'
-    line_graph.xgrid.minor_grid_line_color = 'gray'
-    line_graph.xgrid.minor_grid_line_alpha = 0.1
-    line_graph.ygrid.minor_grid_line_color = 'gray'
-    line_graph.ygrid.minor_grid_line_alpha = 0.1
-
-    # add the lines with styling and tooltips
+def solo_wins_lines(daily: DailyStats, rolling: RollingStats = None):
     # lines represent the cumulative wins by each player over all the dates played
-    all_dates = pd.date_range(start=games_df['date'].min(), end=games_df['date'].max())
-    for idx, player in enumerate(players):
-        games_played = games_df[(games_df['player1'] == player) | (games_df['player2'] == player)].sort_values('date')
-        player_games = pd.DataFrame({'date': all_dates}).set_index('date')
-        games_played['wins'] = games_played.apply(lambda row: 1 if (row['player1'] == player and row['score1'] > row['score2']) or (row['player2'] == player and row['score2'] > row['score1']) else 0, axis=1)
-        player_games = games_played.groupby('date')['wins'].sum().cumsum()
-        player_source = ColumnDataSource(player_games.reset_index())
-        line = line_graph.line('date', 'wins', source=player_source, legend_label=player, 
-                               name=player, line_width=3, color=colors[idx % len(colors)])
-        hover = HoverTool(renderers=[line], tooltips=[('Player', player), ('Date', '@date{%F}'), ('Total Wins', '@wins')], formatters={'@date': 'datetime'})
-        line_graph.add_tools(hover)
-    line_graph.add_layout(line_graph.legend[0], 'right')
-    line_graph.legend.click_policy = 'hide'
+    return np.cumsum(daily.wins, axis=1), daily.games > 0
 
-    return line_graph
 
-
-def solo_win_percentage_line_graph(players_df, games_df):
+@report_stage
+def solo_wins_line_graph(daily: DailyStats, max_points: int = None):
     """
-    Plots the win percentage over time for each player in a line graph.
+    Plots the total wins over time for each player in a line graph, downsampled to `max_points` points
+    per player if given; see `lttb`.
     """
-    players = players_df['player1'].unique()
-    num_players = len(players)
-    colors = Category20[num_players] if num_players <= 20 else viridis(num_players)
-    line_graph = figure(x_axis_label='Date', y_axis_label='Win Percentage', title='Win Percentage Over Time',
-                        x_axis_type='datetime', margin=(50, 50, 50, 50),
-                        width=1600, height=400, toolbar_location=None)
+    return player_line_graph(daily, None, solo_wins_lines, 'wins',
+                             'Total Wins Over Time', 'Total Wins',
+                             ('Total Wins', '@wins'), max_points=max_points)
 
-    # Add minor grid lines
-    line_graph.xaxis.minor_tick_line_color = 'black'
-    line_graph.yaxis.minor_tick_line_color = 'black'
-    line_graph.xgrid.minor_grid_line_color = 'gray'
-    line_graph.xgrid.minor_grid_line_alpha = 0.1
-    line_graph.ygrid.minor_grid_line_color = 'gray'
-    line_graph.ygrid.minor_grid_line_alpha = 0.1
 
-    # add the lines with styling and tooltips
-    # lines represent the win percentage by each player over all the dates played
-    all_dates = pd.date_range(start=games_df['date'].min(), end=games_df['date'].max())
-    for idx, player in enumerate(players):
-        games_played = games_df[(games_df['player1'] == player) | (games_df['player2'] == player)].sort_values('date')
-        player_games = pd.DataFrame({'date': all_dates}).set_index('date')
-        games_played['wins'] = games_played.apply(lambda row: 1 if (row['player1'] == player and row['score1'] > row['score2']) or (row['player2'] == player and row['score2'] > row['score1']) else 0, axis=1)
-        games_played_count = games_played['date'].value_counts().sort_index()
-        wins_per_date = games_played.groupby('date')['wins'].sum().sort_index()
-        player_games['games_played'] = games_played_count.reindex(player_games.index, fill_value=0)
-        player_games['wins'] = wins_per_date.reindex(player_games.index, fill_value=0)
-        player_games['cumulative_games_played'] = player_games['games_played'].cumsum()
-        player_games['cumulative_wins'] = player_games['wins'].cumsum()        
-        player_games['win_percentage'] = (player_games['cumulative_wins'] / player_games['cumulative_games_played'] * 100).fillna(0).round(2)
-        player_source = ColumnDataSource(player_games.reset_index())
-        line = line_graph.line('date', 'win_percentage', source=player_source, legend_label=player, 
-                               name=player, line_width=3, color=colors[idx % len(colors)])
-        hover = HoverTool(renderers=[line], tooltips=[('Player', player), ('Date', '@date{%F}'), ('Win Percentage', '@win_percentage{0.00}%')], formatters={'@date': 'datetime'})
-        line_graph.add_tools(hover)
-    line_graph.add_layout(line_graph.legend[0], 'right')
-    line_graph.legend.click_policy = 'hide'
+def solo_win_percentage_lines(daily: DailyStats, rolling: RollingStats):
+    # lines represent the win percentage by each player over all the dates played, or the last days of a window
+    win_percentage = {'All time': (100*ratio(np.cumsum(daily.wins, axis=1), np.cumsum(daily.games, axis=1))).round(2),
+                      **dict(zip(rolling.labels(), (100*rolling.win_rate).round(2)))}
+    return win_percentage, None
 
-    return line_graph
+
+@report_stage
+def solo_win_percentage_line_graph(daily: DailyStats, rolling: RollingStats, max_points: int = None):
+    """
+    Plots the win percentage over time for each player in a line graph, over all time or each rolling window.
+    The lines can be downsampled to `max_points` points per player; see `lttb`.
+    """
+    return player_line_graph(daily, rolling, solo_win_percentage_lines, 'win_percentage',
+                             'Win Percentage Over Time', 'Win Percentage',
+                             ('Win Percentage', '@win_percentage{0.00}%'), max_points=max_points)
 
 
-def head_to_head_dashboard(players_df, games_df, source):
+@report_stage
+def head_to_head_dashboard(players_df, pairs_df, daily, rolling, source, max_points=None):
     total_wins_chart = solo_wins_chart(players_df, source)
     win_percentage_chart = solo_wins_percentage_chart(players_df, source)
     solo_leaderboard = solo_wins_leaderboard(players_df, source)
     matrix_plot = head_to_head_matrix(players_df, source)
-    pairs_leaderboard = head_to_head_leaderboard(players_df, source)
-    solo_wins_graph = solo_wins_line_graph(players_df, games_df)
-    solo_win_percentage_graph = solo_win_percentage_line_graph(players_df, games_df)
+    pairs_leaderboard = head_to_head_leaderboard(pairs_df)
+    solo_wins_graph = solo_wins_line_graph(daily, max_points)
+    solo_win_percentage_graph = solo_win_percentage_line_graph(daily, rolling, max_points)
     return Column(Row(Column(win_percentage_chart, total_wins_chart, solo_leaderboard), Column(matrix_plot, pairs_leaderboard)), 
                   solo_win_percentage_graph, 
                   solo_wins_graph)
 
 
-def point_differential_chart(players_df, source):
-    """
-    Plots the average point differential for each player in a bar chart.
-    """
+def point_differential_chart_data(players_df: pd.DataFrame) -> pd.DataFrame:
     # Filter the DataFrame to include only rows where the player is player1
     solo_games_df = players_df[['player1', 'total_games', 'point_diff']].copy()
     leaderboard = solo_games_df.groupby('player1').agg({
@@ -627,9 +2143,19 @@ def point_differential_chart(players_df, source):
     # Sort the leaderboard by total games played and assign ranks
     leaderboard = leaderboard.sort_values('avg_point_diff', ascending=False)
     leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    return leaderboard
+
+
+@report_stage
+def point_differential_chart(players_df, source):
+    """
+    Plots the average point differential for each player in a bar chart.
+    """
+    leaderboard = point_differential_chart_data(players_df)
+    color_palette = RdYlBu[11]
 
     # Create the ColumnDataSource and DataTable
-    source = ColumnDataSource(leaderboard)
+    source = live_view(ColumnDataSource(leaderboard), 'data', point_differential_chart_data, players_df)
     p = figure(x_range=leaderboard['player'], title='Average Point Differential for Each Player',
                x_axis_label='Player', y_axis_label='Average Point Differential', 
                height=700, width=700,  margin=(50, 50, 50, 50),
@@ -639,6 +2165,8 @@ def point_differential_chart(players_df, source):
            line_color='white', color='color')
 
     # Customize the plot
+    window_view(source, 'players', sort=['avg_point_diff'], x_range=p.x_range, color_field='point_diff', colors=[color_palette[0], color_palette[-1]])
+    live_view(p.x_range, 'factors', chart_players, point_differential_chart_data, players_df)
     p.xgrid.grid_line_color = None
     p.y_range.start = leaderboard['avg_point_diff'].min() - (p.y_range.end - leaderboard['avg_point_diff'].max())
     p.xaxis.major_label_orientation = 1.2
@@ -646,9 +2174,9 @@ def point_differential_chart(players_df, source):
     return p
 
 
-def point_differential_solo_leaderboard(players_df, source):
+def rank_point_differentials(players_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Creates a leaderboard of players based on the total number of games played.
+    Ranks the singles players by average point differential per game.
     """
     # Filter the DataFrame to include only rows where the player is player1
     solo_games_df = players_df[['player1', 'total_games', 'point_diff']]
@@ -663,12 +2191,22 @@ def point_differential_solo_leaderboard(players_df, source):
     # Sort the leaderboard by total games played and assign ranks
     leaderboard = leaderboard.sort_values('avg_point_diff', ascending=False)
     leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    return leaderboard
+
+
+@report_stage
+def point_differential_solo_leaderboard(players_df, source):
+    """
+    Creates a leaderboard of players based on the total number of games played.
+    """
+    leaderboard = rank_point_differentials(players_df)
 
     # Create the ColumnDataSource and DataTable
-    source = ColumnDataSource(leaderboard)
+    source = window_view(ColumnDataSource(leaderboard), 'players', sort=['avg_point_diff'])
+    live_view(source, 'data', rank_point_differentials, players_df)
     columns = [TableColumn(field='rank', title='Rank'),
                TableColumn(field='player', title='Player'),
-               TableColumn(field='avg_point_diff', title='Average'),
+               TableColumn(field='avg_point_diff', title='Average', formatter=NumberFormatter(format='0.[0]')),
                TableColumn(field='point_diff', title='Total')]
     
     return DataTable(source=source, columns=columns, 
@@ -676,161 +2214,318 @@ def point_differential_solo_leaderboard(players_df, source):
                      width=700, height=300)
 
 
-def point_differential_matrix(players_df, source):
-    players_df['avg_point_diff'] = (players_df['point_diff'] / players_df['total_games']).round(1)
-    players = players_df['player1'].unique()
+@report_stage
+def point_differential_matrix(players_df, source):
+    players = players_df['player1'].unique()
+
+    color_mapper = LinearColorMapper(palette=Plasma256, 
+                                     low=players_df['avg_point_diff'].min(), high=players_df['avg_point_diff'].max(), 
+                                     nan_color='black')
+    window_view(color_mapper, 'range', field='avg_point_diff')
+    live_view(color_mapper, 'low', column_bound, players_df, 'avg_point_diff', 'min')
+    live_view(color_mapper, 'high', column_bound, players_df, 'avg_point_diff', 'max')
+    p = figure(title='Average Point Differential', x_range=players, y_range=players, 
+               x_axis_location='above', width=700, height=700, margin=(50, 50, 50, 50),
+               tools='hover,save', tooltips='@player1 vs @player2: @avg_point_diff{0.[0]}')
+    p.rect(x='player2', y='player1', width=1, height=1, source=source,
+           line_color=None, fill_color=transform('avg_point_diff', color_mapper))
+    # only the pairs who met are drawn, so the other cells show the background in the color of missing values
+    p.background_fill_color = 'black'
+    p.grid.grid_line_color = None
+    p.xaxis.major_label_orientation = 1.0
+    color_bar = ColorBar(color_mapper=color_mapper, location=(0, 0))
+    p.add_layout(color_bar, 'right')
+    return p
+
+
+def rank_pair_point_differentials(pairs_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ranks the pairs of players who met by average point differential, then by total point differential,
+    from the side of the player with more points.
+    """
+    # Show each pair from the side of the player with more points
+    leaderboard = orient_pairs(pairs_df[pairs_df['total_games'] > 0], 'point_diff')
+    leaderboard = leaderboard[['player1', 'player2', 'total_games', 'point_diff']].reset_index(drop=True)
+    leaderboard['avg_point_diff'] = (leaderboard['point_diff'] / leaderboard['total_games']).round(1)
+    
+    leaderboard = leaderboard.sort_values(['avg_point_diff', 'point_diff'], ascending=False)
+    leaderboard['rank'] = range(1, len(leaderboard)+1)
+    return leaderboard
+
+
+@report_stage
+def point_differential_pairs_leaderboard(pairs_df):
+    """
+    Creates a leaderboard of players based on the total number of games played.
+    Ensures that "Player 1 vs Player 2" is considered the same as "Player 2 vs Player 1".
+    """
+    leaderboard = rank_pair_point_differentials(pairs_df)
+    source = window_view(ColumnDataSource(leaderboard), 'unordered_pairs', sort=['avg_point_diff', 'point_diff'], orient='point_diff')
+    live_view(source, 'data', rank_pair_point_differentials, pairs_df)
+    columns = [TableColumn(field='rank', title='Rank'),
+               TableColumn(field='player1', title='Player 1'),
+               TableColumn(field='player2', title='Player 2'),
+               TableColumn(field='avg_point_diff', title='Average', formatter=NumberFormatter(format='0.[0]')),
+               TableColumn(field='point_diff', title='Total')]
+    return DataTable(source=source, columns=columns, 
+                     index_position=None,  margin=(50, 50, 50, 50),
+                     width=700, height=300)
+
+
+def point_differential_lines(daily: DailyStats, rolling: RollingStats = None):
+    # lines represent the cumulative point differential by each player over all the dates played
+    return np.cumsum(daily.point_diff, axis=1), None
+
+
+@report_stage
+def point_differential_line_graph(daily: DailyStats, max_points: int = None):
+    """
+    Plots the total point differential over time for each player in a line graph, downsampled to `max_points` points
+    per player if given; see `lttb`.
+    """
+    return player_line_graph(daily, None, point_differential_lines, 'point_diff',
+                             'Total Point Differential Over Time', 'Total Point Differential',
+                             ('Total Point Differential', '@point_diff{0}'), max_points=max_points)
+
+
+def avg_point_differential_lines(daily: DailyStats, rolling: RollingStats):
+    # lines represent the average point differential by each player over all the dates played, or the last days of a window
+    avg_point_diff = {'All time': ratio(np.cumsum(daily.point_diff, axis=1), np.cumsum(daily.games, axis=1)).round(1),
+                      **dict(zip(rolling.labels(), rolling.point_diff.round(1)))}
+    return avg_point_diff, None
+
+
+@report_stage
+def avg_point_differential_line_graph(daily: DailyStats, rolling: RollingStats, max_points: int = None):
+    """
+    Plots the average point differential over time for each player in a line graph, over all time or each rolling window.
+    The lines can be downsampled to `max_points` points per player; see `lttb`.
+    """
+    return player_line_graph(daily, rolling, avg_point_differential_lines, 'avg_point_diff',
+                             'Average Point Differential Over Time', 'Average Point Differential',
+                             ('Average Point Differential', '@avg_point_diff{0.0}'), max_points=max_points)
+
+
+@report_stage
+def point_differential_dashboard(players_df, pairs_df, daily, rolling, source, max_points=None):
+    solo_chart = point_differential_chart(players_df, source)
+    solo_leaderboard = point_differential_solo_leaderboard(players_df, source)
+    matrix_plot = point_differential_matrix(players_df, source)
+    pairs_leaderboard = point_differential_pairs_leaderboard(pairs_df)
+    point_diff_graph = point_differential_line_graph(daily, max_points)
+    avg_point_diff_graph = avg_point_differential_line_graph(daily, rolling, max_points)
+    return Column(Row(Column(solo_chart, solo_leaderboard), Column(matrix_plot, pairs_leaderboard)),
+                  avg_point_diff_graph,
+                  point_diff_graph)
+
+
+def doubles_win_percentage_chart_data(doubles_df: pd.DataFrame) -> pd.DataFrame:
+    return doubles_df[['player', 'win_percentage']].sort_values('win_percentage', ascending=False)
+
+
+@report_stage
+def doubles_win_percentage_chart(doubles_df):
+    """
+    Plots the doubles win percentage for each player in a bar chart.
+    """
+    leaderboard = doubles_win_percentage_chart_data(doubles_df)
+
+    # Create the bar chart
+    source = live_view(ColumnDataSource(leaderboard), 'data', doubles_win_percentage_chart_data, doubles_df)
+    p = figure(x_range=leaderboard['player'], title='Doubles Win Percentage for Each Player',
+               x_axis_label='Player', y_axis_label='Win Percentage', 
+               height=700, width=700,  margin=(50, 50, 50, 50),
+               toolbar_location=None)
+
+    p.vbar(x='player', top='win_percentage', width=0.9, source=source,
+           line_color='white', color='navy')
+
+    # Customize the plot
+    live_view(p.x_range, 'factors', chart_players, doubles_win_percentage_chart_data, doubles_df)
+    p.xgrid.grid_line_color = None
+    p.y_range.start = 0
+    p.xaxis.major_label_orientation = 1.0
+
+    return p
+
+
+def rank_doubles(doubles_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ranks the doubles players by win percentage, then by wins.
+    """
+    leaderboard = doubles_df.sort_values(['win_percentage', 'wins'], ascending=False)
+    leaderboard['rank'] = range(1, len(leaderboard) + 1)
+    return leaderboard
+
+
+@report_stage
+def doubles_leaderboard(doubles_df):
+    """
+    Creates a leaderboard of players based on their doubles win percentage.
+    """
+    leaderboard = rank_doubles(doubles_df)
+
+    # Create the ColumnDataSource and DataTable
+    source = live_view(ColumnDataSource(leaderboard), 'data', rank_doubles, doubles_df)
+    columns = [TableColumn(field='rank', title='Rank'),
+               TableColumn(field='player', title='Player'),
+               TableColumn(field='wins', title='Wins'),
+               TableColumn(field='losses', title='Losses'),
+               TableColumn(field='win_percentage', title='Win %', formatter=NumberFormatter(format='0.[00]'))]
+    
+    return DataTable(source=source, columns=columns,
+                     index_position=None, margin=(50, 50, 50, 50),
+                     width=700, height=300)
+
+
+@report_stage
+def doubles_partner_matrix(doubles_pairs_df, source):
+    """
+    Plots the win percentage of each pair of players as partners in a matrix plot.
+    """
+    players = doubles_pairs_df['player1'].unique()
+
+    color_mapper = LinearColorMapper(palette=Plasma256, low=0, high=100, nan_color='black')
+    p = figure(title='Win Percentage as Partners', x_range=players, y_range=players, 
+               x_axis_location='above', width=700, height=700, margin=(50, 50, 50, 50),
+               tools='hover,save', tooltips='@player1 & @player2: @partner_wins-@partner_losses', toolbar_location=None)
+    p.rect(x='player2', y='player1', width=1, height=1, source=source,
+           line_color=None, fill_color=transform('partner_win_percentage', color_mapper))
+    # only the pairs who met are drawn, so the other cells show the background in the color of missing values
+    p.background_fill_color = 'black'
+    p.grid.grid_line_color = None
+    p.xaxis.major_label_orientation = 1.0
+
+    color_bar = ColorBar(color_mapper=color_mapper, location=(0, 0))
+    p.add_layout(color_bar, 'right')
+    return p
 
-    source = ColumnDataSource(players_df)
-    color_mapper = LinearColorMapper(palette=Plasma256, 
-                                     low=players_df['avg_point_diff'].min(), high=players_df['avg_point_diff'].max(), 
-                                     nan_color='black')
-    p = figure(title='Average Point Differential', x_range=players, y_range=players, 
+
+@report_stage
+def doubles_opponent_matrix(doubles_pairs_df, source):
+    """
+    Plots the doubles win percentage of each player against each other player in a matrix plot.
+    """
+    players = doubles_pairs_df['player1'].unique()
+
+    color_mapper = LinearColorMapper(palette=Plasma256, low=0, high=100, nan_color='black')
+    p = figure(title='Doubles Win Percentage Against Opponents', x_range=players, y_range=players, 
                x_axis_location='above', width=700, height=700, margin=(50, 50, 50, 50),
-               tools='hover,save', tooltips='@player1 vs @player2: @avg_point_diff')
+               tools='hover,save', tooltips='@player1 vs @player2: @opponent_wins-@opponent_losses', toolbar_location=None)
     p.rect(x='player2', y='player1', width=1, height=1, source=source,
-           line_color=None, fill_color=transform('avg_point_diff', color_mapper))
+           line_color=None, fill_color=transform('opponent_win_percentage', color_mapper))
+    # only the pairs who met are drawn, so the other cells show the background in the color of missing values
+    p.background_fill_color = 'black'
+    p.grid.grid_line_color = None
     p.xaxis.major_label_orientation = 1.0
+
     color_bar = ColorBar(color_mapper=color_mapper, location=(0, 0))
     p.add_layout(color_bar, 'right')
     return p
 
 
-def point_differential_pairs_leaderboard(players_df, source):
+def rank_partners(doubles_pairs_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Creates a leaderboard of players based on the total number of games played.
-    Ensures that "Player 1 vs Player 2" is considered the same as "Player 2 vs Player 1".
+    Ranks the doubles teams who played together by win percentage together, then by wins together.
     """
-    # Create a unique pair identifier
-    players_df = players_df[(players_df['point_diff'] >= 0) & (players_df['total_games'] > 0)].copy()
-    players_df.loc[:, 'pair'] = players_df.apply(lambda row: tuple(sorted([row['player1'], row['player2']])), axis=1)
-
-    # Group by the unique pair identifier and sum the total games played
-    leaderboard = players_df.groupby('pair').agg({
-        'player1': 'first',
-        'player2': 'first',
-        'total_games': 'sum',
-        'point_diff': 'max',
-    }).reset_index(drop=True)
-    leaderboard['avg_point_diff'] = (leaderboard['point_diff'] / leaderboard['total_games']).round(1)
-    
-    leaderboard = leaderboard.sort_values(['avg_point_diff', 'point_diff'], ascending=False)
+    players = pd.Index(doubles_pairs_df['player1'].unique())
+    first = players.get_indexer(doubles_pairs_df['player1'])
+    second = players.get_indexer(doubles_pairs_df['player2'])
+    leaderboard = doubles_pairs_df[(first < second) & (doubles_pairs_df['partner_games'] > 0)]
+
+    leaderboard = leaderboard.sort_values(['partner_win_percentage', 'partner_wins'], ascending=False)
     leaderboard['rank'] = range(1, len(leaderboard)+1)
-    source = ColumnDataSource(leaderboard)
+    return leaderboard
+
+
+@report_stage
+def doubles_partners_leaderboard(doubles_pairs_df):
+    """
+    Creates a leaderboard of doubles teams based on their win percentage together.
+    Ensures that "Player 1 & Player 2" is considered the same as "Player 2 & Player 1".
+    """
+    leaderboard = rank_partners(doubles_pairs_df)
+    source = ColumnDataSource(leaderboard[['rank', 'player1', 'player2', 'partner_wins', 'partner_losses', 'partner_win_percentage']])
+    live_view(source, 'data', rank_partners, doubles_pairs_df)
     columns = [TableColumn(field='rank', title='Rank'),
                TableColumn(field='player1', title='Player 1'),
                TableColumn(field='player2', title='Player 2'),
-               TableColumn(field='avg_point_diff', title='Average'),
-               TableColumn(field='point_diff', title='Total')]
+               TableColumn(field='partner_wins', title='Record', formatter=HTMLTemplateFormatter(template='<%= partner_wins %>-<%= partner_losses %>')),
+               TableColumn(field='partner_win_percentage', title='Win %', formatter=NumberFormatter(format='0.[00]'))]
     return DataTable(source=source, columns=columns, 
                      index_position=None,  margin=(50, 50, 50, 50),
                      width=700, height=300)
 
 
-def point_differential_line_graph(players_df, games_df):
+def rank_matchups(matchups_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Plots the total point differential over time for each player in a line graph.
+    Ranks the team matchups by total games, then by wins.
     """
-    players = players_df['player1'].unique()
-    num_players = len(players)
-    colors = Category20[num_players] if num_players <= 20 else viridis(num_players)
-    line_graph = figure(x_axis_label='Date', y_axis_label='Total Point Differential', title='Total Point Differential Over Time',
-                        x_axis_type='datetime', margin=(50, 50, 50, 50),
-                        width=1600, height=400, toolbar_location=None)
-
-    # Add minor grid lines
-    line_graph.xaxis.minor_tick_line_color = 'black'
-    line_graph.yaxis.minor_tick_line_color = 'black'
-    line_graph.xgrid.minor_grid_line_color = 'gray'
-    line_graph.xgrid.minor_grid_line_alpha = 0.1
-    line_graph.ygrid.minor_grid_line_color = 'gray'
-    line_graph.ygrid.minor_grid_line_alpha = 0.1
-
-    # add the lines with styling and tooltips
-    # lines represent the cumulative point differential by each player over all the dates played
-    all_dates = pd.date_range(start=games_df['date'].min(), end=games_df['date'].max())
-    for idx, player in enumerate(players):
-        games_played = games_df[(games_df['player1'] == player) | (games_df['player2'] == player)].sort_values('date')
-        player_games = pd.DataFrame({'date': all_dates}).set_index('date')
-        games_played['point_diff'] = games_played.apply(lambda row: row['score1'] - row['score2'] if row['player1'] == player else row['score2'] - row['score1'], axis=1)
-        player_games['point_diff'] = games_played.groupby('date')['point_diff'].sum().cumsum().reindex(player_games.index, method='ffill').fillna(0)
-        player_source = ColumnDataSource(player_games.reset_index())
-        line = line_graph.line('date', 'point_diff', source=player_source, legend_label=player, 
-                               name=player, line_width=3, color=colors[idx % len(colors)])
-        hover = HoverTool(renderers=[line], tooltips=[('Player', player), ('Date', '@date{%F}'), ('Total Point Differential', '@point_diff{0}')], formatters={'@date': 'datetime'})
-        line_graph.add_tools(hover)
-    line_graph.add_layout(line_graph.legend[0], 'right')
-    line_graph.legend.click_policy = 'hide'
-
-    return line_graph
+    leaderboard = matchups_df.sort_values(['total_games', 'wins'], ascending=False)
+    leaderboard['rank'] = range(1, len(leaderboard)+1)
+    return leaderboard
 
 
-def avg_point_differential_line_graph(players_df, games_df):
+@report_stage
+def doubles_matchups_leaderboard(matchups_df):
     """
-    Plots the average point differential over time for each player in a line graph.
+    Creates a leaderboard of the team matchups based on the total number of games played.
     """
-    players = players_df['player1'].unique()
-    num_players = len(players)
-    colors = Category20[num_players] if num_players <= 20 else viridis(num_players)
-    line_graph = figure(x_axis_label='Date', y_axis_label='Average Point Differential', title='Average Point Differential Over Time',
-                        x_axis_type='datetime', margin=(50, 50, 50, 50),
-                        width=1600, height=400, toolbar_location=None)
+    leaderboard = rank_matchups(matchups_df)
+    source = live_view(ColumnDataSource(leaderboard), 'data', rank_matchups, matchups_df)
+    columns = [TableColumn(field='rank', title='Rank'),
+               TableColumn(field='team1', title='Team 1'),
+               TableColumn(field='team2', title='Team 2'),
+               TableColumn(field='wins', title='Record', formatter=HTMLTemplateFormatter(template='<%= wins %>-<%= losses %>')),
+               TableColumn(field='total_games', title='Total Games Played')]
+    return DataTable(source=source, columns=columns, 
+                     index_position=None,  margin=(50, 50, 50, 50),
+                     width=700, height=300)
 
-    # Add minor grid lines
-    line_graph.xaxis.minor_tick_line_color = 'black'
-    line_graph.yaxis.minor_tick_line_color = 'black'
-    line_graph.xgrid.minor_grid_line_color = 'gray'
-    line_graph.xgrid.minor_grid_line_alpha = 0.1
-    line_graph.ygrid.minor_grid_line_color = 'gray'
-    line_graph.ygrid.minor_grid_line_alpha = 0.1
 
-    # add the lines with styling and tooltips
-    # lines represent the average point differential by each player over all the dates played
-    all_dates = pd.date_range(start=games_df['date'].min(), end=games_df['date'].max())
-    for idx, player in enumerate(players):
-        games_played = games_df[(games_df['player1'] == player) | (games_df['player2'] == player)].sort_values('date')
-        player_games = pd.DataFrame({'date': all_dates}).set_index('date')
-        games_played['point_diff'] = games_played.apply(lambda row: row['score1'] - row['score2'] if row['player1'] == player else row['score2'] - row['score1'], axis=1)
-        point_diff_cumsum = games_played.groupby('date')['point_diff'].sum().cumsum()
-        games_played_count = games_played['date'].value_counts().sort_index().cumsum()
-        player_games['cumulative_point_diff'] = point_diff_cumsum.reindex(player_games.index, method='ffill').fillna(0)
-        player_games['cumulative_games_played'] = games_played_count.reindex(player_games.index, method='ffill').fillna(0)
-        player_games['avg_point_diff'] = (player_games['cumulative_point_diff'] / player_games['cumulative_games_played']).fillna(0).round(1)
-        player_source = ColumnDataSource(player_games.reset_index())
-        line = line_graph.line('date', 'avg_point_diff', source=player_source, legend_label=player,
-                               name=player, line_width=3, color=colors[idx % len(colors)])
-        hover = HoverTool(renderers=[line], tooltips=[('Player', player), ('Date', '@date{%F}'), ('Average Point Differential', '@avg_point_diff{0.0}')], formatters={'@date': 'datetime'})
-        line_graph.add_tools(hover)
-    line_graph.add_layout(line_graph.legend[0], 'right')
-    line_graph.legend.click_policy = 'hide'
+@report_stage
+def doubles_dashboard(doubles_df, doubles_pairs_df, matchups_df):
+    source = live_view(ColumnDataSource(doubles_pairs_df), 'data', None, doubles_pairs_df)
+    win_percentage_chart = doubles_win_percentage_chart(doubles_df)
+    solo_leaderboard = doubles_leaderboard(doubles_df)
+    partner_matrix = doubles_partner_matrix(doubles_pairs_df, source)
+    partners_leaderboard = doubles_partners_leaderboard(doubles_pairs_df)
+    opponent_matrix = doubles_opponent_matrix(doubles_pairs_df, source)
+    matchups_leaderboard = doubles_matchups_leaderboard(matchups_df)
+    return Column(Row(Column(win_percentage_chart, solo_leaderboard), Column(partner_matrix, partners_leaderboard)),
+                  Row(opponent_matrix, matchups_leaderboard))
+
 
-    return line_graph
+def history_columns(games_df: pd.DataFrame, players: list) -> dict:
+    """
+    Returns the columns of a history table: the day of each game since the epoch, its players and its scores.
+    """
+    columns = {'day': games_df['date'].to_numpy(dtype='datetime64[D]').astype(np.int32)}
+    columns.update({column: games_df[column].to_numpy(dtype=object) for column in players})
+    columns.update({column: games_df[column].to_numpy() for column in ['score1', 'score2']})
+    return columns
 
 
-def point_differential_dashboard(players_df, games_df, source):
-    solo_chart = point_differential_chart(players_df, source)
-    solo_leaderboard = point_differential_solo_leaderboard(players_df, source)
-    matrix_plot = point_differential_matrix(players_df, source)
-    pairs_leaderboard = point_differential_pairs_leaderboard(players_df, source)
-    point_diff_graph = point_differential_line_graph(players_df, games_df)
-    avg_point_diff_graph = avg_point_differential_line_graph(players_df, games_df)
-    return Column(Row(Column(solo_chart, solo_leaderboard), Column(matrix_plot, pairs_leaderboard)),
-                  avg_point_diff_graph,
-                  point_diff_graph)
+def history_data(games_df: pd.DataFrame, players: Tuple[str]) -> dict:
+    """
+    Returns the columns of a history table of the games, the latest first; see `history_columns`.
+    """
+    return history_columns(games_df.sort_values('date', ascending=False), list(players))
 
 
+@report_stage
 def singles_history(games_df):
     """
     Creates a dashboard for the history of singles games.
     """
-    games_df['score'] = games_df.apply(lambda row: f"{row['score1']}-{row['score2']}", axis=1)
-    games_df = games_df.sort_values('date', ascending=False)
-    source = ColumnDataSource(games_df)
+    players = tuple(PLAYER_COLUMNS[:2])
+    source = live_view(ColumnDataSource(history_data(games_df, players)), 'data', history_data, games_df, players)
 
-    # Create a table of the games
-    columns = [TableColumn(field='date', title='Date', formatter=DateFormatter(format='%Y-%m-%d')),
+    # Create a table of the games, whose dates and scores are formatted in the browser
+    columns = [TableColumn(field='day', title='Date', formatter=HTMLTemplateFormatter(template=f'<%= {DAY_FORMAT_JS} %>')),
                TableColumn(field='player1', title='Player 1'),
                TableColumn(field='player2', title='Player 2'),
-               TableColumn(field='score', title='Score')]
+               TableColumn(field='score1', title='Score', formatter=HTMLTemplateFormatter(template='<%= score1 %>-<%= score2 %>'))]
     title = Div(text="<h2>Singles Game History</h2>", margin=(50, 50, 0, 50))
     data_table = DataTable(source=source, columns=columns, 
                            index_position=None, margin=(0, 50, 50, 50),
@@ -838,29 +2533,28 @@ def singles_history(games_df):
     return Column(title, data_table)
 
 
+@report_stage
 def doubles_history(games_df):
     """
     Creates a dashboard for the history of doubles games.
     """
-    games_df['score'] = games_df.apply(lambda row: f"{row['score1']}-{row['score2']}", axis=1)
-    games_df['team1'] = games_df.apply(lambda row: f"{row['player1']}<br>{row['player2']}", axis=1)
-    games_df['team2'] = games_df.apply(lambda row: f"{row['player3']}<br>{row['player4']}", axis=1)
-    games_df = games_df.sort_values('date', ascending=False)
-    source = ColumnDataSource(games_df)
+    players = tuple(PLAYER_COLUMNS)
+    source = live_view(ColumnDataSource(history_data(games_df, players)), 'data', history_data, games_df, players)
 
-    # Define HTML template formatter
+    # Define HTML template formatters, which put the players of a team on lines of their own
     template = """
     <div>
-        <%= value %>
+        <%= {} %><br><%= {} %>
     </div>
     """
-    html_formatter = HTMLTemplateFormatter(template=template)
-
-    # Create a table of the games
-    columns = [TableColumn(field='date', title='Date', formatter=DateFormatter(format='%Y-%m-%d')),
-               TableColumn(field='team1', title='Team 1', formatter=html_formatter),
-               TableColumn(field='team2', title='Team 2', formatter=html_formatter),
-               TableColumn(field='score', title='Score')]
+    team1_formatter = HTMLTemplateFormatter(template=template.format('player1', 'player2'))
+    team2_formatter = HTMLTemplateFormatter(template=template.format('player3', 'player4'))
+
+    # Create a table of the games, whose dates, teams and scores are formatted in the browser
+    columns = [TableColumn(field='day', title='Date', formatter=HTMLTemplateFormatter(template=f'<%= {DAY_FORMAT_JS} %>')),
+               TableColumn(field='player1', title='Team 1', formatter=team1_formatter),
+               TableColumn(field='player3', title='Team 2', formatter=team2_formatter),
+               TableColumn(field='score1', title='Score', formatter=HTMLTemplateFormatter(template='<%= score1 %>-<%= score2 %>'))]
     title = Div(text="<h2>Doubles Game History</h2>", margin=(50, 50, 0, 50))
     data_table = DataTable(source=source, columns=columns, row_height=45,
                            index_position=None, margin=(0, 50, 50, 50),
@@ -883,73 +2577,1222 @@ def doubles_history(games_df):
     return Column(title, data_table)
     
 
+@report_stage
 def history_dashboard(singles_games_df, doubles_games_df):
     singles_table = singles_history(singles_games_df)
     doubles_table = doubles_history(doubles_games_df)
     return Row(singles_table, doubles_table)
 
 
+def narrow_array(values: np.ndarray) -> np.ndarray:
+    """
+    Returns the values in the narrowest dtype that holds them, so that Bokeh sends them as small base64 arrays:
+    integers, and floats that only hold integers, in the smallest integer type they fit, and other floats as float32,
+    which is plenty for stats shown to two decimals. Other arrays, like names, are returned as they are.
+    """
+    if values.dtype.kind == 'f' and len(values) and np.isfinite(values).all() and (np.abs(values) < 2**31).all() \
+            and (values == np.round(values)).all():
+        values = values.astype(np.int64)
+    if values.dtype.kind in 'iu' and len(values):
+        low, high = values.min(), values.max()
+        for dtype in (np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32):
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                return values.astype(dtype)
+    elif values.dtype.kind == 'f':
+        return values.astype(np.float32)
+    return values
+
+
+def narrow_sources(model: Model):
+    """
+    Narrows the columns of every data source of a model, or of a document, in place; see `narrow_array`.
+    """
+    for source in model.select({'type': ColumnDataSource}):
+        # the columns are updated in place, since Bokeh ignores setting data that compares equal to the old
+        source.data.update({column: narrow_array(values) for column, values in source.data.items() if isinstance(values, np.ndarray)})
+
+
+class ModelSnapshot:
+    """
+    A Bokeh model serialized to plain data, so that it can be sent to another process.
+
+    The models in `references`, like a data source shared with other snapshots, are left out and only referred to by id.
+    `components` lists the BokehJS bundles the model needs. The data sources of the model are narrowed first, like those
+    of a page; see `save_dashboard`.
+    """
+    def __init__(self, model: Model, references: list = ()):
+        narrow_sources(model)
+        self.content = Serializer(references=set(references), deferred=False).serialize(model).content
+        self.components = bundle_components(model)
+        self.shared = {}
+
+    def restore(self, deserializer: Deserializer = None) -> Model:
+        """
+        Rebuilds the model. Models the deserializer already knows, e.g. a data source shared by several snapshots,
+        are reused rather than rebuilt.
+        """
+        with warnings.catch_warnings():
+            # the deserializer warns about every reference it already knows, which is the point here
+            warnings.simplefilter('ignore')
+            return (deserializer or Deserializer()).deserialize(self.content)
+
+
+def bundle_components(model: Model) -> set:
+    """
+    Returns the names of the BokehJS bundles needed to display the model, or a document, e.g. 'bokeh-tables' for data tables.
+    """
+    bundle = bundle_for_objs_and_resources([model], Resources(mode='server', root_url=''))
+    return {Path(str(url)).name.split('.')[0] for url in bundle.js_files}
+
+
+def init_worker():
+    """
+    Sets up a worker process. Bokeh gives new models random ids instead of counting them up, so that the models of
+    different processes never clash, and a build report being recorded is left to the main process.
+    """
+    global _report
+    settings.simple_ids.set_value(False)
+    if _report is not None:
+        _report = None
+        tracemalloc.stop()
+
+
+def build_snapshot(builder, args: tuple) -> ModelSnapshot:
+    """
+    Builds a dashboard in a worker process. The models among the arguments come as snapshots, and the dashboard
+    only refers to them by id, since the process that assembles the page already has them.
+    """
+    deserializer = Deserializer()
+    args = [arg.restore(deserializer) if isinstance(arg, ModelSnapshot) else arg for arg in args]
+    return ModelSnapshot(builder(*args), references=[arg for arg in args if isinstance(arg, Model)])
+
+
+def build_dashboards(builders: dict, parallel: bool = False) -> dict:
+    """
+    Builds the dashboards given as title: (builder, arguments), returning them by title.
+
+    In parallel, every dashboard is built and serialized in its own worker process from a copy of the arguments,
+    and comes back as a snapshot. Rebuilding the models here would cost as much as building them, so the snapshots
+    stay serialized and are spliced into the page as it is saved; see `tab_layout` and `save_dashboard`. The models
+    among the arguments, like a data source shared by several dashboards, are sent along as snapshots too, and are
+    still shared in the page.
+    """
+    if not parallel:
+        return {title: builder(*args) for title, (builder, args) in builders.items()}
+
+    shared = {id(arg): ModelSnapshot(arg) for _, args in builders.values() for arg in args if isinstance(arg, Model)}
+    with ProcessPoolExecutor(max_workers=min(len(builders), os.cpu_count() or 1), initializer=init_worker) as pool:
+        futures = {title: pool.submit(build_snapshot, builder, [shared.get(id(arg), arg) for arg in args])
+                   for title, (builder, args) in builders.items()}
+        snapshots = {title: future.result() for title, future in futures.items()}
+    for title, (_, args) in builders.items():
+        snapshots[title].shared = {arg.id: shared[id(arg)].content for arg in args if isinstance(arg, Model)}
+    return snapshots
+
+
+def tab_layout(plots: dict) -> Tuple[Tabs, dict]:
+    """
+    Lays the dashboards out in tabs by title. Dashboards that are still snapshots are stood in for by empty placeholders,
+    which are also returned by id so that `save_dashboard` can splice the snapshots in their place.
+    """
+    panels, snapshots = [], {}
+    for title, plot in plots.items():
+        if isinstance(plot, ModelSnapshot):
+            placeholder = Div()
+            snapshots[placeholder.id] = plot
+            plot = placeholder
+        panels.append(TabPanel(child=plot, title=title))
+    return Tabs(tabs=panels), snapshots
+
+
+def splice_snapshots(doc_json: dict, snapshots: dict):
+    """
+    Replaces the placeholders of a serialized document with their snapshots, in place.
+
+    The models shared by the snapshots are only referred to by id in them, so each is written out in full where
+    it is first referred to, in the order BokehJS reads the document, and left as a reference everywhere after.
+    """
+    shared = {model_id: content for snapshot in snapshots.values() for model_id, content in snapshot.shared.items()}
+    defined = set()
+
+    def splice(value):
+        if isinstance(value, dict):
+            if value.get('type') == 'object' and value.get('id') in snapshots:
+                value = snapshots[value['id']].content
+            elif value.keys() == {'id'} and value['id'] in shared and value['id'] not in defined:
+                value = shared[value['id']]
+            if value.get('type') == 'object':
+                defined.add(value.get('id'))
+            items = value.items()
+        else:
+            items = enumerate(value)
+        for key, item in items:
+            if isinstance(item, (dict, list)):
+                value[key] = splice(item)
+        return value
+
+    doc_json['roots'] = splice(doc_json['roots'])
+
+
+TABS_JS = """
+// the dashboard of a tab is read from a file of its own the first time the tab is shown; see `lazy_tabs`
+const index = cb_obj.active
+const file = files[index]
+if (file == null)
+  return
+files[index] = null
+
+const script = document.createElement('script')
+script.src = file
+script.onload = () => {
+  // the file holds the panel of the tab in full, under a new id, which takes the place of the placeholder panel
+  const panel = window.BOKEH_DATA[file]
+  delete window.BOKEH_DATA[file]
+  const panels = cb_obj.tabs.map((tab, i) => i == index ? panel : {id: tab.id})
+  cb_obj.document.apply_json_patch({events: [{kind: 'ModelChanged', model: {id: cb_obj.id}, attr: 'tabs', new: panels}]})
+
+  // a tab shown after the dates were narrowed is brought up to them
+  for (const slider of sliders) {
+    if (slider.value[0] != slider.start || slider.value[1] != slider.end)
+      slider.properties.value_throttled.change.emit()
+  }
+}
+document.head.append(script)
+"""
+
+
+def lazy_tabs(model: Model, html_file: Path) -> dict:
+    """
+    Makes every tab of the model but the active one load its dashboard from a `<page>.tab-<n>.js` file of its own the
+    first time it is shown, returning the files by the id of the tab panel; see `split_tabs`.
+
+    The dashboards are loaded into the document of the page rather than embedded as documents of their own, so that
+    the models they share with the page, like the data source of the pair records, stay shared, and the date range
+    slider finds the views it updates among them.
+    """
+    # the models are collected once, since every walk of a dashboard takes a while
+    models = model.references()
+    sliders = [slider for slider in models if isinstance(slider, DateRangeSlider)]
+    tab_files = {}
+    for tabs in [tabs for tabs in models if isinstance(tabs, Tabs)]:
+        files = []
+        for position, panel in enumerate(tabs.tabs):
+            if position == tabs.active:
+                files.append(None)
+                continue
+            tab_files[panel.id] = html_file.with_suffix(f'.tab-{len(tab_files) + 1}.js')
+            files.append(tab_files[panel.id].name)
+        # the loader of an earlier save of the same tabs is replaced, since it loads the files of that page
+        callbacks = tabs.js_property_callbacks.get('change:active', [])
+        tabs.js_property_callbacks['change:active'] = [callback for callback in callbacks if getattr(callback, 'code', None) != TABS_JS]
+        tabs.js_on_change('active', CustomJS(args={'files': files, 'sliders': sliders}, code=TABS_JS))
+    return tab_files
+
+
+def serialized_objects(value, references: bool = False):
+    """
+    Yields the models written out in full in a serialized value, in the order BokehJS reads them, along with the
+    references to models written out elsewhere if `references` is set.
+    """
+    if isinstance(value, dict):
+        if value.get('type') == 'object' or references and value.keys() == {'id'}:
+            yield value
+        items = value.values()
+    else:
+        items = value
+    for item in items:
+        if isinstance(item, (dict, list)):
+            yield from serialized_objects(item, references)
+
+
+def model_ids(value) -> set:
+    """
+    Returns the ids of the models a serialized value defines or refers to.
+    """
+    return {value['id'] for value in serialized_objects(value, references=True) if 'id' in value}
+
+
+def complete_references(value, definitions: dict, defined: set):
+    """
+    Writes out a copy of every model a serialized value refers to but does not define, in place, where it is first
+    referred to, so that the value can be read after only the models in `defined`, which it refers to rather than
+    writes out again. `definitions` holds the serialized models by id. The models the value defines are added to `defined`.
+    """
+    if isinstance(value, dict):
+        if value.keys() == {'id'} and value['id'] not in defined:
+            value = copy.deepcopy(definitions[value['id']])
+        elif value.get('type') == 'object' and value.get('id') in defined:
+            return {'id': value['id']}
+        if value.get('type') == 'object':
+            defined.add(value.get('id'))
+        items = value.items()
+    else:
+        items = enumerate(value)
+    for key, item in items:
+        if isinstance(item, (dict, list)):
+            value[key] = complete_references(item, definitions, defined)
+    return value
+
+
+def split_tabs(doc_json: dict, panel_ids) -> dict:
+    """
+    Takes the given tab panels out of a serialized document, in place, leaving them with an empty placeholder as their
+    child. Returns copies of the panels by id, each under a new id and with its child in full, to be loaded into the
+    document in their place.
+
+    A model is only written out in full where it is first referred to, so the models that the document or other panels
+    share with a panel that defines them are written out in the document, where they are first referred to or else as
+    extra roots. The panels only refer to the models of the document, since BokehJS resets a model it already has to
+    the attributes it reads, which would undo what the page did to it since.
+    """
+    # the serializer leaves some lists as tuples, which are made lists to be walked and changed in place
+    doc_json['roots'] = json.loads(json.dumps(doc_json['roots']))
+    definitions = {value['id']: value for value in serialized_objects(doc_json['roots']) if 'id' in value}
+    panels = {}
+    for panel_id in panel_ids:
+        attributes = definitions[panel_id]['attributes']
+        panels[panel_id] = {**definitions[panel_id], 'id': make_id(), 'attributes': dict(attributes)}
+        attributes['child'] = {'type': 'object', 'name': 'Div', 'id': make_id()}
+
+    parts = [doc_json['roots'], *panels.values()]
+    appearances = collections.Counter(model_id for part in parts for model_id in model_ids(part))
+    in_document = model_ids(doc_json['roots'])
+    doc_json['roots'] += [{'id': model_id} for model_id, count in appearances.items() if count > 1 and model_id not in in_document]
+
+    defined = set()
+    doc_json['roots'] = complete_references(doc_json['roots'], definitions, defined)
+    return {panel_id: complete_references(panel, definitions, set(defined)) for panel_id, panel in panels.items()}
+
+
+STATIC_PAGE = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+{scripts}
+  </head>
+  <body>
+    <div id="{root_id}" style="display: contents;"></div>
+    <script src="{data_file}"></script>
+    <script>
+      Bokeh.embed.embed_item(window.BOKEH_DATA[{data_key}], "{root_id}");
+    </script>
+  </body>
+</html>
+"""
+
+
+def page_resources(components: set, mode: str) -> Resources:
+    """
+    Returns the BokehJS resources of the given bundles in 'inline' or 'server' mode, in the order BokehJS loads them.
+    """
+    options = {'root_url': ''} if mode == 'server' else {}
+    return Resources(mode=mode, components=[component for component in Resources(mode=mode, **options).components
+                                            if component in components], **options)
+
+
+@functools.lru_cache()
+def inline_bundle(components: frozenset):
+    """
+    Returns the BokehJS bundles to inline in a page, read once per process and shared by every page it builds.
+    """
+    return bundle_for_objs_and_resources(None, page_resources(components, 'inline'))
+
+
+def write_static_resources(components: set, static_dir: Path) -> list:
+    """
+    Copies the BokehJS bundles into a folder named after the Bokeh version, unless they are already there.
+    Returns the paths of the bundles.
+    """
+    version_dir = static_dir / f'bokeh-{bokeh.__version__}'
+    version_dir.mkdir(parents=True, exist_ok=True)
+    js_files = []
+    for url in page_resources(components, 'server').js_files:
+        name = Path(str(url)).name
+        source_file, target_file = bokehjs_path() / 'js' / name, version_dir / name
+        if not target_file.exists() or target_file.stat().st_size != source_file.stat().st_size:
+            # pages built at the same time may copy the same bundle, so each copies to a file of its own first
+            tmp_file = target_file.with_name(f'{name}.{os.getpid()}.tmp')
+            shutil.copyfile(source_file, tmp_file)
+            os.replace(tmp_file, target_file)
+        js_files.append(target_file)
+    return js_files
+
+
+def save_dashboard(model, html_file: Path, title: str, mode: str = 'inline', snapshots: dict = None,
+                   static_dir: Path = None) -> list:
+    """
+    Saves the dashboard as a standalone HTML page, returning the files written for it, not counting BokehJS.
+
+    In 'inline' mode, BokehJS and the data are embedded in the page. In 'static' mode, BokehJS is written once to
+    `static_dir`, by default the `static` folder next to the page, where every page shares it, and the data to
+    a `<page>.data.js` sidecar.
+    The sidecar is the JSON document of the dashboard wrapped in a single assignment, so that it is loaded by a
+    script tag and the page keeps working from local files, where browsers block fetching JSON. 'lazy' mode is
+    'static' mode with the dashboard of every tab but the active one in a sidecar of its own, which is only loaded
+    when the tab is first shown, so that the page only parses and lays out the active tab to start with; see `lazy_tabs`.
+
+    `snapshots` holds the serialized dashboards to splice in place of the placeholders of the model, by placeholder id;
+    see `tab_layout`.
+
+    The columns of the data sources are narrowed to the smallest dtypes that hold them before they are serialized,
+    and display strings, like records and scores, are put together in the browser from the numbers they show.
+    """
+    if mode not in ('inline', 'static', 'lazy'):
+        raise ValueError(f'Unknown output mode: {mode}')
+    snapshots = snapshots or {}
+    tab_files = lazy_tabs(model, html_file) if mode == 'lazy' else {}
+    # the models are collected once, by the document, rather than by every step walking the model on its own
+    with OutputDocumentFor([model]) as doc:
+        narrow_sources(doc)
+        components = bundle_components(doc).union(*(snapshot.components for snapshot in snapshots.values()))
+        if mode != 'inline':
+            # as in `json_item`
+            doc.title = ''
+        docs_json, render_items = standalone_docs_json_and_render_items([model])
+
+    if mode == 'inline':
+        for doc_json in docs_json.values():
+            splice_snapshots(doc_json, snapshots)
+        bundle = inline_bundle(frozenset(components))
+        with open(html_file, 'w', encoding='utf-8') as f:
+            f.write(html_page_for_render_items(bundle, docs_json, render_items, title=title))
+        return [html_file]
+
+    js_files = write_static_resources(components, static_dir or html_file.parent / 'static')
+    [doc_json] = docs_json.values()
+    item = {'target_id': None, 'root_id': doc_json['roots'][0]['id'], 'doc': doc_json, 'version': bokeh.__version__}
+    splice_snapshots(item['doc'], snapshots)
+    data_files = {html_file.with_suffix('.data.js'): (html_file.stem, item)}
+    if tab_files:
+        for panel_id, panel in split_tabs(item['doc'], tab_files).items():
+            data_files[tab_files[panel_id]] = (tab_files[panel_id].name, panel)
+    for data_file, (key, content) in data_files.items():
+        with open(data_file, 'w') as f:
+            f.write('window.BOKEH_DATA = window.BOKEH_DATA || {};\n')
+            f.write(f'window.BOKEH_DATA[{json.dumps(key)}] = {json.dumps(content)};\n')
+
+    scripts = '\n'.join(f'    <script src="{html.escape(Path(os.path.relpath(js_file, html_file.parent)).as_posix())}"></script>' for js_file in js_files)
+    with open(html_file, 'w', encoding='utf-8') as f:
+        # the titles of the player pages hold their names, which can have characters that mean something in HTML
+        f.write(STATIC_PAGE.format(title=html.escape(title), scripts=scripts, root_id='dashboard',
+                                   data_file=html.escape(html_file.with_suffix('.data.js').name), data_key=json.dumps(html_file.stem)))
+    return [html_file, *data_files]
+
+
+class LeagueStats:
+    """
+    The stats of a league, computed from its aggregate state on first use and cached, so that a notebook or script can
+    ask for, say, a leaderboard at the cost of only the stats it depends on. The dashboard is built from these too.
+
+    The frames are shared by everyone who asks for them, so copy them before changing them.
+    """
+    def __init__(self, state: LeagueState):
+        self.state = state
+
+    @classmethod
+    def from_file(cls, data_file: Path) -> 'LeagueStats':
+        """
+        Returns the stats of the games in a CSV file, only aggregating the games added since the checkpoint next to it.
+        """
+        data_file = Path(data_file)
+        return cls(load_league(data_file, data_file.with_suffix('.checkpoint.npz')))
+
+    @property
+    def log(self) -> GameLog:
+        return self.state.log
+
+    @functools.cached_property
+    def singles_log(self) -> GameLog:
+        return self.log.singles
+
+    @functools.cached_property
+    def singles_games(self) -> pd.DataFrame:
+        return self.log.singles.to_frame()
+
+    @functools.cached_property
+    def doubles_games(self) -> pd.DataFrame:
+        return self.log.doubles.to_frame()
+
+    @functools.cached_property
+    def singles_roster(self) -> np.ndarray:
+        return singles_roster(self.log.singles)
+
+    @functools.cached_property
+    def head_to_head(self) -> pd.DataFrame:
+        """
+        The head-to-head records of every ordered pair of singles players who met; see `pair_records`.
+        """
+        return pair_records(pair_stats(self.state.pair_counts, self.log.players, self.singles_roster))
+
+    @functools.cached_property
+    def pairs(self) -> pd.DataFrame:
+        """
+        The head-to-head records of every unordered pair of singles players who met; see `pair_table`.
+        """
+        return pair_table(self.head_to_head)
+
+    @functools.cached_property
+    def pair_index(self) -> PairIndex:
+        return PairIndex.from_log(self.log.singles, self.pairs)
+
+    @functools.cached_property
+    def daily(self) -> DailyStats:
+        return DailyStats.from_counts(self.log.players, self.state.first_day, self.state.daily_counts, self.singles_roster)
+
+    @functools.cached_property
+    def rolling(self) -> RollingStats:
+        return RollingStats.from_daily(self.daily)
+
+    @functools.cached_property
+    def doubles_roster(self) -> np.ndarray:
+        return doubles_roster(self.log.doubles)
+
+    @functools.cached_property
+    def doubles_players(self) -> pd.DataFrame:
+        return doubles_player_stats(self.state.doubles, self.log.players, self.doubles_roster)
+
+    @functools.cached_property
+    def doubles_pairs(self) -> pd.DataFrame:
+        return doubles_pair_stats(self.state.doubles, self.log.players, self.doubles_roster)
+
+    @functools.cached_property
+    def matchups(self) -> pd.DataFrame:
+        return matchup_table(self.state.doubles, self.log.players)
+
+    @functools.cached_property
+    def player_totals(self) -> pd.DataFrame:
+        """
+        The total games, days played and average games per day played of every singles player; see `player_totals`.
+        """
+        return player_totals(self.daily)
+
+    @functools.cached_property
+    def wins_leaderboard(self) -> pd.DataFrame:
+        return rank_wins(self.head_to_head)
+
+    @functools.cached_property
+    def point_differential_leaderboard(self) -> pd.DataFrame:
+        return rank_point_differentials(self.head_to_head)
+
+    @functools.cached_property
+    def total_games_leaderboard(self) -> pd.DataFrame:
+        return rank_total_games(self.player_totals)
+
+    @functools.cached_property
+    def head_to_head_leaderboard(self) -> pd.DataFrame:
+        return rank_head_to_head(self.pairs)
+
+    @functools.cached_property
+    def pair_games_leaderboard(self) -> pd.DataFrame:
+        return rank_pair_games(self.pairs, self.pair_index)
+
+    @functools.cached_property
+    def pair_point_differential_leaderboard(self) -> pd.DataFrame:
+        return rank_pair_point_differentials(self.pairs)
+
+    @functools.cached_property
+    def doubles_leaderboard(self) -> pd.DataFrame:
+        return rank_doubles(self.doubles_players)
+
+    @functools.cached_property
+    def partners_leaderboard(self) -> pd.DataFrame:
+        return rank_partners(self.doubles_pairs)
+
+    @functools.cached_property
+    def matchups_leaderboard(self) -> pd.DataFrame:
+        return rank_matchups(self.matchups)
+
+
+def build_page(data_file: Path, html_file: Path, title: str = 'Badminton Stats', output_mode: str = 'inline', parallel: bool = False,
+               player_pages: bool = False, max_points: int = None):
+    """
+    Builds the dashboard of the games in a CSV file and saves it as an HTML page, recording its stages if a report is being recorded.
+    If `player_pages` is set, the profile page of every player is built too, into the `players` folder next to the page.
+    If `max_points` is given, the lines of every line graph are downsampled to that many points per player.
+    """
+    # load the game data and its stats, only aggregating the games added since the last run
+    with build_stage('ingest'):
+        stats = LeagueStats(load_league(data_file, data_file.with_suffix('.checkpoint.npz')))
+
+    layout, snapshots = build_layout(stats, parallel=parallel, max_points=max_points)
+    with build_stage('save') as stage:
+        files = save_dashboard(layout, html_file, title, mode=output_mode, snapshots=snapshots)
+        stage['bytes'] = sum(file.stat().st_size for file in files)
+
+    if player_pages:
+        with build_stage('player_pages') as stage:
+            pages = build_player_pages(stats, html_file.parent / 'players', max_points=max_points)
+            stage['bytes'] = sum(page.stat().st_size for page in pages)
+
+
+def build_layout(stats: LeagueStats, parallel: bool = False, max_points: int = None) -> Tuple[Column, dict]:
+    """
+    Builds the dashboard of the stats of a league: the date range slider above the tabs of the dashboards.
+    Returns the layout along with the snapshots of the dashboards built in parallel; see `tab_layout`.
+    If `max_points` is given, the lines of the line graphs are downsampled to that many points per player.
+    """
+    with build_stage('game_frames'):
+        singles_game_data, doubles_game_data = stats.singles_games, stats.doubles_games
+
+    # arrange the stats of the singles players
+    with build_stage('singles_stats'):
+        player_data, daily, rolling = stats.head_to_head, stats.daily, stats.rolling
+
+    # arrange the stats of the doubles players
+    with build_stage('doubles_stats'):
+        doubles_data, doubles_pair_data, matchup_data = stats.doubles_players, stats.doubles_pairs, stats.matchups
+
+    # plot the data in tabs
+    with build_stage('pair_stats'):
+        pair_data, pair_index = stats.pairs, stats.pair_index
+    with build_stage('player_source') as stage:
+        player_source = stage['output'] = live_view(window_view(ColumnDataSource(player_data), 'pairs'), 'data', None, player_data)
+    builders = {'Total Games Played': (total_games_dashboard, (player_data, pair_data, pair_index, daily, rolling, player_source, max_points)),
+                'Wins': (head_to_head_dashboard, (player_data, pair_data, daily, rolling, player_source, max_points)),
+                'Point Differentials': (point_differential_dashboard, (player_data, pair_data, daily, rolling, player_source, max_points)),
+                'Doubles': (doubles_dashboard, (doubles_data, doubles_pair_data, matchup_data)),
+                'Game History': (history_dashboard, (singles_game_data, doubles_game_data))}
+    with build_stage('dashboards') as stage:
+        plots = stage['output'] = build_dashboards(builders, parallel=parallel)
+    with build_stage('tabs') as stage:
+        tabs, snapshots = tab_layout(plots)
+        layout = stage['output'] = Column(date_range_slider(stats.singles_log, player_data), tabs)
+    return layout, snapshots
+
+
+# the games of a player listed on their profile page, the latest first
+RECENT_GAMES = 20
+
+PLAYER_INDEX_PAGE = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+  </head>
+  <body>
+    <h1>{title}</h1>
+    <ul>
+{links}
+    </ul>
+  </body>
+</html>
+"""
+
+
+def player_slug(player: str) -> str:
+    """
+    Returns the name of the profile page of a player, e.g. 'john-david-clifton' for John David Clifton, or 'zoe-belanger'
+    for Zoë Bélanger. Names with no letters or digits in ASCII get 'player'; see `player_slugs`.
+    """
+    name = unicodedata.normalize('NFKD', player).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'player'
+
+
+def player_slugs(players: list) -> dict:
+    """
+    Returns a slug of its own for every player, numbering the slugs of the players after the first who would get
+    the same one, e.g. 'player-2', and of a player who would get the name of the index page.
+    """
+    slugs, taken = {}, {'index'}
+    for player in players:
+        slug = base = player_slug(player)
+        number = 2
+        while slug in taken:
+            slug = f'{base}-{number}'
+            number += 1
+        slugs[player] = slug
+        taken.add(slug)
+    assert len(set(slugs.values())) == len(slugs)
+    return slugs
+
+
+def player_summary(stats: LeagueStats, player: str) -> Div:
+    """
+    Sums up the singles and doubles records of a player along with their ranks among the other players.
+    """
+    lines = [f'<h1>{html.escape(player)}</h1>']
+    wins = stats.wins_leaderboard.set_index('player')
+    if player in wins.index:
+        row = wins.loc[player]
+        lines.append(f'<p>Singles: {row["wins"]}-{row["losses"]}, {row["win_percentage"]:.0f}% won, '
+                     f'rank {row["rank"]} of {len(wins)}')
+        point_diffs = stats.point_differential_leaderboard.set_index('player')
+        if player in point_diffs.index:
+            row = point_diffs.loc[player]
+            lines[-1] += f'; average point differential {row["avg_point_diff"]:+.1f}, rank {row["rank"]} of {len(point_diffs)}'
+        lines[-1] += '</p>'
+    doubles = stats.doubles_leaderboard.set_index('player')
+    if player in doubles.index:
+        row = doubles.loc[player]
+        lines.append(f'<p>Doubles: {row["wins"]}-{row["losses"]}, {row["win_percentage"]:.0f}% won, '
+                     f'rank {row["rank"]} of {len(doubles)}</p>')
+    lines.append('<p><a href="index.html">All players</a></p>')
+    return Div(text='\n'.join(lines), margin=(25, 50, 0, 50))
+
+
+@report_stage
+def player_head_to_head(stats: LeagueStats, player: str) -> DataTable:
+    """
+    Creates a table of the head-to-head records of a player against every opponent they met, most played first.
+    """
+    records = stats.head_to_head
+    records = records[(records['player1'] == player) & (records['total_games'] > 0)]
+    records = records[['player2', 'wins', 'losses', 'total_games', 'avg_point_diff']].sort_values('total_games', ascending=False)
+    records['win_percentage'] = (100*records['wins'] / records['total_games']).round(2)
+    source = ColumnDataSource(records)
+    columns = [TableColumn(field='player2', title='Opponent'),
+               TableColumn(field='wins', title='Record', formatter=HTMLTemplateFormatter(template='<%= wins %>-<%= losses %>')),
+               TableColumn(field='win_percentage', title='Win %', formatter=NumberFormatter(format='0.[00]')),
+               TableColumn(field='avg_point_diff', title='Average Point Differential', formatter=NumberFormatter(format='0.[0]'))]
+    return DataTable(source=source, columns=columns, index_position=None, margin=(25, 50, 0, 50),
+                     width=700, height=min(300, 30 + 25*len(records)))
+
+
+def recent_games(log: GameLog, games_df: pd.DataFrame, code: int) -> pd.DataFrame:
+    """
+    Returns the RECENT_GAMES latest games of a player, given a log and its frame.
+    """
+    played = (log.player_codes == code).any(axis=1)
+    return games_df[played].sort_values('date', kind='stable').tail(RECENT_GAMES)
+
+
+def player_layout(stats: LeagueStats, player: str, max_points: int = None) -> Column:
+    """
+    Lays out the profile page of a player: their records, their head-to-head records, their win percentage
+    over time and their latest singles and doubles games, all from the stats of the whole league.
+    """
+    code = pd.Index(stats.log.players).get_loc(player)
+    children = [player_summary(stats, player)]
+    position = np.flatnonzero(stats.singles_roster == code)
+    if len(position):
+        children.append(player_head_to_head(stats, player))
+        children.append(solo_win_percentage_line_graph(stats.daily.subset(position), stats.rolling.subset(position), max_points))
+    singles = recent_games(stats.log.singles, stats.singles_games, code)
+    if len(singles):
+        children.append(singles_history(singles))
+    doubles = recent_games(stats.log.doubles, stats.doubles_games, code)
+    if len(doubles):
+        children.append(doubles_history(doubles))
+    return Column(*children)
+
+
+# the stats of the league whose player pages a worker builds, set once per worker by `init_player_worker`
+_player_stats = None
+
+
+def init_player_worker(stats: LeagueStats):
+    global _player_stats
+    init_worker()
+    _player_stats = stats
+
+
+def write_player_page(player: str, page_file: Path, static_dir: Path, max_points: int = None) -> Path:
+    """
+    Builds and saves the profile page of a player in a worker set up by `init_player_worker`.
+    """
+    save_dashboard(player_layout(_player_stats, player, max_points), page_file, f'{player} - Badminton Stats', mode='static',
+                   static_dir=static_dir)
+    return page_file
+
+
+def build_player_pages(stats: LeagueStats, pages_dir: Path, jobs: int = None, static_dir: Path = None,
+                       max_points: int = None) -> list:
+    """
+    Builds the profile page of every player into a folder, along with an index of them, returning the files written.
+
+    The pages are built by a pool of worker processes that each get the stats of the league once, when they start,
+    so the league is aggregated once, here, and a page only costs its own slice of the stats and its plots. The pages
+    are saved in 'static' mode and load BokehJS from `static_dir`, by default the `static` folder of the page of
+    the league next to the folder, so each is a few kilobytes of data.
+    """
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    static_dir = static_dir or pages_dir.parent / 'static'
+    players = sorted(stats.log.players)
+    slugs = player_slugs(players)
+    page_files = {player: pages_dir / f'{slugs[player]}.html' for player in players}
+
+    # compute every stat the pages use before the workers get a copy of them
+    for name in ['singles_games', 'doubles_games', 'head_to_head', 'daily', 'rolling',
+                 'wins_leaderboard', 'point_differential_leaderboard', 'doubles_leaderboard']:
+        getattr(stats, name)
+    with ProcessPoolExecutor(max_workers=min(len(players), jobs or os.cpu_count() or 1) or 1,
+                             initializer=init_player_worker, initargs=(stats,)) as pool:
+        written = list(pool.map(write_player_page, players, [page_files[player] for player in players],
+                                itertools.repeat(static_dir), itertools.repeat(max_points)))
+
+    links = '\n'.join(f'      <li><a href="{html.escape(page_files[player].name)}">{html.escape(player)}</a></li>' for player in players)
+    index_file = pages_dir / 'index.html'
+    with open(index_file, 'w', encoding='utf-8') as f:
+        f.write(PLAYER_INDEX_PAGE.format(title=html.escape('Badminton Players'), links=links))
+    return [index_file] + [page for page in written for page in (page, page.with_suffix('.data.js'))]
+
+
+def window_records(data_file: Path, start: datetime.date = None, end: datetime.date = None) -> pd.DataFrame:
+    """
+    Returns the head-to-head records of the singles players over the games from the start date through the end date,
+    in the layout of the player data of the page, as the difference of two slices of the cube of the log.
+    """
+    state = load_league(data_file, data_file.with_suffix('.checkpoint.npz'))
+    cube = load_cube(state, data_file.with_suffix('.cube.npy'))
+    return pair_records(pair_stats(cube.window(start, end), state.log.players, singles_roster(state.log.singles)))
+
+
+def changed_cells(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """
+    Returns where two columns of the same length differ, counting missing values as equal.
+    """
+    return ~((old == new) | (pd.isna(old) & pd.isna(new)))
+
+
+def update_source(source: ColumnDataSource, data: dict):
+    """
+    Brings a data source up to date with new columns, sending the browser only what changed: the new rows with `stream`
+    when the rows before them are unchanged, the changed cells with `patch` when no rows were added, and every column
+    otherwise, e.g. when rows were inserted in the middle.
+    """
+    old = {column: np.asarray(values) for column, values in source.data.items()}
+    new = {column: np.asarray(values) for column, values in data.items()}
+    # a column turning from integers into floats, say, can not be streamed into the typed array of the browser
+    if not new or old.keys() != new.keys() or any(old[column].dtype.kind != new[column].dtype.kind for column in new):
+        source.data = data
+        return
+
+    num_old, num_new = len(next(iter(old.values()))), len(next(iter(new.values())))
+    if num_new < num_old:
+        source.data = data
+        return
+    changed = {column: np.flatnonzero(changed_cells(old[column], values[:num_old])) for column, values in new.items()}
+    if num_new > num_old:
+        if any(len(rows) for rows in changed.values()):
+            source.data = data
+        else:
+            source.stream({column: values[num_old:] for column, values in new.items()})
+        return
+    patches = {column: list(zip(rows.tolist(), new[column][rows].tolist())) for column, rows in changed.items() if len(rows)}
+    if patches:
+        source.patch(patches)
+
+
+def same_value(old, new) -> bool:
+    """
+    Returns whether two property values are equal, counting NaN as equal to itself, as unset ranges are.
+    """
+    try:
+        return bool(old == new) or bool(pd.isna(old) and pd.isna(new))
+    except (ValueError, TypeError):
+        # arrays compare elementwise
+        return np.array_equal(old, new)
+
+
+def live_layout(stats: LeagueStats, max_points: int = None) -> Tuple[Column, list]:
+    """
+    Builds the dashboard of the stats of a league for a live page, returning the layout along with its live views,
+    as (model, property, recipe, arguments); see `live_view`.
+    """
+    global _live_views
+    _live_views = []
+    try:
+        return build_layout(stats, max_points=max_points)[0], _live_views
+    finally:
+        _live_views = None
+
+
+def same_structure(old: LeagueStats, new: LeagueStats) -> bool:
+    """
+    Returns whether the dashboards of two versions of a league have the same models: the same singles and doubles
+    players, who have a line, a row and a column of their own, and the same first date, which the window counts from.
+    """
+    return (np.array_equal(old.log.players[old.singles_roster], new.log.players[new.singles_roster]) and
+            np.array_equal(old.log.players[old.doubles_roster], new.log.players[new.doubles_roster]) and
+            window_dates(old.singles_log)[0] == window_dates(new.singles_log)[0])
+
+
+def same_data(old, new) -> bool:
+    """
+    Returns whether two values of a live view are equal: the columns of a data source, a list or any other value.
+    """
+    if isinstance(new, dict):
+        return old.keys() == new.keys() and all(
+            np.shape(old[column]) == np.shape(new[column]) and not changed_cells(np.asarray(old[column]), np.asarray(new[column])).any()
+            for column in new)
+    if isinstance(new, list):
+        return old == new
+    return same_value(old, new)
+
+
+def live_changes(views: list, built: LeagueStats, old: LeagueStats, new: LeagueStats, values: dict) -> list:
+    """
+    Returns the changes that bring the live views of a dashboard built from the stats `built`, and last brought up to
+    the stats `old`, up to the stats `new`, as (model, property, value); see `apply_changes`. Only the views whose
+    recipes give something else for `new` than for `old` change, and the arguments of the recipes that are stats of
+    `built` are taken from `old` and `new` instead.
+
+    This only compares what the recipes return rather than the models, whose data the browser narrows to the dates
+    picked with the slider, and only reads the views, so that the changes can be worked out away from the document.
+    The values of the recipes are cached in `values` by stats, recipe and arguments, so that pages which show the same
+    stats share them; the changes hold copies, since Bokeh patches and streams the columns of a data source in place.
+    """
+    names = {id(value): name for name, value in vars(built).items()}
+
+    def value(stats: LeagueStats, recipe, args: tuple):
+        # the stats are told from the other arguments by name, which can't be mistaken for a plain value
+        key = (stats, recipe, tuple((LeagueStats, names[id(arg)]) if id(arg) in names else arg for arg in args))
+        if key not in values:
+            args = [getattr(stats, names[id(arg)]) if id(arg) in names else arg for arg in args]
+            result = args[0] if recipe is None else recipe(*args)
+            values[key] = ColumnDataSource.from_df(result) if isinstance(result, pd.DataFrame) else result
+        return values[key]
+
+    def data(model: Model, value):
+        if not isinstance(model, ColumnDataSource):
+            return value
+        # the data source may only hold some columns of a frame
+        return {column: value[column] for column in model.data}
+
+    changes = []
+    for model, name, recipe, args in views:
+        models, old_values, new_values = model, value(old, recipe, args), value(new, recipe, args)
+        if not isinstance(model, list):
+            models, old_values, new_values = [model], [old_values], [new_values]
+        for model, old_value, new_value in zip(models, old_values, new_values):
+            old_value, new_value = data(model, old_value), data(model, new_value)
+            if not same_data(old_value, new_value):
+                changes.append((model, name, {column: copy.copy(column_values) for column, column_values in new_value.items()}
+                                if isinstance(new_value, dict) else copy.deepcopy(new_value)))
+    return changes
+
+
+def apply_changes(changes: list):
+    """
+    Applies the changes of the live views of a dashboard from `live_changes`, sending only what changed to the browser.
+    """
+    for model, name, value in changes:
+        if isinstance(model, ColumnDataSource):
+            update_source(model, value)
+        else:
+            setattr(model, name, value)
+
+
+def slider_days(values: tuple) -> Tuple[int]:
+    """
+    Returns dates of a date range slider as days since the epoch: the dates set on the server, or the timestamps in ms
+    that the browser sends back.
+    """
+    return tuple(int(value // DAY_MS) if isinstance(value, (int, float)) else int(np.datetime64(value, 'D').astype(np.int64))
+                 for value in values)
+
+
+class LiveLeague:
+    """
+    The aggregate state of a game log that keeps growing, e.g. while the games of a session are entered, for `live_app`.
+
+    `refresh` folds the rows appended to the CSV since it was last read into the state, through the checkpoint of the log,
+    and `add_game` appends a game to the CSV. `version` counts the changes of the state.
+    """
+    def __init__(self, data_file: Path):
+        self.data_file = data_file
+        self.state = None
+        self.version = 0
+        self._stat = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Reads the rows appended to the CSV, if its size or modification time changed. Returns whether the state changed.
+        """
+        stat = os.stat(self.data_file)
+        if (stat.st_size, stat.st_mtime_ns) == self._stat:
+            return False
+        self.state = load_league(self.data_file, self.data_file.with_suffix('.checkpoint.npz'))
+        self._stat = (stat.st_size, stat.st_mtime_ns)
+        self.version += 1
+        return True
+
+    def add_game(self, players: list, scores: Tuple[int], date: datetime.date):
+        """
+        Appends a game to the CSV: 2 players for singles or 4 for doubles, team 1 first, with the scores of each side.
+        """
+        players = [(player or '').strip() for player in players]
+        named = [player for player in players if player]
+        if players[:len(named)] != named or len(named) not in (2, 4):
+            raise ValueError('A game needs players 1 and 2 for singles, or players 1 to 4 for doubles')
+        if len(set(named)) != len(named):
+            raise ValueError('A player can not play twice in a game')
+        if any(score is None or not 0 <= score <= 30 for score in scores):
+            raise ValueError('Scores must be between 0 and 30')
+
+        row = io.StringIO()
+        csv.writer(row, lineterminator='').writerow(players + [int(score) for score in scores] + [date.isoformat()])
+        with open(self.data_file, 'rb+') as f:
+            # the last row of the file may not end its line
+            end = f.seek(0, os.SEEK_END)
+            if end > 0:
+                f.seek(end - 1)
+                if f.read(1) not in (b'\n', b'\r'):
+                    f.write(b'\n')
+            f.write(row.getvalue().encode() + b'\n')
+
+
+def game_form(league: LiveLeague, submitted) -> Column:
+    """
+    Returns a form to enter a game, which appends it to the game log of the league and then calls `submitted`.
+    """
+    players = sorted(league.state.log.players)
+    player_inputs = [AutocompleteInput(title=f'Player {idx}', completions=players, restrict=False, case_sensitive=False, width=200)
+                     for idx in range(1, 5)]
+    score_inputs = [Spinner(title=f'Score {idx}', low=0, high=30, step=1, width=100) for idx in range(1, 3)]
+    date_input = DatePicker(title='Date', value=datetime.date.today(), width=150)
+    button = Button(label='Add game', button_type='primary', width=100, align='end')
+    status = Div()
+
+    def submit():
+        try:
+            league.add_game([player_input.value for player_input in player_inputs], [score_input.value for score_input in score_inputs],
+                            datetime.date.fromisoformat(str(date_input.value)))
+        except ValueError as err:
+            status.text = f'<strong>{err}</strong>'
+            return
+        status.text = 'Game added.'
+        for player_input in player_inputs:
+            player_input.value = ''
+        submitted()
+
+    button.on_click(submit)
+    return Column(Row(*player_inputs), Row(*score_inputs, date_input, button), status, margin=(25, 50, 0, 50))
+
+
+def live_app(league: LiveLeague, poll_seconds: float = 1.0, max_points: int = None):
+    """
+    Returns a Bokeh server app of the dashboard of a league, along with a form to enter games, which polls the game log
+    and updates the dashboard of every open page as games are added to it, whether through the form or to the CSV.
+
+    The stats are computed once per version of the league, however many pages are open, and every page recomputes
+    the live views of its dashboard from them, sending the browser only the data sources and properties that changed;
+    see `live_changes`. A model belongs to a single document, so a page only builds a dashboard of its own when it opens,
+    and when a new player or an earlier first date changes the structure of the dashboard, which is then replaced.
+
+    The stats, the builds and the changes are worked out one at a time in a worker thread, off the IO loop, so that
+    the server keeps serving the pages meanwhile, and each page is only changed on its own turn of the loop.
+    """
+    worker = ThreadPoolExecutor(max_workers=1)
+    # the stats of the latest two versions of the league, shared by the pages, which compare them, along with the values
+    # of their live views; only the worker reads and writes them
+    shared = {}
+    values = {}
+
+    def shared_stats(version: int, state: LeagueState) -> LeagueStats:
+        if version not in shared:
+            for old_version in sorted(shared)[:-1]:
+                del shared[old_version]
+            shared[version] = LeagueStats(state)
+            kept = set(map(id, shared.values()))
+            for key in [key for key in values if id(key[0]) not in kept]:
+                del values[key]
+        return shared[version]
+
+    def build(version: int, state: LeagueState) -> tuple:
+        stats = shared_stats(version, state)
+        return (stats, *live_layout(stats, max_points))
+
+    def changes(version: int, state: LeagueState, built: LeagueStats, old: LeagueStats, views: list) -> tuple:
+        stats = shared_stats(version, state)
+        if not same_structure(built, stats):
+            return stats, None
+        return stats, live_changes(views, built, old, stats, values)
+
+    def app(doc):
+        session = {'layout': Div(text='Loading the dashboard...', margin=(25, 50, 0, 50)), 'version': None, 'pending': True}
+
+        def when_done(future, apply):
+            # calls `apply` with the result of the work on the turn of the page
+            def done(future):
+                try:
+                    result = future.result()
+                except Exception as err:
+                    print(f'Could not update the dashboard: {err!r}', file=sys.stderr)
+                    session['pending'] = False
+                    return
+                apply(result)
+
+            def schedule(future):
+                # the page may have been closed meanwhile
+                if doc.session_context is not None:
+                    doc.add_next_tick_callback(functools.partial(done, future))
+            future.add_done_callback(schedule)
+
+        def rebuild():
+            when_done(worker.submit(build, league.version, league.state), functools.partial(show, league.version))
+
+        def show(version: int, built: tuple):
+            stats, layout, views = built
+            if session['version'] is not None:
+                # keep the tab that was open
+                layout.children[1].active = session['layout'].children[1].active
+            doc.remove_root(session['layout'])
+            doc.add_root(layout)
+            session.update(layout=layout, views=views, built=stats, stats=stats, version=version, pending=False)
+
+        def sync(version: int, result: tuple):
+            stats, changes = result
+            if changes is None:
+                rebuild()
+                return
+            slider = session['layout'].children[0]
+            every_date = slider_days(slider.value) == slider_days((slider.start, slider.end))
+            doc.hold('combine')
+            try:
+                apply_changes(changes)
+                # a page showing every date keeps showing every date as new dates come in; a narrower window is
+                # applied again to the new data in the browser, see `REWINDOW_JS`
+                if every_date and slider_days(slider.value) != slider_days((slider.start, slider.end)):
+                    slider.value = (slider.start, slider.end)
+            finally:
+                doc.unhold()
+            session.update(stats=stats, version=version, pending=False)
+
+        def update():
+            if session['pending']:
+                return
+            try:
+                league.refresh()
+            except (OSError, ValueError) as err:
+                print(f'Could not read {league.data_file}: {err}', file=sys.stderr)
+                return
+            if session['version'] == league.version:
+                return
+            session['pending'] = True
+            when_done(worker.submit(changes, league.version, league.state, session['built'], session['stats'], session['views']),
+                      functools.partial(sync, league.version))
+
+        doc.title = 'Badminton Stats'
+        doc.add_root(game_form(league, update))
+        doc.add_root(session['layout'])
+        rebuild()
+        doc.add_periodic_callback(update, int(poll_seconds * 1000))
+    return app
+
+
+def serve(data_file: Path, port: int = 5006, poll_seconds: float = 1.0, max_points: int = None):
+    """
+    Serves the live dashboard of the games in a CSV file on localhost until interrupted; see `live_app`.
+    """
+    # the server is only needed in live mode, so it is imported here
+    from bokeh.server.server import Server
+
+    server = Server({'/': live_app(LiveLeague(data_file), poll_seconds, max_points)}, port=port, address='localhost')
+    server.start()
+    print(f'Serving the dashboard of {data_file} at http://localhost:{port}/')
+    server.io_loop.start()
+
+
+def read_manifest(file_path: Path) -> list:
+    """
+    Reads a manifest of pages to build: a JSON list of {"data": CSV file, "page": HTML file, "title": page title},
+    where the title is optional and the files are relative to the manifest.
+    """
+    with open(file_path) as f:
+        entries = json.load(f)
+    return [{'data': file_path.parent / entry['data'], 'page': file_path.parent / entry['page'],
+             'title': entry.get('title', 'Badminton Stats')} for entry in entries]
+
+
+def build_pages(pages: list, output_mode: str = 'inline', parallel: bool = False, jobs: int = None,
+                max_points: int = None) -> list:
+    """
+    Builds the pages of a manifest concurrently in worker processes, returning the seconds each page took.
+
+    The pages of the same game log are built one after another by the same worker, so that only the first of them
+    parses the log and the rest load its checkpoint, and no two workers ever write the same checkpoint.
+    """
+    groups = {}
+    for idx, page in enumerate(pages):
+        groups.setdefault(page['data'].resolve(), []).append(idx)
+    if not groups:
+        return []
+
+    timings = [None] * len(pages)
+    with ProcessPoolExecutor(max_workers=min(len(groups), jobs or os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(build_group, [pages[idx] for idx in group], output_mode, parallel, max_points): group
+                   for group in groups.values()}
+        for future, group in futures.items():
+            for idx, seconds in zip(group, future.result()):
+                timings[idx] = seconds
+    return timings
+
+
+def build_group(pages: list, output_mode: str, parallel: bool, max_points: int = None) -> list:
+    """
+    Builds pages one after another, returning the seconds each took.
+    """
+    timings = []
+    for page in pages:
+        start = time.perf_counter()
+        build_page(page['data'], page['page'], title=page['title'], output_mode=output_mode, parallel=parallel,
+                   max_points=max_points)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
 def main():
-    # use the 'real' or 'mock' data
-    data_type = 'real'
-    if data_type == 'real':
+    parser = argparse.ArgumentParser(description='Builds the badminton stats pages.')
+    parser.add_argument('--data', choices=['real', 'mock'], default='real', help="build the page of the 'real' or 'mock' data")
+    parser.add_argument('--output-mode', choices=['inline', 'static', 'lazy'], default='inline',
+                        help="'inline' to embed everything in the page, 'static' to share BokehJS and the data from separate files "
+                             "or 'lazy' to also load each tab from a file of its own when it is first shown")
+    parser.add_argument('--parallel', action='store_true', help='build the tabs of a page in parallel worker processes')
+    parser.add_argument('--manifest', type=Path, help='JSON manifest of the pages to build instead; see `read_manifest`')
+    parser.add_argument('--jobs', type=int, help='worker processes building the pages of a manifest, one per CPU by default')
+    parser.add_argument('--window', nargs=2, type=datetime.date.fromisoformat, metavar=('START', 'END'),
+                        help='print the head-to-head records over the games from START through END (YYYY-MM-DD) instead of building the page')
+    parser.add_argument('--report', type=Path, help='JSON file to write a report of the time, memory and models of every stage to')
+    parser.add_argument('--profile', action='store_true', help='with a report, also dump the cProfile stats of the slowest stage next to it')
+    parser.add_argument('--serve', action='store_true',
+                        help='serve a live dashboard on localhost that updates as games are entered or added to the CSV, instead of building the page')
+    parser.add_argument('--port', type=int, default=5006, help='port of the live dashboard')
+    parser.add_argument('--player-pages', action='store_true', help='also build the profile page of every player into the players folder next to the page')
+    parser.add_argument('--max-points', type=int,
+                        help='downsample the lines of the line graphs to at most this many points per player, at least 3')
+    args = parser.parse_args()
+    if args.max_points is not None and args.max_points < 3:
+        parser.error('--max-points must be at least 3, for the first and last points and one in between')
+
+    if args.manifest is not None:
+        if args.report is not None:
+            parser.error('a report can only be recorded for a single page')
+        if args.window is not None or args.player_pages or args.serve:
+            parser.error('--window, --player-pages and --serve apply to a single page, not to a manifest')
+        pages = read_manifest(args.manifest)
+        start = time.perf_counter()
+        timings = build_pages(pages, output_mode=args.output_mode, parallel=args.parallel, jobs=args.jobs, max_points=args.max_points)
+        for page, seconds in zip(pages, timings):
+            print(f'{seconds:8.3f}s  {page["page"]}')
+        print(f'{time.perf_counter() - start:8.3f}s  total')
+        return
+
+    if args.data == 'real':
         data_file = Path(__file__).parent.parent / 'badminton' / 'data' / 'real.csv'
         html_file = Path(__file__).parent.parent / 'badminton' / 'index.html'
-    elif data_type == 'mock':
+    elif args.data == 'mock':
         data_file = Path(__file__).parent.parent / 'badminton' / 'data' / 'mock.csv'
         html_file = Path(__file__).parent.parent / 'badminton' / 'mock.html'
 
-    # load the game data (only singles games)
-    game_data = read_games(data_file)
-    game_data['date'] = pd.to_datetime(game_data['date'])
-    game_data['game_type'] = game_data.apply(lambda row: 'singles' if pd.isna(row['player3']) else 'doubles', axis=1)
-    singles_game_data, doubles_game_data = game_data[game_data['game_type'] == 'singles'].copy(), game_data[game_data['game_type'] == 'doubles'].copy()
-
-    # initialize the player data
-    player_names = pd.unique(singles_game_data[['player1', 'player2']].values.ravel('K'))
-    player_names = [name for name in player_names if pd.notna(name)]
-    # having both the game_data and player_data dataframes is probably redundant; 
-    # it can probably be condensed via groupby operations
-    player_data = pd.DataFrame(0, index=pd.MultiIndex.from_product([player_names, player_names], names=['player1', 'player2']),
-                               columns=['wins', 'losses', 'points_for', 'points_against', 'point_diff'], dtype=int)
-
-    # calculate the stats
-    for game in singles_game_data.itertuples():
-        winner = game.player1 if game.score1 > game.score2 else game.player2
-        loser = game.player1 if game.score1 < game.score2 else game.player2
-        # win-loss record
-        player_data.loc[(winner, loser), 'wins'] += 1
-        player_data.loc[(loser, winner), 'losses'] += 1
-        # point totals
-        player_data.loc[(game.player1, game.player2), 'points_for'] += game.score1
-        player_data.loc[(game.player1, game.player2), 'points_against'] += game.score2
-        player_data.loc[(game.player2, game.player1), 'points_for'] += game.score2
-        player_data.loc[(game.player2, game.player1), 'points_against'] += game.score1
-        # point differential
-        point_diff = abs(max(game.score1, game.score2) - min(game.score1, game.score2))
-        player_data.loc[(winner, loser), 'point_diff'] += point_diff
-        player_data.loc[(loser, winner), 'point_diff'] -= point_diff
-    for game in doubles_game_data.itertuples():
-        winner = (game.player1, game.player2) if game.score1 > game.score2 else (game.player2, game.player1)
-        loser = (game.player1, game.player2) if game.score1 < game.score2 else (game.player2, game.player1)
-    player_data['total_games'] = player_data['wins'] + player_data['losses']
-    player_data['record'] = player_data['wins'].astype(str) + '-' + player_data['losses'].astype(str)
-    player_data['win_differential'] = player_data['wins'] - player_data['losses']
-    player_data.loc[player_data['total_games'] == 0, ['point_diff', 'win_differential']] = np.nan
-
-    # plot the data in tabs
-    player_data.reset_index(inplace=True)
-    player_source = ColumnDataSource(player_data)
-    plots = {'Total Games Played': total_games_dashboard(player_data, singles_game_data, player_source),
-             'Wins': head_to_head_dashboard(player_data, singles_game_data, player_source),
-             'Point Differentials': point_differential_dashboard(player_data, singles_game_data, player_source),
-             'Game History': history_dashboard(singles_game_data, doubles_game_data)}
-    tabs = Tabs(tabs=[TabPanel(child=p, title=title) for title, p in plots.items()])
-
-    output_file(filename=html_file,
-                title='Badminton Stats', mode='inline')
-    save(tabs)
+    if args.window is not None:
+        print(window_records(data_file, *args.window).to_string(index=False))
+        return
+    if args.serve:
+        serve(data_file, port=args.port, max_points=args.max_points)
+        return
+    if args.report is None:
+        build_page(data_file, html_file, output_mode=args.output_mode, parallel=args.parallel, player_pages=args.player_pages,
+                   max_points=args.max_points)
+        return
+    with BuildReport(profile=args.profile) as report:
+        build_page(data_file, html_file, output_mode=args.output_mode, parallel=args.parallel, player_pages=args.player_pages,
+                   max_points=args.max_points)
+    report.write(args.report)
+    print(report.summary())
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,271 @@
+"""
+Benchmarks how the badminton dashboard scales with the number of games and players.
+
+Every stage of the build is timed and memory-profiled separately on mock logs written by
+`badminton/data/gen_data.py`: reading the CSV, each step of the stats, every chart function,
+every dashboard builder and saving the page. The results are written as JSON, and can be
+compared against an earlier run to flag the stages that got slower.
+
+    python scripts/badminton_bench.py --games 1000 10000 --players 14 100 --output bench.json
+    python scripts/badminton_bench.py --compare scripts/benchmarks/badminton.json
+"""
+import argparse
+import gc
+import json
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import bokeh
+from bokeh.models import ColumnDataSource
+
+import badminton as bd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'badminton' / 'data'))
+import gen_data
+
+GAMES = [1000, 10000, 100000, 1000000]
+PLAYERS = [14, 100, 1000]
+
+
+def stats_stages() -> list:
+    """
+    Returns the stages that read the games and arrange their stats, in the order of `badminton.main`.
+    Each stage takes the results of the earlier ones and returns its own.
+    """
+    def singles_stats(ctx):
+        roster = bd.singles_roster(ctx['game_log'].singles)
+        return {'roster': roster,
+                'player_data': bd.pair_records(bd.pair_stats(ctx['state'].pair_counts, ctx['game_log'].players, roster))}
+
+    def doubles_stats(ctx):
+        log, doubles = ctx['game_log'], ctx['state'].doubles
+        doubles_players = bd.doubles_roster(log.doubles)
+        return {'doubles_data': bd.doubles_player_stats(doubles, log.players, doubles_players),
+                'doubles_pair_data': bd.doubles_pair_stats(doubles, log.players, doubles_players),
+                'matchup_data': bd.matchup_table(doubles, log.players)}
+
+    def league_state(ctx):
+        # the state only aggregates its counters when they are first used, so aggregate them all here
+        state = bd.LeagueState.from_log(ctx['game_log'])
+        state.pair_counts, state.daily_counts, state.doubles
+        return {'state': state}
+
+    return [('read_games', lambda ctx: {'games_df': bd.read_games(ctx['data_file'])}),
+            ('game_log', lambda ctx: {'game_log': bd.GameLog.from_frame(ctx['games_df'])}),
+            ('league_state', league_state),
+            # the same state, read and aggregated in chunks
+            ('load_league', lambda ctx: {'loaded_state': bd.load_league(ctx['data_file'])}),
+            ('game_frames', lambda ctx: {'singles_game_data': ctx['game_log'].singles.to_frame(),
+                                         'doubles_game_data': ctx['game_log'].doubles.to_frame()}),
+            ('singles_stats', singles_stats),
+            ('daily_stats', lambda ctx: {'daily': bd.DailyStats.from_counts(ctx['game_log'].players, ctx['state'].first_day,
+                                                                            ctx['state'].daily_counts, ctx['roster'])}),
+            ('rolling_stats', lambda ctx: {'rolling': bd.RollingStats.from_daily(ctx['daily'])}),
+            ('doubles_stats', doubles_stats),
+            ('pair_table', lambda ctx: {'pair_data': bd.pair_table(ctx['player_data'])}),
+            ('pair_index', lambda ctx: {'pair_index': bd.PairIndex.from_log(ctx['game_log'].singles, ctx['pair_data'])}),
+            ('player_source', lambda ctx: {'player_source': ColumnDataSource(ctx['player_data'])})]
+
+
+# the arguments of every chart function, in terms of the results of the stats stages
+CHARTS = {
+    'avg_games_chart': lambda ctx: (ctx['daily'],),
+    'total_games_chart': lambda ctx: (ctx['daily'],),
+    'total_games_matrix': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'total_games_solo_leaderboard': lambda ctx: (ctx['daily'],),
+    'total_games_pairs_leaderboard': lambda ctx: (ctx['pair_data'], ctx['pair_index']),
+    'avg_games_line_graph': lambda ctx: (ctx['daily'], ctx['rolling']),
+    'total_games_line_graph': lambda ctx: (ctx['daily'],),
+    'solo_wins_chart': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'solo_wins_percentage_chart': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'solo_wins_leaderboard': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'head_to_head_matrix': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'head_to_head_leaderboard': lambda ctx: (ctx['pair_data'],),
+    'solo_wins_line_graph': lambda ctx: (ctx['daily'],),
+    'solo_win_percentage_line_graph': lambda ctx: (ctx['daily'], ctx['rolling']),
+    'point_differential_chart': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'point_differential_solo_leaderboard': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'point_differential_matrix': lambda ctx: (ctx['player_data'], ctx['player_source']),
+    'point_differential_pairs_leaderboard': lambda ctx: (ctx['pair_data'],),
+    'point_differential_line_graph': lambda ctx: (ctx['daily'],),
+    'avg_point_differential_line_graph': lambda ctx: (ctx['daily'], ctx['rolling']),
+    'doubles_win_percentage_chart': lambda ctx: (ctx['doubles_data'],),
+    'doubles_leaderboard': lambda ctx: (ctx['doubles_data'],),
+    'doubles_partner_matrix': lambda ctx: (ctx['doubles_pair_data'], ColumnDataSource(ctx['doubles_pair_data'])),
+    'doubles_opponent_matrix': lambda ctx: (ctx['doubles_pair_data'], ColumnDataSource(ctx['doubles_pair_data'])),
+    'doubles_partners_leaderboard': lambda ctx: (ctx['doubles_pair_data'],),
+    'doubles_matchups_leaderboard': lambda ctx: (ctx['matchup_data'],),
+    'singles_history': lambda ctx: (ctx['singles_game_data'],),
+    'doubles_history': lambda ctx: (ctx['doubles_game_data'],),
+}
+
+# the tabs of the page and the arguments of their dashboard builders
+DASHBOARDS = {
+    'Total Games Played': ('total_games_dashboard', lambda ctx: (ctx['player_data'], ctx['pair_data'], ctx['pair_index'],
+                                                                 ctx['daily'], ctx['rolling'], ctx['player_source'])),
+    'Wins': ('head_to_head_dashboard', lambda ctx: (ctx['player_data'], ctx['pair_data'], ctx['daily'], ctx['rolling'],
+                                                    ctx['player_source'])),
+    'Point Differentials': ('point_differential_dashboard', lambda ctx: (ctx['player_data'], ctx['pair_data'], ctx['daily'],
+                                                                        ctx['rolling'], ctx['player_source'])),
+    'Doubles': ('doubles_dashboard', lambda ctx: (ctx['doubles_data'], ctx['doubles_pair_data'], ctx['matchup_data'])),
+    'Game History': ('history_dashboard', lambda ctx: (ctx['singles_game_data'], ctx['doubles_game_data'])),
+}
+
+
+def all_stages(output_dir: Path, parallel: bool = False, player_pages: bool = False) -> list:
+    """
+    Returns every stage of the build as (name, function) pairs, in order, optionally with building all the dashboards
+    in parallel worker processes and saving them, and with building the profile pages of the players, as extra stages.
+    """
+    stages = stats_stages()
+    for name, args in CHARTS.items():
+        stages.append((name, lambda ctx, name=name, args=args: {name: getattr(bd, name)(*args(ctx))}))
+
+    # the dashboards share a data source of their own, like in `badminton.main`
+    stages.append(('dashboard_source', lambda ctx: {'player_source': bd.window_view(ColumnDataSource(ctx['player_data']), 'pairs')}))
+    for title, (name, args) in DASHBOARDS.items():
+        stages.append((name, lambda ctx, title=title, name=name, args=args: {title: getattr(bd, name)(*args(ctx))}))
+    def tabs(ctx):
+        tabs, snapshots = bd.tab_layout({title: ctx[title] for title in DASHBOARDS})
+        return {'tabs': bd.Column(bd.date_range_slider(ctx['game_log'].singles, ctx['player_data']), tabs), 'snapshots': snapshots}
+    stages.append(('tabs', tabs))
+    for mode in ['inline', 'static', 'lazy']:
+        stages.append((f'save_{mode}', lambda ctx, mode=mode: {f'{mode}_files': bd.save_dashboard(ctx['tabs'], output_dir / f'bench_{mode}.html',
+                                                                                                  'Badminton Stats', mode=mode, snapshots=ctx['snapshots'])}))
+
+    # building in parallel leaves the dashboards serialized, which makes saving them cheaper, so both are timed
+    def parallel_dashboards(ctx):
+        plots = bd.build_dashboards({title: (getattr(bd, name), args(ctx)) for title, (name, args) in DASHBOARDS.items()}, parallel=True)
+        tabs, snapshots = bd.tab_layout(plots)
+        return {'parallel_tabs': bd.Column(bd.date_range_slider(ctx['game_log'].singles, ctx['player_data']), tabs),
+                'parallel_snapshots': snapshots}
+    if parallel:
+        stages.append(('build_dashboards_parallel', parallel_dashboards))
+        stages.append(('save_inline_parallel', lambda ctx: {'parallel_files': bd.save_dashboard(ctx['parallel_tabs'], output_dir / 'bench_parallel.html',
+                                                                                               'Badminton Stats', snapshots=ctx['parallel_snapshots'])}))
+    if player_pages:
+        stages.append(('player_pages', lambda ctx: {'player_pages': bd.build_player_pages(bd.LeagueStats(ctx['state']), output_dir / 'players')}))
+    return stages
+
+
+def run_stages(stages: list, data_file: Path, trace: bool = False) -> dict:
+    """
+    Runs the stages once, returning the wall time of each in seconds or, when tracing, the peak of the memory it allocated in bytes.
+    """
+    ctx = {'data_file': data_file}
+    results = {}
+    for name, stage in stages:
+        gc.collect()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        ctx.update(stage(ctx) or {})
+        elapsed = time.perf_counter() - start
+        if trace:
+            results[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            results[name] = elapsed
+    return results
+
+
+def benchmark(data_file: Path, output_dir: Path, repeat: int = 3, parallel: bool = False, player_pages: bool = False) -> dict:
+    """
+    Benchmarks every stage on a game log: the best wall time over a few runs, and the peak memory of a separate traced run,
+    since tracing slows down the code it traces.
+    """
+    stages = all_stages(output_dir, parallel=parallel, player_pages=player_pages)
+    times = [run_stages(stages, data_file) for _ in range(repeat)]
+    peaks = run_stages(stages, data_file, trace=True)
+    return {name: {'seconds': round(min(run[name] for run in times), 6), 'peak_bytes': peaks[name]} for name, _ in stages}
+
+
+def mock_log(data_dir: Path, num_games: int, num_players: int, seed: int) -> Path:
+    """
+    Returns a mock game log of the given size, generating it unless an earlier run already did.
+    """
+    data_file = data_dir / f'games_{num_games}_players_{num_players}_seed_{seed}.csv'
+    if not data_file.exists():
+        tmp_file = data_file.with_suffix('.tmp.csv')
+        gen_data.generate(tmp_file, num_games=num_games, num_players=num_players, seed=seed)
+        tmp_file.replace(data_file)
+    return data_file
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> list:
+    """
+    Returns the stages whose time or peak memory grew by more than the threshold factor since the baseline,
+    as (games, players, stage, metric, old value, new value) tuples.
+    """
+    old_runs = {(run['games'], run['players']): run['stages'] for run in baseline['runs']}
+    regressions = []
+    for run in results['runs']:
+        old_stages = old_runs.get((run['games'], run['players']), {})
+        for stage, metrics in run['stages'].items():
+            for metric, value in metrics.items():
+                old_value = old_stages.get(stage, {}).get(metric)
+                if old_value and value > threshold*old_value:
+                    regressions.append((run['games'], run['players'], stage, metric, old_value, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the stages of the badminton dashboard on mock game logs.')
+    parser.add_argument('--games', type=int, nargs='+', default=GAMES, help='numbers of games to benchmark')
+    parser.add_argument('--players', type=int, nargs='+', default=PLAYERS, help='numbers of players to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per log, of which the best is kept')
+    parser.add_argument('--parallel', action='store_true', help='also time building the dashboards in parallel and saving them')
+    parser.add_argument('--player-pages', action='store_true', help='also time building the profile pages of the players')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the mock logs')
+    parser.add_argument('--data-dir', type=Path, help='folder to keep the mock logs in between runs')
+    parser.add_argument('--output', type=Path, help='JSON file to write the results to')
+    parser.add_argument('--compare', type=Path, help='JSON file of an earlier run to compare the results against')
+    parser.add_argument('--threshold', type=float, default=1.25, help='factor by which a stage must grow to count as a regression')
+    args = parser.parse_args()
+
+    results = {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+               'bokeh': bokeh.__version__, 'machine': platform.machine(), 'repeat': args.repeat, 'seed': args.seed,
+               'parallel': args.parallel, 'player_pages': args.player_pages, 'runs': []}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or Path(tmp_dir)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        for num_games in args.games:
+            for num_players in args.players:
+                data_file = mock_log(data_dir, num_games, num_players, args.seed)
+                stages = benchmark(data_file, Path(tmp_dir), repeat=args.repeat, parallel=args.parallel,
+                                   player_pages=args.player_pages)
+                results['runs'].append({'games': num_games, 'players': num_players, 'stages': stages})
+                total = sum(metrics['seconds'] for metrics in stages.values())
+                slowest = sorted(stages, key=lambda stage: stages[stage]['seconds'], reverse=True)[:3]
+                print(f'{num_games:>8} games, {num_players:>5} players: {total:8.3f}s, slowest: ' +
+                      ', '.join(f'{stage} {stages[stage]["seconds"]:.3f}s' for stage in slowest))
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # the optional stages only compare between runs that timed them both
+        for flag in ('parallel', 'player_pages'):
+            if baseline.get(flag, False) != results[flag]:
+                print(f'NOTE the baseline was run {"with" if baseline.get(flag, False) else "without"} --{flag.replace("_", "-")}')
+        regressions = compare(baseline, results, args.threshold)
+        for num_games, num_players, stage, metric, old_value, new_value in regressions:
+            print(f'REGRESSION {num_games} games, {num_players} players, {stage} {metric}: {old_value} -> {new_value} '
+                  f'({new_value / old_value:.2f}x)')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()